@@ -0,0 +1,99 @@
+from inspect import signature
+from timeit import timeit
+from typing import Dict, Any, Callable
+import numpy as np
+
+from xmath.equations import PARAMETRIC_EQNS
+from xmath.pcurve import generate_parametric_values, evaluate_many
+
+NUM_CURVES = 2_000
+NUM_POINTS = 1_000
+T_RANGE = (0, 100)
+
+
+def _uncompiled_parametric_values(
+        equation_type, t_range, num_points, factor, **parameter_values
+):
+    # generate_parametric_values before the compiled equation registry
+    t_values = np.linspace(t_range[0], t_range[1], num_points)
+    eqn_x, eqn_y = PARAMETRIC_EQNS[equation_type]
+    sig_x = list(signature(eqn_x).parameters.keys())
+    sig_y = list(signature(eqn_y).parameters.keys())
+    x_vals = eqn_x(
+        t_values, **{k: v for k, v in parameter_values.items() if k in sig_x}
+    ) * factor
+    y_vals = eqn_y(
+        t_values, **{k: v for k, v in parameter_values.items() if k in sig_y}
+    ) * factor
+    h_shift = parameter_values.get("hs") or 0
+    v_shift = parameter_values.get("vs") or 0
+    return np.c_[x_vals + h_shift, y_vals + v_shift]
+
+
+def _param_tables(num_curves: int) -> Dict[str, Dict[str, np.ndarray]]:
+    rng = np.random.default_rng(0)
+    hs, vs = rng.normal(size=num_curves), rng.normal(size=num_curves)
+    return {
+        "circle": dict(r=rng.uniform(.1, 1., num_curves), hs=hs, vs=vs),
+        "elipse": dict(
+            a=rng.uniform(.1, 1., num_curves),
+            b=rng.uniform(.1, 1., num_curves),
+            hs=hs, vs=vs
+        ),
+        "log_spiral_elipse": dict(
+            a_C=np.ones(num_curves), b_C=np.ones(num_curves),
+            L=np.full(num_curves, .015),
+            rot=rng.uniform(0, 2 * np.pi, num_curves),
+            hs=hs, vs=vs
+        )
+    }
+
+
+def _per_curve(
+        generate: Callable, equation_type: str, table: Dict[str, np.ndarray]
+) -> Any:
+    return [
+        generate(
+            equation_type, T_RANGE, NUM_POINTS, 1.,
+            **{k: v[i] for k, v in table.items()}
+        )
+        for i in range(NUM_CURVES)
+    ]
+
+
+def bench_pcurve(number: int = 3) -> None:
+    t_values = np.linspace(T_RANGE[0], T_RANGE[1], NUM_POINTS)
+
+    print(f"{NUM_CURVES} curves x {NUM_POINTS} points, best of {number}")
+    for equation_type, table in _param_tables(NUM_CURVES).items():
+        batched = evaluate_many(equation_type, t_values, table)
+        assert batched.shape == (NUM_CURVES, NUM_POINTS, 2)
+        assert np.allclose(
+            batched,
+            _per_curve(_uncompiled_parametric_values, equation_type, table)
+        )
+
+        timings = {
+            "uncompiled loop": lambda: _per_curve(
+                _uncompiled_parametric_values, equation_type, table
+            ),
+            "compiled loop": lambda: _per_curve(
+                generate_parametric_values, equation_type, table
+            ),
+            "evaluate_many": lambda: evaluate_many(
+                equation_type, t_values, table
+            )
+        }
+        results = {
+            name: min(timeit(fn, number=1) for _ in range(number))
+            for name, fn in timings.items()
+        }
+        base = results["uncompiled loop"]
+        print(f"\n{equation_type}")
+        for name, seconds in results.items():
+            print(f"  {name:<16} {seconds * 1e3:9.1f} ms  "
+                  f"x{base / seconds:5.1f}")
+
+
+if __name__ == "__main__":
+    bench_pcurve()
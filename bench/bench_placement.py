@@ -0,0 +1,58 @@
+from timeit import default_timer
+import numpy as np
+
+from xmath.generate_universe import calc_range_and_origin
+from xmath.spatial import PoissonDiscSampler
+from xmath.xrng import RandomStreams
+
+
+def _legacy_placement(num_origins: int, distance: float) -> np.ndarray:
+    # one placement per call against the whole visited list, as
+    # generate_universe_parametric_values used to do
+    rng = RandomStreams(0)
+    visited = []
+    for idx in range(num_origins):
+        visited.append(calc_range_and_origin(
+            (0, 5), visited, distance, rng.child(str(idx))
+        )[1])
+
+    return np.array(visited)
+
+
+def _grid_placement(num_origins: int, distance: float) -> np.ndarray:
+    rng = RandomStreams(0)
+    placer = PoissonDiscSampler((0, 0), (5, 5), distance)
+    for idx in range(num_origins):
+        placer.place(distance, rng)
+
+    return placer.as_array()
+
+
+def _check_separation(points: np.ndarray, distance: float) -> bool:
+    # brute force on a sample of points against all of them
+    sample = points[np.linspace(0, len(points) - 1, 200).astype(int)]
+    diff = sample[:, None, :] - points[None, :, :]
+    dist = np.hypot(diff[..., 0], diff[..., 1])
+    return bool(np.all((dist >= distance) | (dist == 0)))
+
+
+def bench_placement(distance: float = 10.) -> None:
+    print(f"origins placed {distance} apart, seconds")
+    for num_origins in (10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5):
+        start = default_timer()
+        points = _grid_placement(num_origins, distance)
+        grid = default_timer() - start
+
+        legacy = float("nan")
+        if num_origins <= 10 ** 3:
+            start = default_timer()
+            _legacy_placement(num_origins, distance)
+            legacy = default_timer() - start
+
+        print(f"  N = {num_origins:>7,}  grid hash {grid:8.3f}  "
+              f"rebuild per call {legacy:8.3f}  "
+              f"separated: {_check_separation(points, distance)}")
+
+
+if __name__ == "__main__":
+    bench_placement()
@@ -0,0 +1,83 @@
+from timeit import default_timer
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+from xanimation.aniscene import AnimatedScene  # noqa: E402
+from xanimation.sector01 import build_sector_scene  # noqa: E402
+
+
+def _fps_full_redraw(
+        renderer: str,
+        num_frames: int,
+        cull: bool = False
+) -> float:
+    # every frame: physics, artists and a full canvas draw
+    animator = AnimatedScene(
+        build_sector_scene(0), renderer=renderer, cull=cull
+    )
+    animator.fig.canvas.draw()
+
+    start = default_timer()
+    for frame in range(num_frames):
+        animator._update_animation(frame)
+        animator.fig.canvas.draw()
+    seconds = default_timer() - start
+    plt.close(animator.fig)
+
+    return num_frames / seconds
+
+
+def _fps_blit(
+        num_frames: int,
+        cull: bool = False,
+        moving: bool = False
+) -> float:
+    # what FuncAnimation(blit=True) does: restore the cached background,
+    # draw the collection only, blit. With moving the main ship flies, so
+    # the camera (center_grid) moves and every frame also redraws the
+    # canvas and re-caches the background
+    animator = AnimatedScene(
+        build_sector_scene(0), renderer="collection", cull=cull
+    )
+    if moving:
+        animator.scene.main_object.velocity = [20, 5]
+    canvas, ax = animator.fig.canvas, animator.ax
+    collection = animator.collection.collection
+    collection.set_animated(True)
+    canvas.draw()
+    background = canvas.copy_from_bbox(ax.bbox)
+
+    start = default_timer()
+    for frame in range(num_frames):
+        view = (tuple(animator.xlim), tuple(animator.ylim))
+        artists = animator._update_animation(frame)
+        if view != (tuple(animator.xlim), tuple(animator.ylim)):
+            background = canvas.copy_from_bbox(ax.bbox)
+        canvas.restore_region(background)
+        for artist in artists:
+            ax.draw_artist(artist)
+        canvas.blit(ax.bbox)
+    seconds = default_timer() - start
+    plt.close(animator.fig)
+
+    return num_frames / seconds
+
+
+def bench_render(num_frames: int = 30) -> None:
+    print("AnimatedScene frames per second, sector 01 (Agg)")
+    print(f"  patches    full redraw         "
+          f"{_fps_full_redraw('patches', num_frames):8.1f} fps")
+    for cull in (False, True):
+        name = "culled" if cull else "collection"
+        print(f"  {name:<10} full redraw         "
+              f"{_fps_full_redraw('collection', num_frames, cull):8.1f} fps")
+        print(f"  {name:<10} blit, camera still  "
+              f"{_fps_blit(num_frames, cull):8.1f} fps")
+        print(f"  {name:<10} blit, camera moving "
+              f"{_fps_blit(num_frames, cull, True):8.1f} fps")
+
+
+if __name__ == "__main__":
+    bench_render()
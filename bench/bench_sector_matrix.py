@@ -0,0 +1,62 @@
+import io
+import tracemalloc
+from contextlib import redirect_stdout
+from timeit import default_timer
+
+from space.cosmic_structures.matrix_structure import SystemSectorMatrix
+from space.cosmic_structures.system_sector import SystemSector
+from space.space_structures.star_types import StarType
+from space.space_structures.stars import Star
+from xmath.xrng import RandomStreams
+
+
+def _dense_grid(x_max: int, y_max: int):
+    # what SystemSectorMatrix used to allocate up front
+    return [
+        [SystemSector((i, j), None) for i in range(x_max)]
+        for j in range(y_max)
+    ]
+
+
+def _measure(fn):
+    tracemalloc.start()
+    start = default_timer()
+    with redirect_stdout(io.StringIO()):
+        result = fn()
+    seconds = default_timer() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, seconds, peak / 2 ** 20
+
+
+def _sparse_matrix(size: int, num_objects: int) -> SystemSectorMatrix:
+    rng = RandomStreams(0)
+    xs = rng.integers(0, size - 1, "X", num_objects).tolist()
+    ys = rng.integers(0, size - 1, "Y", num_objects).tolist()
+
+    matrix = SystemSectorMatrix((size, size))
+    for idx, pos in enumerate(zip(xs, ys)):
+        matrix.add_sector_object(pos, Star(f"S{idx}", StarType.Star))
+
+    return matrix
+
+
+def bench_sector_matrix() -> None:
+    print("SystemSectorMatrix memory (tracemalloc peak)")
+    for size in (100, 1_000):
+        _, seconds, mib = _measure(lambda: _dense_grid(size, size))
+        print(f"  dense  {size:>6,} x {size:<6,} {mib:10.1f} MiB "
+              f"{seconds:8.3f} s")
+    print("  dense  10,000 x 10,000  ~100x the 1,000 x 1,000 grid (skipped)")
+
+    for num_objects in (0, 10_000, 100_000):
+        matrix, seconds, mib = _measure(
+            lambda: _sparse_matrix(10_000, num_objects)
+        )
+        print(f"  sparse 10,000 x 10,000 {mib:10.1f} MiB {seconds:8.3f} s "
+              f"({num_objects:,} objects, {matrix.num_sectors:,} sectors)")
+
+
+if __name__ == "__main__":
+    bench_sector_matrix()
@@ -0,0 +1,45 @@
+from timeit import timeit
+import numpy as np
+
+from xmath.spatial import unique_coordinates
+
+
+def _coordinates(num_points: int) -> np.ndarray:
+    # a galaxy like point cloud where ~half the points are repeats
+    rng = np.random.default_rng(0)
+    points = np.round(rng.normal(size=(num_points // 2, 2)), 3)
+    return points[rng.integers(0, len(points), num_points)]
+
+
+def bench_unique_coordinates(number: int = 3) -> None:
+    print("dedup of (N, 2) float64 coordinates, best of", number)
+    for num_points in (10 ** 4, 10 ** 5, 10 ** 6):
+        coordinates = _coordinates(num_points)
+        assert np.array_equal(
+            np.unique(coordinates, axis=0),
+            unique_coordinates(coordinates, keep_order=False)
+        )
+
+        timings = {
+            "np.unique(axis=0)": lambda: np.unique(coordinates, axis=0),
+            "exact": lambda: unique_coordinates(coordinates),
+            "exact, sorted": lambda: unique_coordinates(
+                coordinates, keep_order=False
+            ),
+            "tolerance=1e-2": lambda: unique_coordinates(
+                coordinates, tolerance=1e-2
+            )
+        }
+        results = {
+            name: min(timeit(fn, number=1) for _ in range(number))
+            for name, fn in timings.items()
+        }
+        base = results["np.unique(axis=0)"]
+        print(f"\nN = {num_points:,}")
+        for name, seconds in results.items():
+            print(f"  {name:<18} {seconds * 1e3:9.2f} ms  "
+                  f"x{base / seconds:5.1f}")
+
+
+if __name__ == "__main__":
+    bench_unique_coordinates()
@@ -93,17 +93,25 @@ class StarShip(object):
 
     @property
     def motion_vector(self) -> Union[Z2_POS, R2_POS]:
+        return self.calculate_motion_vector(verbose=True)
+
+    def calculate_motion_vector(
+            self,
+            verbose: bool = False
+    ) -> Union[Z2_POS, R2_POS]:
         required_vector: Z2_POS = self._course_vector
 
         sector_speed: float = self.impulse_speed * 10
-        print("Sector Speed: ", sector_speed)
+        if verbose:
+            print("Sector Speed: ", sector_speed)
 
         required_sector_speed: float = calculate_magnitude(required_vector)
 
         motion_vector: Union[Z2_POS, R2_POS] = (0, 0)
 
         if required_sector_speed > 0:
-            print("Req: ", required_sector_speed)
+            if verbose:
+                print("Req: ", required_sector_speed)
 
             factor: float = sector_speed / required_sector_speed
 
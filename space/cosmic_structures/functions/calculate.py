@@ -1,27 +1,52 @@
 from typing import List, Tuple, Union
 
+import numpy as np
+
+from xmath.grids import SparseGrid, BitmapGrid
+from xmath.paths import RunLengthPath
 from xmath.pcurve import (
-    generate_multi_param_num_grid,
+    rasterize_multi_param_values, offset_int_positions,
     calculate_offset_positions, generate_parametric_values
 )
 from xmath.structures import R2, Z2_MATRIX, Z2, Z2_POS, R2_POS
 
 
 def calculate_int_positions(
-        real_positions: List[R2]
-) -> Tuple[Z2_MATRIX, List[Z2], Z2_POS, Z2_POS]:
-    position_grid: Z2_MATRIX = generate_multi_param_num_grid(
-        real_positions
-    )
+        real_positions: List[R2],
+        grid: str = "dense",
+        run_length: bool = False
+) -> Tuple[
+    Union[Z2_MATRIX, np.ndarray, SparseGrid, BitmapGrid, None],
+    Union[List[Z2], List[RunLengthPath]], Z2_POS, Z2_POS
+]:
+    # grid: "dense" (list of lists), "array", "sparse", "bitmap" (see
+    # rasterize_multi_param_values) or "none" to skip rasterizing.
+    # run_length: int paths as RunLengthPath's (repeated cells merged)
+    position_grid: Union[Z2_MATRIX, np.ndarray, SparseGrid, BitmapGrid, None]
+    if grid == "none":
+        position_grid = None
+        _, shape = offset_int_positions(np.concatenate(
+            [np.reshape(v, (-1, 2)) for v in real_positions]
+        ))
+    elif grid == "dense":
+        array_grid: np.ndarray = rasterize_multi_param_values(real_positions)
+        shape = (array_grid.shape[1], array_grid.shape[0])
+        position_grid = array_grid.tolist()
+    else:
+        position_grid = rasterize_multi_param_values(
+            real_positions, grid=grid
+        )
+        shape = (position_grid.shape[1], position_grid.shape[0]) \
+            if grid == "array" else position_grid.shape
 
-    position_coords: List[Z2] = [
+    position_coords: Union[List[Z2], List[RunLengthPath]] = [
+        RunLengthPath.from_cells(
+            offset_int_positions(planet_position_array)[0]
+        ) if run_length else
         calculate_offset_positions(planet_position_array)[0]
         for planet_position_array in real_positions
     ]
 
-    shape: Z2_POS = (len(position_grid[0]),
-                     len(position_grid))
-
     origin: Z2_POS = (
         int(round(shape[0] / 2, 0)) - 1,
         int(round(shape[1] / 2, 0)) - 1
@@ -1,4 +1,5 @@
-from typing import List
+from types import MappingProxyType
+from typing import List, Dict, Mapping
 
 from space.cosmic_structures.system_sector import (SystemSector,
                                                    SECTOR_OBJECTS, \
@@ -7,51 +8,101 @@ from xmath.structures import Z2_POS
 
 VECTOR_SYSTEM_SECTOR = List[SystemSector]
 MATRIX_SYSTEM_SECTOR = List[VECTOR_SYSTEM_SECTOR]
+SPARSE_SYSTEM_SECTOR = Dict[Z2_POS, SystemSector]
 
 
-# TODO: DO NOT DO A PHYSICAL GRID, CALCULATE IT
-
 class SystemSectorMatrix(object):
+    """
+    x_max by y_max grid of SystemSector's, stored sparsely: a sector is
+    only created the first time its cell is written (or handed out by
+    get_sector), every other cell is empty space that costs nothing.
+    Object lookups and removals on such cells fail without creating one.
+    """
+
     def __init__(self, size: Z2_POS):
         print("Generating System Sector Matrix ...")
-        x_max, y_max = size
-
-        self._sectors: MATRIX_SYSTEM_SECTOR = [
-            [
-                SystemSector(
-                    # Empty Sector
-                    (i, j),
-                    None
-                )
-                for i in range(x_max)
-            ]
-            for j in range(y_max)
-        ]
+        self.size: Z2_POS = (int(size[0]), int(size[1]))
+        self._sectors: SPARSE_SYSTEM_SECTOR = {}
 
     @property
-    def sectors(self):
-        return self._sectors
+    def sectors(self) -> Mapping[Z2_POS, SystemSector]:
+        # the materialized sectors only, keyed by (x, y)
+        return MappingProxyType(self._sectors)
 
-    def set_sector(self, position: Z2_POS, system_sector: SystemSector):
+    @property
+    def num_sectors(self) -> int:
+        return len(self._sectors)
+
+    @property
+    def occupied_positions(self) -> List[Z2_POS]:
+        return [
+            pos for pos, sector in self._sectors.items()
+            if not sector.is_empty
+        ]
+
+    def __contains__(self, position: Z2_POS) -> bool:
         x, y = position
-        self._sectors[y][x] = system_sector
+        return 0 <= x < self.size[0] and 0 <= y < self.size[1]
+
+    def set_sector(self, position: Z2_POS, system_sector: SystemSector):
+        self._sectors[self._key(position)] = system_sector
 
     def set_sector_objects(self, position: Z2_POS, objects: SECTOR_OBJECTS):
-        x, y = position
-        self._sectors[y][x].objects = objects
+        self.get_sector(position).objects = objects
 
     def add_sector_object(self, position: Z2_POS, obj: SECTOR_OBJECT):
-        x, y = position
-        self._sectors[y][x].add_object(obj)
+        self.get_sector(position).add_object(obj)
 
     def remove_sector_object(self, position: Z2_POS, name: str):
-        x, y = position
-        self._sectors[y][x].remove_object(name)
+        self._find_sector(position).remove_object(name)
+
+    def move_sector_objects(
+            self,
+            from_position: Z2_POS,
+            to_position: Z2_POS,
+            names: List[str]
+    ) -> None:
+        # bulk, quiet move of objects between two sectors; the target is
+        # bounds checked first so a bad one removes nothing
+        self._key(to_position)
+        removed: SECTOR_OBJECTS = self._find_sector(
+            from_position
+        ).remove_objects(names)
+        self.get_sector(to_position).add_objects(removed)
 
     def get_sector(self, position: Z2_POS) -> SystemSector:
-        x, y = position
-        return self._sectors[y][x]
+        key: Z2_POS = self._key(position)
+        sector = self._sectors.get(key)
+        if sector is None:
+            sector = self._sectors[key] = SystemSector(key, None)
+
+        return sector
 
     def get_object(self, position: Z2_POS, name: str) -> SECTOR_OBJECT:
-        x, y = position
-        return self._sectors[y][x].get_object(name)
+        return self._find_sector(position).get_object(name)
+
+    def _find_sector(self, position: Z2_POS) -> SystemSector:
+        # read paths: a cell never written has no objects and gets no sector
+        sector = self._sectors.get(self._key(position))
+        if sector is None:
+            raise KeyError(f"no objects in sector {position}")
+
+        return sector
+
+    def prune(self) -> int:
+        # drop materialized sectors that are empty again, returns how many
+        empty: List[Z2_POS] = [
+            pos for pos, sector in self._sectors.items() if sector.is_empty
+        ]
+        for pos in empty:
+            del self._sectors[pos]
+
+        return len(empty)
+
+    def _key(self, position: Z2_POS) -> Z2_POS:
+        if position not in self:
+            raise IndexError(
+                f"sector {position} outside of matrix of size {self.size}"
+            )
+
+        return int(position[0]), int(position[1])
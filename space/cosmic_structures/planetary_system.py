@@ -1,22 +1,30 @@
-from typing import List, Optional, Dict, Union
+from math import ceil, floor, hypot
+from types import MappingProxyType
+from typing import List, Optional, Dict, Union, Mapping, Tuple
+import numpy as np
 
 from generic.factions import Faction
 from ship.starship import StarShip
 from space.cosmic_structures.functions.calculate import (
     calculate_planetary_sys_real_pos,
     calculate_int_positions, get_vector_between_positions,
-    get_distance_between_positions, add_vectors
+    get_distance_between_positions
 )
 from space.cosmic_structures.system_sector import (
     SECTOR_OBJECT,
     SECTOR_OBJECTS
 )
+from space.cosmic_structures.system_snapshot import SystemSnapshot
+from space.cosmic_structures.turn_engine import (
+    TurnEngine, count_planet_moves
+)
 from space.space_structures.planet_types import PlanetType
 from space.space_structures.stars import Star
 from space.space_structures.star_types import StarType
 from space.space_structures.planet import Planet
+from xmath.paths import RunLengthPath
 from xmath.structures import Z2_POS, R2, Z2, R2_POS
-from xmath.xrandom import random_int_generator
+from xmath.xrng import RandomStreams
 
 
 class PlanetarySystem(object):
@@ -30,20 +38,32 @@ class PlanetarySystem(object):
             planet_types: Optional[List[PlanetType]] = None,
             num_planets: Optional[int] = None,
             evenly_spaced: bool = False,
-            faction: Optional[Faction] = None
+            faction: Optional[Faction] = None,
+            rng: Optional[RandomStreams] = None
     ):
         print("Starting to create star system: ", name)
         # main init
         self.epoch: int = 1
         self.name: str = name + " System"
+        self.rng: RandomStreams = RandomStreams(path=self.name) \
+            if rng is None else rng
         self.planets: Optional[Dict[str, Planet]] = None
-        self.objects_path: Dict[str, Z2] = {}
+        self.objects_path: Dict[str, Union[Z2, RunLengthPath]] = {}
         self.objects_real_path: Dict[str, R2] = {}
         self.objects_position_index: Dict[str, int] = {}
         self.star: Optional[Star] = None
         self.shape: Optional[Z2_POS] = None
         self.origin: Optional[Z2_POS] = None
         self.ships: Dict[str, StarShip] = {}
+        self._snapshot: Optional[SystemSnapshot] = None
+        self._engine: Optional[TurnEngine] = None
+        # position -> names of the objects there (kept up to date by
+        # add_ship / turn_planets / turn_ships)
+        self.occupancy: Dict[Z2_POS, List[str]] = {}
+        # integer cell (floored position) -> (name, position) of the
+        # objects in it, ships may sit off the integer grid
+        self._cells: Dict[Z2_POS, List[Tuple[str, R2_POS]]] = {}
+        self._views: Dict[str, Mapping[str, tuple]] = {}
 
         self.generate_planetary_system(
             star_name,
@@ -68,76 +88,62 @@ class PlanetarySystem(object):
         return self.object_positions[self.star.name]
 
     @property
-    def object_positions(self) -> Dict[str, Z2_POS]:
-        ppos: Dict[str, Z2_POS] = {
-            _name: _path[self.objects_position_index[_name]]
-            for _name, _path in self.objects_path.items()
-        }
+    def snapshot(self) -> SystemSnapshot:
+        # positions of all objects this epoch, rebuilt after objects move
+        if self._snapshot is None:
+            self._snapshot = SystemSnapshot(
+                self.epoch,
+                self.object_names,
+                self.objects_path,
+                self.objects_real_path,
+                self.objects_position_index
+            )
 
-        return ppos
+        return self._snapshot
 
     @property
-    def object_real_positions(self) -> Dict[str, R2_POS]:
-        ppos: Dict[str, R2_POS] = {
-            _name: _path[self.objects_position_index[_name]]
-            for _name, _path in self.objects_real_path.items()
-        }
-
-        return ppos
+    def object_positions(self) -> Mapping[str, Z2_POS]:
+        return self._snapshot_view("positions")
 
     @property
-    def next_object_positions(self) -> Dict[str, Z2_POS]:
-        ppos: Dict[str, Z2_POS] = {
-            _name: _path[
-                self.objects_position_index[_name] + 1 % len(
-                    self.objects_path[_name]
-                )
-                ]
-            for _name, _path in self.objects_path.items()
-        }
-
-        return ppos
+    def object_real_positions(self) -> Mapping[str, R2_POS]:
+        return self._snapshot_view("real_positions")
 
     @property
-    def next_object_real_positions(self) -> Dict[str, R2_POS]:
-        ppos: Dict[str, R2_POS] = {
-            _name: _path[
-                self.objects_position_index[_name] + 1 % len(
-                    self.objects_path[_name]
-                )
-                ]
-            for _name, _path in self.objects_real_path.items()
-        }
-
-        return ppos
+    def next_object_positions(self) -> Mapping[str, Z2_POS]:
+        return self._snapshot_view("next_positions")
 
     @property
-    def next_object_vectors(self) -> Dict[str, Z2_POS]:
-        nvecs: Dict[str, Z2_POS] = {
-            _name:
-                (
-                    self.next_object_positions[_name][0] -
-                    self.object_positions[_name][0],
-
-                    self.next_object_positions[_name][1] -
-                    self.object_positions[_name][1]
-                )
-            for _name in self.object_names
-        }
+    def next_object_real_positions(self) -> Mapping[str, R2_POS]:
+        return self._snapshot_view("next_real_positions")
 
-        return nvecs
+    @property
+    def next_object_vectors(self) -> Mapping[str, Z2_POS]:
+        return self._snapshot_view("vectors")
 
     @property
-    def next_object_real_vectors(self) -> Dict[str, R2_POS]:
-        nvecs: Dict[str, R2_POS] = {
-            _name: get_vector_between_positions(
-                self.next_object_real_positions[_name],
-                self.object_real_positions[_name]
+    def next_object_real_vectors(self) -> Mapping[str, R2_POS]:
+        return self._snapshot_view("real_vectors")
+
+    def _snapshot_view(self, name: str) -> Mapping[str, tuple]:
+        if name not in self._views:
+            snapshot: SystemSnapshot = self.snapshot
+            self._views[name] = MappingProxyType(
+                snapshot.as_dict(getattr(snapshot, name))
             )
-            for _name in self.object_names
-        }
 
-        return nvecs
+        return self._views[name]
+
+    def refresh(self, engine: bool = True) -> None:
+        # after editing objects_path / objects_position_index directly
+        if engine:
+            self._engine = None
+        self._positions_changed()
+        self._index_positions()
+
+    def _positions_changed(self) -> None:
+        self._snapshot = None
+        self._views = {}
 
     @property
     def motion_decay(self) -> int:
@@ -180,26 +186,109 @@ class PlanetarySystem(object):
         self.objects_position_index[ship.name] = 0
         self.objects_real_path[ship.name] = [_pos]
         ship.position = _pos
+        self._engine = None
+        self._occupy(ship.name, _pos)
+        self._positions_changed()
+
+    def get_object(self, name: str) -> SECTOR_OBJECT:
+        if name in self.planets:
+            return self.planets[name]
+        if name in self.ships:
+            return self.ships[name]
+        if name == self.star.name:
+            return self.star
+
+        raise KeyError(name)
 
     def get_objects_from_position(self, position: Z2_POS) -> SECTOR_OBJECTS:
-        objects: SECTOR_OBJECTS = [
-            self.objects[obj_name]
-            for obj_name, curr_pos in self.object_positions.items()
-            if position == curr_pos
+        return [
+            self.get_object(obj_name)
+            for obj_name in self.get_object_names_from_position(position)
         ]
 
-        return objects
-
     def get_object_names_from_position(
             self, position: Z2_POS
     ) -> List[str]:
-        object_names: List[str] = [
-            obj_name
-            for obj_name, curr_pos in self.object_positions.items()
-            if position == curr_pos
+        return list(self.occupancy.get(tuple(position), ()))
+
+    def object_names_in_rect(
+            self,
+            low: Z2_POS,
+            high: Z2_POS
+    ) -> List[str]:
+        # names of objects with low <= position <= high (both axes)
+        (x0, y0), (x1, y1) = low, high
+        if x1 < x0 or y1 < y0:
+            return []
+
+        num_cells: int = (floor(x1) - floor(x0) + 1) * \
+            (floor(y1) - floor(y0) + 1)
+        if num_cells <= len(self._cells):
+            return [
+                name
+                for cx in range(floor(x0), floor(x1) + 1)
+                for cy in range(floor(y0), floor(y1) + 1)
+                for name, (x, y) in self._cells.get((cx, cy), ())
+                if x0 <= x <= x1 and y0 <= y <= y1
+            ]
+
+        # sparser than the rectangle: scan the occupied positions instead
+        return [
+            name
+            for (x, y), names in self.occupancy.items()
+            if x0 <= x <= x1 and y0 <= y <= y1
+            for name in names
         ]
 
-        return object_names
+    def object_names_within(
+            self,
+            position: Z2_POS,
+            radius: float
+    ) -> List[str]:
+        x, y = position
+        rect_names: List[str] = self.object_names_in_rect(
+            (ceil(x - radius), ceil(y - radius)),
+            (floor(x + radius), floor(y + radius))
+        )
+        positions: Mapping[str, Z2_POS] = self.object_positions
+
+        return [
+            name for name in rect_names
+            if hypot(positions[name][0] - x, positions[name][1] - y) <= radius
+        ]
+
+    def objects_in_rect(
+            self,
+            low: Z2_POS,
+            high: Z2_POS
+    ) -> Dict[str, SECTOR_OBJECT]:
+        return {
+            name: self.get_object(name)
+            for name in self.object_names_in_rect(low, high)
+        }
+
+    def objects_within(
+            self,
+            position: Z2_POS,
+            radius: float
+    ) -> Dict[str, SECTOR_OBJECT]:
+        return {
+            name: self.get_object(name)
+            for name in self.object_names_within(position, radius)
+        }
+
+    def _occupy(self, name: str, position: Z2_POS) -> None:
+        position = tuple(position)
+        self.occupancy.setdefault(position, []).append(name)
+        self._cells.setdefault(
+            (floor(position[0]), floor(position[1])), []
+        ).append((name, position))
+
+    def _index_positions(self) -> None:
+        self.occupancy = {}
+        self._cells = {}
+        for name, position in self.object_positions.items():
+            self._occupy(name, position)
 
     def get_vector_between_objects(self, name1: str, name2: str) -> Z2_POS:
         return get_vector_between_positions(
@@ -233,36 +322,162 @@ class PlanetarySystem(object):
             roundit=False
         )
 
+    @property
+    def engine(self) -> TurnEngine:
+        # array state of planets and ships, rebuilt after add_ship/refresh
+        if self._engine is None:
+            self._engine = TurnEngine(
+                self.planet_names,
+                [len(self.objects_path[p]) for p in self.planets],
+                [self.objects_position_index[p] for p in self.planets],
+                self.ship_names,
+                [self.objects_path[s][0] for s in self.ships]
+            )
+
+        return self._engine
+
     def turn(self):
         # move all objects on next motion path
-        if (self.epoch > 0) and (self.epoch % self.star.motion_decay == 0):
-            # move planets if motion decay in play
-            self.turn_planets()
+        self.advance(1)
+
+    def advance(self, n_turns: int = 1):
+        # n_turns turns in one step: planets jump by the number of epochs
+        # with motion decay in play, ships by n_turns motion vectors
+        if n_turns <= 0:
+            return
+
+        self._move_planets(
+            count_planet_moves(self.epoch, n_turns, self.motion_decay)
+        )
+        self._move_ships(n_turns)
+
+        self.epoch += n_turns
+        self.refresh(engine=False)
+
+    def state_at(self, epoch: int) -> SystemSnapshot:
+        """
+        Snapshot of the system at any (past or future) epoch, computed
+        directly from the periodic planet motion and the current ship
+        motion vectors, without moving anything.
+        """
+        moves: int = self._planet_moves_to(epoch)
+        paths: Dict[str, Union[Z2, RunLengthPath]] = dict(self.objects_path)
+        real_paths: Dict[str, R2] = dict(self.objects_real_path)
+        position_index: Dict[str, int] = dict(self.objects_position_index)
+
+        for _planet in self.planets:
+            position_index[_planet] = (
+                position_index[_planet] + moves
+            ) % len(paths[_planet])
+
+        for _ship, pos in zip(
+                self.engine.ship_names,
+                map(tuple, self._ship_positions_at(
+                    np.array([epoch])
+                )[0].tolist())
+        ):
+            paths[_ship] = real_paths[_ship] = [pos]
+            position_index[_ship] = 0
+
+        return SystemSnapshot(
+            epoch, self.object_names, paths, real_paths, position_index
+        )
+
+    def positions_at(
+            self,
+            epochs: Union[List[int], np.ndarray],
+            real: bool = False
+    ) -> np.ndarray:
+        """
+        (len(epochs), num objects, 2) positions of every object (in
+        object_names order) at each of the epochs, in one vectorized call
+        per object and without moving anything. real gives the real
+        (float) positions of the planets and star.
+        """
+        epochs = np.asarray(epochs, dtype=np.int64).reshape(-1)
+        moves: np.ndarray = self._planet_moves_to(epochs)
+        paths = self.objects_real_path if real else self.objects_path
+
+        ships: Dict[str, np.ndarray] = {}
+        if self.ships:
+            ship_positions: np.ndarray = self._ship_positions_at(epochs)
+            ships = {
+                _ship: ship_positions[:, idx]
+                for idx, _ship in enumerate(self.engine.ship_names)
+            }
 
-        # move ships along their motion paths
-        self.turn_ships()
+        columns: List[np.ndarray] = []
+        for name in self.object_names:
+            if name in ships:
+                columns.append(ships[name])
+            elif name in self.planets:
+                path = paths[name]
+                index: np.ndarray = (
+                    self.objects_position_index[name] + moves
+                ) % len(path)
+                columns.append(
+                    path.at(index) if isinstance(path, RunLengthPath)
+                    else np.asarray(path)[index]
+                )
+            else:
+                columns.append(np.broadcast_to(
+                    np.asarray(paths[name][0]), (len(epochs), 2)
+                ))
+
+        return np.stack(columns, axis=1)
 
-        self.epoch += 1
+    def _planet_moves_to(
+            self,
+            epoch: Union[int, np.ndarray]
+    ) -> Union[int, np.ndarray]:
+        # planet moves from the current epoch to epoch (-ve going back)
+        decay: int = self.motion_decay
+        return count_planet_moves(1, np.asarray(epoch) - 1, decay) - \
+            count_planet_moves(1, self.epoch - 1, decay)
+
+    def _ship_positions_at(self, epochs: np.ndarray) -> np.ndarray:
+        # (len(epochs), num ships, 2), each ship keeping its current course
+        vectors: np.ndarray = np.array([
+            self.ships[_ship].calculate_motion_vector()
+            for _ship in self.engine.ship_names
+        ]).reshape(-1, 2)
+        turns: np.ndarray = epochs - self.epoch
+
+        return self.engine.ship_positions[None, :, :] + \
+            turns[:, None, None] * vectors[None, :, :]
 
     def turn_ships(self):
-        for _ship in self.ship_names:
-            curr_pos = self.object_positions[_ship]
+        self._move_ships(1)
+        self.refresh(engine=False)
 
-            new_pos = add_vectors(
-                curr_pos,
-                self.ships[_ship].motion_vector
+    def turn_planets(self):
+        self._move_planets(1)
+        self.refresh(engine=False)
+
+    def _move_planets(self, n_moves: int) -> None:
+        if n_moves and self.planets:
+            self.engine.advance_planets(n_moves)
+            self.objects_position_index.update(
+                self.engine.planet_index_items()
             )
+
+    def _move_ships(self, n_turns: int) -> None:
+        if not self.ships:
+            return
+
+        engine: TurnEngine = self.engine
+        engine.advance_ships(
+            np.array([
+                self.ships[_ship].calculate_motion_vector()
+                for _ship in engine.ship_names
+            ]),
+            n_turns
+        )
+        for _ship, new_pos in engine.ship_position_items():
             self.objects_path[_ship] = [new_pos]
             self.objects_position_index[_ship] = 0
             self.ships[_ship].position = new_pos
 
-    def turn_planets(self):
-        for _planet in self.planet_names:
-            self.objects_position_index[_planet] += 1
-            self.objects_position_index[_planet] %= len(
-                self.objects_path[_planet]
-            )
-
     # TODO: PLOT POSITIONS + VECTOR ARROWS !!!!!
 
     # TODO: MULTIPY ON ADDING LARGE NUM OF OBJECTS
@@ -291,12 +506,16 @@ class PlanetarySystem(object):
         )
 
         # Motion Paths (int positions of planets)
-        position_coords: List[Z2]
+        position_coords: List[RunLengthPath]
         shape: Z2_POS
         origin: Z2_POS
 
+        # the rasterized grid itself is not needed, only its shape. Planet
+        # paths are run length encoded (indexed by time step as before)
         _, position_coords, shape, origin = (
-            calculate_int_positions(real_positions)
+            calculate_int_positions(
+                real_positions, grid="none", run_length=True
+            )
         )
 
         self.shape = shape
@@ -312,25 +531,30 @@ class PlanetarySystem(object):
         self.objects_path[self.star.name] = [self.origin]
         self.objects_real_path[self.star.name] = [(0., 0.)]
         self.objects_position_index[self.star.name] = 0
+        self.refresh()
 
         print("Shape: ", self.shape)
         print("Origin: ", self.origin)
 
     def assign_planet_motion_paths(
             self,
-            position_coords: List[Z2],
+            position_coords: Union[List[Z2], List[RunLengthPath]],
             real_positions: List[R2]
     ):
         # Assign planet to a motion path, and
-        # assign a random position along the path
+        # assign a random (distinct per planet) position along the path
+        num_positions: int = min(
+            map(len, position_coords[:len(self.planets)]), default=0
+        )
+        position_indices: List[int] = self.rng.unique_integers(
+            0, num_positions - 1, len(self.planets), "POSITION_INDEX"
+        ).tolist()
+
         for idx, (_name, _planet) in enumerate(self.planets.items()):
             self.objects_path[_name] = position_coords[idx]
             self.objects_real_path[_name] = real_positions[idx]
 
-            rand_int_gen = random_int_generator(
-                0, len(self.objects_path[_name]) - 1
-            )
-            self.objects_position_index[_name] = next(rand_int_gen)
+            self.objects_position_index[_name] = position_indices[idx]
 
     def initialise_planets(
             self,
@@ -341,35 +565,28 @@ class PlanetarySystem(object):
     ):
         if planets is None:
             if planet_types is None:
-                rand_int_gen = random_int_generator(5, 25)
-                num_planets: int = next(rand_int_gen) \
+                num_planets: int = self.rng.integers(5, 25, "NUM_PLANETS") \
                     if num_planets is None else num_planets
 
-                rand_choice_gen = random_int_generator(
-                    0, len(list(PlanetType)) - 1
+                planet_types: List[PlanetType] = self.rng.choice(
+                    list(PlanetType), "PLANET_TYPES", num_planets
                 )
-                planet_types: List[PlanetType] = [
-                    list(PlanetType)[next(rand_choice_gen)]
-                    for _ in range(num_planets)
-                ]
 
             name_trans = lambda _x, _i, _n: f"{str(_x)}-{_i} ({_n})"
 
-            rand_int_gen = random_int_generator(5000, 500_000)
-
-            rand_choice_gen = random_int_generator(
-                0, len(list(Faction)) - 1
-            )
+            sizes: List[int] = self.rng.integers(
+                5000, 500_000, "PLANET_SIZES", len(planet_types)
+            ).tolist()
 
             if faction is None:
-                faction = list(Faction)[next(rand_choice_gen)]
+                faction = self.rng.choice(list(Faction), "FACTION")
 
             planets: Dict[str, Planet] = {
                 name_trans(x, i, self.name): Planet(
                     name=name_trans(x, i, self.name),
                     faction=faction,
                     planet_type=x,
-                    size=next(rand_int_gen) * .001,
+                    size=sizes[i] * .001,
                 )
                 for i, x in enumerate(planet_types)
             }
@@ -384,10 +601,7 @@ class PlanetarySystem(object):
             star_type: Optional[StarType] = None,
     ):
         if star is None:
-            rand_choice_gen = random_int_generator(
-                0, len(list(StarType)) - 1
-            )
-            star_type: StarType = list(StarType)[next(rand_choice_gen)] \
+            star_type: StarType = self.rng.choice(list(StarType), "STAR_TYPE") \
                 if (star_type is None) else star_type
 
             star: Star = Star(
@@ -1,4 +1,4 @@
-from typing import List, Union, Optional
+from typing import List, Union, Optional, Dict, Iterable, ValuesView
 
 from xmath.structures import Z2_POS
 from space.space_structures.stars import Star
@@ -17,28 +17,70 @@ class SystemSector(object):
     ):
         self.name: str = "System Sector " + str(pos)
         self.pos: Z2_POS = pos
-        self.objects: SECTOR_OBJECTS = [] if objects is None else objects
+        # name -> object, in the order they were added
+        self._objects: Dict[str, SECTOR_OBJECT] = {}
+        if objects is not None:
+            self.objects = objects
+
+    @property
+    def objects(self) -> ValuesView[SECTOR_OBJECT]:
+        return self._objects.values()
+
+    @objects.setter
+    def objects(self, objects: Iterable[SECTOR_OBJECT]) -> None:
+        self._objects = {obj.name: obj for obj in objects}
+
+    @property
+    def object_names(self) -> List[str]:
+        return list(self._objects)
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._objects
 
     def get_object(self, name: str) -> SECTOR_OBJECT:
-        idx_get: int = [
-            idx for idx, x in enumerate(self.objects) if x.name == name
-        ][0]
-        return self.objects[idx_get]
+        return self._objects[name]
 
     def add_object(self, obj: SECTOR_OBJECT) -> None:
-        print(
-            f"Adding {obj.instance_of}: {obj.name} in {self.pos} "
-            f": {self.name}"
-        )
-        obj.position = self.pos
-        self.objects.append(obj)
-
-    def remove_object(self, name: str):
-        print(f"Removing {name} from {self.name}")
-        idx_remove: int = [
-            idx for idx, x in enumerate(self.objects) if x.name == name
-        ][0]
-        self.objects.pop(idx_remove)
+        self.add_objects([obj], verbose=True)
+
+    def add_objects(
+            self,
+            objects: Iterable[SECTOR_OBJECT],
+            verbose: bool = False
+    ) -> None:
+        for obj in objects:
+            if verbose:
+                print(
+                    f"Adding {obj.instance_of}: {obj.name} in {self.pos} "
+                    f": {self.name}"
+                )
+            obj.position = self.pos
+            self._objects[obj.name] = obj
+
+    def remove_object(self, name: str) -> SECTOR_OBJECT:
+        return self.remove_objects([name], verbose=True)[0]
+
+    def remove_objects(
+            self,
+            names: Iterable[str],
+            verbose: bool = False
+    ) -> SECTOR_OBJECTS:
+        # all or nothing: a missing name leaves the sector untouched
+        names = list(dict.fromkeys(names))
+        missing: List[str] = [n for n in names if n not in self._objects]
+        if missing:
+            raise KeyError(f"{missing} not in {self.name}")
+
+        removed: SECTOR_OBJECTS = []
+        for name in names:
+            if verbose:
+                print(f"Removing {name} from {self.name}")
+            removed.append(self._objects.pop(name))
+
+        return removed
 
     @property
     def is_empty(self):
@@ -0,0 +1,76 @@
+from typing import List, Dict, Tuple, Union
+import numpy as np
+
+from xmath.structures import Z2, R2
+
+
+class SystemSnapshot(object):
+    """
+    Positions of every object of a PlanetarySystem for one epoch, as
+    contiguous (N, 2) arrays whose row i belongs to names[i] (ids[name]).
+    Built once per turn, the planetary system's position dicts are views
+    over it.
+    """
+
+    def __init__(
+            self,
+            epoch: int,
+            names: List[str],
+            paths: Dict[str, Z2],
+            real_paths: Dict[str, R2],
+            position_index: Dict[str, int]
+    ):
+        self.epoch: int = epoch
+        self.names: List[str] = list(names)
+        self.ids: Dict[str, int] = {
+            name: idx for idx, name in enumerate(self.names)
+        }
+
+        current, upcoming = _current_next(paths, position_index, self.names)
+        real, real_upcoming = _current_next(
+            real_paths, position_index, self.names
+        )
+
+        # grid positions stay int64 unless a ship moved off the grid
+        self.positions: np.ndarray = _as_r2(current)
+        self.next_positions: np.ndarray = _as_r2(upcoming)
+        self.real_positions: np.ndarray = _as_r2(real, np.float64)
+        self.next_real_positions: np.ndarray = _as_r2(
+            real_upcoming, np.float64
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self.next_positions - self.positions
+
+    @property
+    def real_vectors(self) -> np.ndarray:
+        # same orientation as get_vector_between_positions(next, current)
+        return self.real_positions - self.next_real_positions
+
+    def as_dict(self, array: np.ndarray) -> Dict[str, Tuple]:
+        return dict(zip(self.names, map(tuple, array.tolist())))
+
+
+def _current_next(
+        paths: Dict[str, Union[Z2, R2]],
+        position_index: Dict[str, int],
+        names: List[str]
+) -> Tuple[list, list]:
+    current: list = []
+    upcoming: list = []
+    for name in names:
+        path, index = paths[name], position_index[name]
+        current.append(tuple(path[index]))
+        upcoming.append(tuple(path[(index + 1) % len(path)]))
+
+    return current, upcoming
+
+
+def _as_r2(values: list, dtype=None) -> np.ndarray:
+    array: np.ndarray = np.array(values, dtype=dtype).reshape(-1, 2)
+    array.flags.writeable = False
+    return array
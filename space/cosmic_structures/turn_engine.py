@@ -0,0 +1,70 @@
+from typing import List, Sequence, Union, Tuple
+import numpy as np
+
+from xmath.structures import Z2_POS, R2_POS
+
+
+def count_planet_moves(
+        epoch: Union[int, np.ndarray],
+        n_turns: Union[int, np.ndarray],
+        motion_decay: int
+) -> Union[int, np.ndarray]:
+    # planets move on every turn whose epoch e is > 0 and e % motion_decay
+    # == 0, this counts those in [epoch, epoch + n_turns)
+    first = np.maximum(epoch, 1)
+    last = np.asarray(epoch) + n_turns - 1
+    moves = np.where(
+        last >= first, last // motion_decay - (first - 1) // motion_decay, 0
+    )
+    return int(moves) if np.ndim(moves) == 0 else moves
+
+
+class TurnEngine(object):
+    """
+    Array state of a PlanetarySystem's moving objects: planet path
+    indices advanced by one vectorized mod per turn, and ship positions
+    moved by their (S, 2) motion vectors in one add.
+    """
+
+    def __init__(
+            self,
+            planet_names: List[str],
+            planet_path_lengths: Sequence[int],
+            planet_index: Sequence[int],
+            ship_names: List[str],
+            ship_positions: Sequence[Union[Z2_POS, R2_POS]]
+    ):
+        self.planet_names: List[str] = list(planet_names)
+        self.planet_path_lengths: np.ndarray = np.array(
+            planet_path_lengths, dtype=np.int64
+        )
+        self.planet_index: np.ndarray = np.array(planet_index, dtype=np.int64)
+
+        self.ship_names: List[str] = list(ship_names)
+        # int64 while every ship is on the grid, float64 otherwise
+        self.ship_positions: np.ndarray = np.array(
+            ship_positions
+        ).reshape(-1, 2)
+
+    def advance_planets(self, n_moves: int = 1) -> None:
+        self.planet_index += n_moves
+        self.planet_index %= self.planet_path_lengths
+
+    def advance_ships(
+            self,
+            motion_vectors: np.ndarray,
+            n_turns: int = 1
+    ) -> None:
+        steps: np.ndarray = np.asarray(motion_vectors).reshape(-1, 2)
+        if n_turns != 1:
+            steps = steps * n_turns
+
+        self.ship_positions = self.ship_positions + steps
+
+    def planet_index_items(self) -> List[Tuple[str, int]]:
+        return list(zip(self.planet_names, self.planet_index.tolist()))
+
+    def ship_position_items(self) -> List[Tuple[str, tuple]]:
+        return list(zip(
+            self.ship_names, map(tuple, self.ship_positions.tolist())
+        ))
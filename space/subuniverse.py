@@ -1,8 +1,74 @@
-from typing import List, Dict, Any
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Callable, Mapping, Tuple
+import numpy as np
 
+from space.universe_store import UniverseStore, GalaxyColumns
 from xmath.generate_universe import generate_universe_parametric_values
 from xmath.structures import UNIVERSE_STRUCT, R2, R2_POS
 
+# names of the memoized views built per galaxy and merged on access
+VIEW_NAMES = (
+    "galaxies",
+    "galaxy_paths",
+    "stars",
+    "black_holes",
+    "planets",
+    "star_systems",
+    "planet_paths"
+)
+
+
+class ObservedUniverse(dict):
+    """
+    UNIVERSE_STRUCT dict which reports the galaxy key of every top level
+    mutation, so cached views can be invalidated per galaxy.
+    """
+
+    def __init__(
+            self,
+            universe: UNIVERSE_STRUCT,
+            on_change: Callable[[str], None]
+    ):
+        super().__init__(universe)
+        self._on_change: Callable[[str], None] = on_change
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._on_change(key)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._on_change(key)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        had_key: bool = key in self
+        value: Any = super().pop(key, *default)
+        if had_key:
+            self._on_change(key)
+        return value
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._on_change(key)
+        return key, value
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other: Any) -> "ObservedUniverse":
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        for key in list(self.keys()):
+            del self[key]
+
 
 class SubUniverse(object):
     def __init__(
@@ -13,105 +79,342 @@ class SubUniverse(object):
             rand_size_range_limit: int = 5,
             galaxy_distance: float = 10.,
             black_hole_distance: float = 3.,
-            num_black_holes: int = 10
+            num_black_holes: int = 10,
+            lazy_orbits: bool = False,
+            workers: Optional[int] = None,
+            seed: Optional[int] = None
     ):
-        self.universe_positions: UNIVERSE_STRUCT = (
-            generate_universe_parametric_values(
-                num_galaxies, num_systems, num_planet_orbits,
-                rand_size_range_limit, galaxy_distance,
-                black_hole_distance,
-                num_black_holes
-            )
+        self._galaxy_views: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # nested planet records of every galaxy, in store order
+        self._planet_records: Dict[str, List[Dict[str, Any]]] = {}
+        # (galaxy record, galaxy index, planet indices) as last read
+        self._read_index: Dict[
+            str, Tuple[Dict[str, Any], int, np.ndarray]
+        ] = {}
+        self._views: Dict[str, Mapping[str, Any]] = {}
+        # the dicts behind the read only _views, patched per galaxy
+        self._merged: Dict[str, Dict[str, Any]] = {}
+
+        self.universe_positions = generate_universe_parametric_values(
+            num_galaxies, num_systems, num_planet_orbits,
+            rand_size_range_limit, galaxy_distance,
+            black_hole_distance,
+            num_black_holes,
+            lazy_orbits,
+            workers,
+            seed
         )
 
         self.epoch: int = 1
 
+    @property
+    def universe_positions(self) -> UNIVERSE_STRUCT:
+        return self._universe_positions
+
+    @universe_positions.setter
+    def universe_positions(self, universe: UNIVERSE_STRUCT) -> None:
+        self._universe_positions: ObservedUniverse = ObservedUniverse(
+            universe, self._galaxy_changed
+        )
+        self.refresh()
+
+    def refresh(
+            self,
+            galaxy: Optional[str] = None,
+            system: Optional[str] = None
+    ) -> None:
+        """
+        Re-read the nested universe after in place changes. With no
+        arguments everything is rebuilt, otherwise only the galaxy (or the
+        galaxy owning the given star system name) is. Path indices of the
+        re-read bodies are taken from their 'position_index' records.
+        """
+        if system is not None:
+            galaxy = self.store.galaxy_keys[
+                self.store.system_galaxy[self.store.system_index[system]]
+            ]
+
+        if galaxy is not None:
+            self._galaxy_changed(galaxy)
+            return
+
+        for gkey in list(self._read_index):
+            self._sync_records(gkey)
+        # columnar backend, all lookups below are array slicing on it
+        self.store: UniverseStore = UniverseStore.from_universe(
+            self._universe_positions
+        )
+        self._galaxy_views.clear()
+        self._views.clear()
+        self._merged.clear()
+        self._planet_records.clear()
+        self._read_index.clear()
+        for gkey in self.store.galaxy_keys:
+            self._share_paths(gkey)
+            self._read(gkey)
+
+    def _galaxy_changed(self, galaxy: str) -> None:
+        self._sync_records(galaxy)
+        self._read_index.pop(galaxy, None)
+        self._planet_records.pop(galaxy, None)
+        old: Optional[Dict[str, Dict[str, Any]]] = self._galaxy_views.pop(
+            galaxy, None
+        )
+        patched: bool = False
+        if galaxy in self._universe_positions:
+            patched = self.store.set_galaxy(
+                galaxy, self._universe_positions[galaxy]
+            )
+        else:
+            self.store.remove_galaxy(galaxy)
+
+        if patched:
+            self._share_paths(galaxy)
+        else:
+            # the buffer was re-packed, move every galaxy onto it
+            for gkey in self.store.galaxy_keys:
+                self._share_paths(gkey)
+        if galaxy in self.store.galaxy_index:
+            self._read(galaxy)
+
+        self._remerge(galaxy, old)
+        self._remerge_positions(galaxy, patched)
+
+    def _remerge(
+            self,
+            gkey: str,
+            old: Optional[Dict[str, Dict[str, Any]]]
+    ) -> None:
+        # swap one galaxy's entries in the merged views, keeping their
+        # order; a view whose order would change is dropped and rebuilt
+        names: List[str] = [n for n in VIEW_NAMES if n in self._merged]
+        new: Optional[Dict[str, Dict[str, Any]]] = None
+        if gkey in self.store.galaxy_index and names:
+            new = self._galaxy_view(gkey)
+        appended: bool = old is None and new is not None and \
+            self.store.galaxy_keys[-1] == gkey
+
+        for name in names:
+            merged: Dict[str, Any] = self._merged[name]
+            if new is None and old is not None:
+                for key in old[name]:
+                    merged.pop(key, None)
+            elif appended or (
+                    old is not None and new is not None
+                    and list(old[name]) == list(new[name])
+            ):
+                merged.update(new[name])
+            else:
+                del self._merged[name]
+                del self._views[name]
+
+    def _remerge_positions(self, gkey: str, patched: bool) -> None:
+        if "planet_positions" not in self._merged:
+            return
+
+        merged: Dict[str, R2_POS] = self._merged["planet_positions"]
+        if not patched or list(merged) != self.store.planet_names:
+            del self._merged["planet_positions"]
+            del self._views["planet_positions"]
+            return
+
+        planets: slice = self.store.galaxy_planets(
+            self.store.galaxy_index[gkey]
+        )
+        merged.update(zip(
+            self.store.planet_names[planets],
+            map(tuple, self.store.planet_positions[planets].tolist())
+        ))
+
+    def _share_paths(self, gkey: str) -> None:
+        # point the nested records' sampled paths (and the position rows
+        # taken from them) at the store's buffer, the arrays they were
+        # generated with are dropped
+        chunk: GalaxyColumns = self.store.galaxy(gkey)
+        galaxy: Dict[str, Any] = self._universe_positions[gkey]
+        systems: Dict[str, Any] = galaxy['star_systems']
+        if chunk.motion_orbit is None:
+            galaxy['motion_path'] = chunk.motion_path
+
+        records: List[Dict[str, Any]] = []
+        for pid, pkey in enumerate(chunk.planet_keys):
+            system: Dict[str, Any] = systems[
+                chunk.system_keys[chunk.planet_system[pid]]
+            ]
+            planet: Dict[str, Any] = system['planets'][pkey]
+            records.append(planet)
+            if chunk.planet_orbits[pid] is not None:
+                continue
+
+            path: np.ndarray = chunk.planet_motion_path(pid)
+            orbit_paths: List[Any] = system.get('planet_orbit_paths', [])
+            for i, old in enumerate(orbit_paths):
+                if old is planet['motion_path']:
+                    orbit_paths[i] = path
+            planet['motion_path'] = path
+            planet['position'] = [path[planet.get(
+                'position_index', chunk.planet_path_index[pid]
+            )]]
+
+        self._planet_records[gkey] = records
+
+    def _read(self, gkey: str) -> None:
+        # note the path indices the store took from the nested records
+        chunk: GalaxyColumns = self.store.galaxy(gkey)
+        self._read_index[gkey] = (
+            self._universe_positions[gkey],
+            int(chunk.path_index[0]),
+            chunk.planet_path_index.copy()
+        )
+
+    def _sync_records(self, gkey: str) -> None:
+        # advance() only steps the store, bring the nested records of a
+        # galaxy (as read, even if since replaced or removed) up to it
+        # before they are re-read - records edited since are left as is
+        if gkey not in self._read_index or gkey not in self.store.galaxy_index:
+            return
+        galaxy, galaxy_read, planets_read = self._read_index[gkey]
+
+        chunk: GalaxyColumns = self.store.galaxy(gkey)
+        if galaxy.get('position_index', galaxy_read) == galaxy_read:
+            galaxy['position_index'] = int(chunk.path_index[0])
+
+        records: List[Dict[str, Any]] = self._planet_records[gkey]
+        current: np.ndarray = chunk.planet_path_index
+        for pid in np.flatnonzero(current != planets_read).tolist():
+            planet: Dict[str, Any] = records[pid]
+            if planet.get('position_index') != planets_read[pid]:
+                continue
+            path: Any = planet['motion_path']
+            index: int = int(current[pid]) % len(path)
+            planet['position_index'] = index
+            planet['position'] = [path[index]]
+
+    def _galaxy_view(self, gkey: str) -> Dict[str, Dict[str, Any]]:
+        if gkey in self._galaxy_views:
+            return self._galaxy_views[gkey]
+
+        chunk: GalaxyColumns = self.store.galaxy(gkey)
+        galaxy: Dict[str, Any] = self._universe_positions[gkey]
+        systems: Dict[str, Any] = galaxy['star_systems']
+
+        view: Dict[str, Dict[str, Any]] = {
+            name: {} for name in VIEW_NAMES
+        }
+        view["galaxies"][gkey] = galaxy
+        view["galaxy_paths"][gkey] = chunk.motion_path
+
+        origins: List[R2_POS] = [
+            tuple(x) for x in chunk.system_origins.tolist()
+        ]
+        for sid, skey in enumerate(chunk.system_keys):
+            view["star_systems"][chunk.system_names[sid]] = systems[skey]
+            kind: str = "black_holes" if chunk.system_is_centre[sid] \
+                else "stars"
+            view[kind][chunk.system_star_names[sid]] = origins[sid]
+
+        for pid, pname in enumerate(chunk.planet_names):
+            skey: str = chunk.system_keys[chunk.planet_system[pid]]
+            view["planets"][pname] = systems[skey]['planets'][
+                chunk.planet_keys[pid]
+            ]
+            view["planet_paths"][pname] = chunk.planet_motion_path(pid)
+
+        self._galaxy_views[gkey] = view
+        return view
+
+    def _view(self, name: str) -> Mapping[str, Any]:
+        if name not in self._views:
+            merged: Dict[str, Any] = {}
+            for gkey in self.store.galaxy_keys:
+                merged.update(self._galaxy_view(gkey)[name])
+            self._merged[name] = merged
+            self._views[name] = MappingProxyType(merged)
+
+        return self._views[name]
+
     @property
     def galaxy_names(self) -> List[str]:
-        return [str(x) for x in self.universe_positions.keys()]
+        return list(self.store.galaxy_keys)
 
     @property
-    def galaxy_paths(self) -> Dict[str, R2]:
-        _gp: Dict[str, R2] = {}
-        for gname, galaxy in self.universe_positions.items():
-            _gp[gname] = galaxy['motion_path']
-        return _gp
+    def galaxy_paths(self) -> Mapping[str, R2]:
+        return self._view("galaxy_paths")
 
     @property
     def star_names(self) -> List[str]:
-        return [str(x) for x in self.stars.keys()]
+        return list(self.stars)
 
     @property
     def black_hole_names(self) -> List[str]:
-        return [str(x) for x in self.black_holes.keys()]
+        return list(self.black_holes)
 
     @property
     def planet_names(self) -> List[str]:
-        return [str(x) for x in self.planets.keys()]
+        return list(self.planets)
 
     @property
-    def stars(self) -> Dict[str, R2_POS]:
-        _stars: Dict[str, R2_POS] = {}
-        for gname, galaxy in self.universe_positions.items():
-            for sname, system in galaxy['star_systems'].items():
-                if not system['is_centre']:
-                    _stars[system['star_name']] = system['origin'][0]
-        return _stars
+    def stars(self) -> Mapping[str, R2_POS]:
+        return self._view("stars")
 
     @property
-    def black_holes(self) -> Dict[str, R2_POS]:
-        _black_holes: Dict[str, R2_POS] = {}
-        for gname, galaxy in self.universe_positions.items():
-            for sname, system in galaxy['star_systems'].items():
-                if system['is_centre']:
-                    _black_holes[system['star_name']] = system['origin'][0]
-        return _black_holes
+    def black_holes(self) -> Mapping[str, R2_POS]:
+        return self._view("black_holes")
 
     @property
-    def planets(self) -> Dict[str, Any]:
-        _planets: Dict[str, Any] = {}
-        for gname, galaxy in self.universe_positions.items():
-            for sname, system in galaxy['star_systems'].items():
-                for planet_name, planet_data in system['planets'].items():
-                    _planets[planet_name] = planet_data
-        return _planets
+    def planets(self) -> Mapping[str, Any]:
+        return self._view("planets")
 
     @property
-    def star_systems(self) -> Dict[str, Any]:
-        _star_systems: Dict[str, Any] = {}
-        for gname, galaxy in self.universe_positions.items():
-            for sname, system in galaxy['star_systems'].items():
-                _star_systems[sname] = system
-        return _star_systems
+    def star_systems(self) -> Mapping[str, Any]:
+        return self._view("star_systems")
 
     @property
-    def galaxies(self) -> Dict[str, Any]:
-        _galaxies: Dict[str, Any] = {}
-        for gname, galaxy in self.universe_positions.items():
-            _galaxies[gname] = galaxy
-        return _galaxies
+    def galaxies(self) -> Mapping[str, Any]:
+        return self._view("galaxies")
 
     @property
     def star_positions(self) -> R2:
-        return [x for x in self.stars.values()]
+        return list(self.stars.values())
 
     @property
-    def black_hole_positions(self) -> Dict[str, R2_POS]:
-        return {
-            w: x
-            for w, x in self.black_holes.items()
-        }
+    def black_hole_positions(self) -> Mapping[str, R2_POS]:
+        return self.black_holes
 
     @property
-    def planet_positions(self) -> Dict[str, R2]:
-        return {
-            w:
-            x['position'][0] for w, x in self.planets.items()
-        }
+    def planet_positions(self) -> Mapping[str, R2_POS]:
+        # current positions, rebuilt only after an advance
+        if "planet_positions" not in self._views:
+            merged: Dict[str, R2_POS] = dict(zip(
+                self.store.planet_names,
+                map(tuple, self.store.planet_positions.tolist())
+            ))
+            self._merged["planet_positions"] = merged
+            self._views["planet_positions"] = MappingProxyType(merged)
+
+        return self._views["planet_positions"]
 
     @property
-    def planet_paths(self) -> Dict[str, R2]:
-        return {
-            w:
-            x['motion_path'] for w, x in self.planets.items()
-        }
+    def galaxy_positions(self) -> Mapping[str, R2_POS]:
+        return dict(zip(
+            self.store.galaxy_keys,
+            map(tuple, self.store.galaxy_positions.tolist())
+        ))
+
+    def advance(self, n_epochs: int = 1) -> np.ndarray:
+        """
+        Step all planets and galaxies n_epochs along their motion paths.
+        Returns the current planet positions as one (N, 2) array in
+        store (planet_names) order. The nested records' position_index
+        and position catch up when they are next re-read (refresh).
+        """
+        positions: np.ndarray = self.store.advance(n_epochs)
+        self.epoch += n_epochs
+        self._merged.pop("planet_positions", None)
+        self._views.pop("planet_positions", None)
+
+        return positions
+
+    @property
+    def planet_paths(self) -> Mapping[str, R2]:
+        return self._view("planet_paths")
@@ -0,0 +1,611 @@
+from typing import List, Dict, Any, Tuple, Optional, Union
+import numpy as np
+
+from xmath.orbits import ParametricOrbit, OrbitTable, group_orbits
+from xmath.structures import UNIVERSE_STRUCT, R2_POS
+
+MOTION_PATH = Union[np.ndarray, ParametricOrbit]
+
+
+class GalaxyColumns(object):
+    """
+    Columnar (struct-of-arrays) slice of a single galaxy of a
+    UNIVERSE_STRUCT. A UniverseStore is a concatenation of these.
+
+    Sampled motion paths are kept as coordinate rows, lazy
+    ParametricOrbit's are kept as they are and take no rows.
+    """
+
+    def __init__(self, key: str, galaxy: Dict[str, Any]):
+        self.key: str = key
+        self.name: str = galaxy['name']
+        self.motion_orbit: Optional[ParametricOrbit] = _as_orbit(
+            galaxy['motion_path']
+        )
+        self.motion_path: MOTION_PATH = (
+            self.motion_orbit if self.motion_orbit is not None
+            else np.asarray(
+                galaxy['motion_path'], dtype=np.float64
+            ).reshape(-1, 2)
+        )
+        self.path_index: np.ndarray = np.array(
+            [galaxy.get('position_index', 0)], dtype=np.int64
+        )
+
+        systems: Dict[str, Any] = galaxy['star_systems']
+
+        self.system_keys: List[str] = []
+        self.system_names: List[str] = []
+        self.system_star_names: List[str] = []
+        self.planet_keys: List[str] = []
+        self.planet_names: List[str] = []
+        self.planet_orbits: List[Optional[ParametricOrbit]] = []
+
+        origins: List[R2_POS] = []
+        is_centre: List[bool] = []
+        num_planets: List[int] = []
+        path_index: List[int] = []
+        path_lengths: List[int] = []
+        # sampled planet paths as given, only copied when packed
+        self.planet_paths: List[np.ndarray] = []
+
+        for skey, system in systems.items():
+            self.system_keys.append(skey)
+            self.system_names.append(system['name'])
+            self.system_star_names.append(system['star_name'])
+            origins.append(system['origin'][0])
+            is_centre.append(bool(system['is_centre']))
+            num_planets.append(len(system['planets']))
+
+            for pkey, planet in system['planets'].items():
+                self.planet_keys.append(pkey)
+                self.planet_names.append(planet['name'])
+
+                orbit: Optional[ParametricOrbit] = _as_orbit(
+                    planet['motion_path']
+                )
+                self.planet_orbits.append(orbit)
+                path: MOTION_PATH = orbit if orbit is not None else \
+                    np.asarray(planet['motion_path'], dtype=np.float64)
+                if orbit is None:
+                    self.planet_paths.append(path.reshape(-1, 2))
+
+                path_lengths.append(len(path))
+                path_index.append(
+                    planet['position_index'] if 'position_index' in planet
+                    else _locate(path, planet['position'][0])
+                )
+
+        self.system_origins: np.ndarray = np.array(
+            origins, dtype=np.float64
+        ).reshape(-1, 2)
+        self.system_is_centre: np.ndarray = np.array(is_centre, dtype=bool)
+        self.system_num_planets: np.ndarray = np.array(
+            num_planets, dtype=np.int64
+        )
+        self.planet_path_index: np.ndarray = np.array(
+            path_index, dtype=np.int64
+        )
+        self.planet_path_lengths: np.ndarray = np.array(
+            path_lengths, dtype=np.int64
+        )
+        # rows taken in the coordinate buffer (0 for lazy orbits)
+        self.planet_coord_lengths: np.ndarray = np.array(
+            [0 if o is not None else n
+             for o, n in zip(self.planet_orbits, path_lengths)],
+            dtype=np.int64
+        )
+        self._planet_coords: Optional[np.ndarray] = None
+        self.planet_coord_offsets: np.ndarray = _offsets(
+            self.planet_coord_lengths
+        )
+        self.planet_system: np.ndarray = np.repeat(
+            np.arange(len(num_planets), dtype=np.int64),
+            self.system_num_planets
+        )
+
+    @property
+    def planet_coords(self) -> np.ndarray:
+        # a view of the store's buffer once packed
+        if self._planet_coords is None:
+            self._planet_coords = np.concatenate(
+                self.planet_paths
+            ).reshape(-1, 2) if self.planet_paths else np.empty(
+                (0, 2), dtype=np.float64
+            )
+
+        return self._planet_coords
+
+    @property
+    def num_systems(self) -> int:
+        return len(self.system_names)
+
+    @property
+    def num_planets(self) -> int:
+        return len(self.planet_names)
+
+    def same_layout(self, other: "GalaxyColumns") -> bool:
+        # same systems, planets and path sizes, so other's rows can be
+        # written over this galaxy's in place
+        return (
+            (self.motion_orbit is None) == (other.motion_orbit is None)
+            and [o is None for o in self.planet_orbits]
+            == [o is None for o in other.planet_orbits]
+            and len(self.motion_path) == len(other.motion_path)
+            and np.array_equal(
+                self.system_num_planets, other.system_num_planets
+            )
+            and np.array_equal(
+                self.planet_path_lengths, other.planet_path_lengths
+            )
+            and np.array_equal(
+                self.planet_coord_lengths, other.planet_coord_lengths
+            )
+        )
+
+    @property
+    def motion_coord_length(self) -> int:
+        return 0 if self.motion_orbit is not None else len(self.motion_path)
+
+    def planet_motion_path(self, planet_id: int) -> MOTION_PATH:
+        if self.planet_orbits[planet_id] is not None:
+            return self.planet_orbits[planet_id]
+
+        return self.planet_coords[
+            self.planet_coord_offsets[planet_id]:
+            self.planet_coord_offsets[planet_id + 1]
+        ]
+
+
+class UniverseStore(object):
+    """
+    Struct-of-arrays backend for a generated universe.
+
+    Every sampled motion path (galaxy spirals and planet orbits) lives in
+    one contiguous float64 ``coords`` buffer addressed through
+    ``path_offsets``; lazy ParametricOrbit paths take no rows and are
+    evaluated in per equation OrbitTable's instead. Galaxies, star systems
+    and planets are rows in flat tables linked by integer offset / parent
+    id columns.
+    """
+
+    def __init__(self, galaxies: List[GalaxyColumns]):
+        self._galaxies: List[GalaxyColumns] = galaxies
+        self._build()
+
+    @classmethod
+    def from_universe(cls, universe: UNIVERSE_STRUCT) -> "UniverseStore":
+        return cls([
+            GalaxyColumns(gkey, galaxy) for gkey, galaxy in universe.items()
+        ])
+
+    @property
+    def galaxies(self) -> List[GalaxyColumns]:
+        return self._galaxies
+
+    def galaxy(self, key: str) -> GalaxyColumns:
+        return self._galaxies[self.galaxy_index[key]]
+
+    def set_galaxy(self, key: str, galaxy: Dict[str, Any]) -> bool:
+        """
+        Re-read one galaxy from the nested structure. When it keeps its
+        layout (systems, planets, path sizes) only its rows are written
+        over in place and True is returned; otherwise (or for a new galaxy)
+        every galaxy is re-packed from its existing columns.
+        """
+        chunk: GalaxyColumns = GalaxyColumns(key, galaxy)
+        if key in self.galaxy_index:
+            gid: int = self.galaxy_index[key]
+            if self._galaxies[gid].same_layout(chunk):
+                self._patch(gid, chunk)
+                return True
+
+            self._galaxies[gid] = chunk
+        else:
+            self._galaxies.append(chunk)
+        self._build()
+        return False
+
+    def remove_galaxy(self, key: str) -> None:
+        if key in self.galaxy_index:
+            self._galaxies.pop(self.galaxy_index[key])
+            self._build()
+
+    def _build(self) -> None:
+        chunks: List[GalaxyColumns] = self._galaxies
+
+        # galaxies
+        self.galaxy_keys: List[str] = [c.key for c in chunks]
+        self.galaxy_names: List[str] = [c.name for c in chunks]
+
+        # star systems
+        self.system_keys: List[str] = [
+            k for c in chunks for k in c.system_keys
+        ]
+        self.system_names: List[str] = [
+            n for c in chunks for n in c.system_names
+        ]
+        self.system_star_names: List[str] = [
+            n for c in chunks for n in c.system_star_names
+        ]
+        num_systems: np.ndarray = np.array(
+            [c.num_systems for c in chunks], dtype=np.int64
+        )
+        self.galaxy_system_offsets: np.ndarray = _offsets(num_systems)
+        self.system_galaxy: np.ndarray = np.repeat(
+            np.arange(len(chunks), dtype=np.int64), num_systems
+        )
+        self.system_origins: np.ndarray = _concat_r2(
+            [c.system_origins for c in chunks]
+        )
+        self.system_is_centre: np.ndarray = np.concatenate(
+            [c.system_is_centre for c in chunks]
+        ).astype(bool) if chunks else np.empty(0, dtype=bool)
+
+        # planets
+        self.planet_keys: List[str] = [
+            k for c in chunks for k in c.planet_keys
+        ]
+        self.planet_names: List[str] = [
+            n for c in chunks for n in c.planet_names
+        ]
+        planets_per_system: np.ndarray = _concat_int(
+            [c.system_num_planets for c in chunks]
+        )
+        self.system_planet_offsets: np.ndarray = _offsets(planets_per_system)
+        self.planet_system: np.ndarray = np.repeat(
+            np.arange(len(planets_per_system), dtype=np.int64),
+            planets_per_system
+        )
+        self.planet_path_index: np.ndarray = _concat_int(
+            [c.planet_path_index for c in chunks]
+        )
+
+        # paths: per galaxy, the galaxy motion path followed by the
+        # motion paths of all its planets
+        path_sizes: List[np.ndarray] = []
+        coord_lengths: List[np.ndarray] = []
+        coords: List[np.ndarray] = []
+        galaxy_path: List[int] = []
+        planet_path: List[np.ndarray] = []
+        self.path_orbits: Dict[int, ParametricOrbit] = {}
+        num_paths: int = 0
+        for c in chunks:
+            galaxy_path.append(num_paths)
+            planet_path.append(
+                np.arange(num_paths + 1, num_paths + 1 + c.num_planets,
+                          dtype=np.int64)
+            )
+            if c.motion_orbit is not None:
+                self.path_orbits[num_paths] = c.motion_orbit
+            for pid, orbit in enumerate(c.planet_orbits):
+                if orbit is not None:
+                    self.path_orbits[num_paths + 1 + pid] = orbit
+            num_paths += 1 + c.num_planets
+
+            path_sizes.append(np.array([len(c.motion_path)]))
+            path_sizes.append(c.planet_path_lengths)
+            coord_lengths.append(np.array([c.motion_coord_length]))
+            coord_lengths.append(c.planet_coord_lengths)
+            if c.motion_orbit is None:
+                coords.append(c.motion_path)
+            coords.extend(c.planet_paths)
+
+        self.coords: np.ndarray = _concat_r2(coords)
+        self.path_offsets: np.ndarray = _offsets(_concat_int(coord_lengths))
+        self.path_sizes: np.ndarray = _concat_int(path_sizes)
+        self.galaxy_path: np.ndarray = np.array(galaxy_path, dtype=np.int64)
+        self.planet_path: np.ndarray = _concat_int(planet_path)
+        self.galaxy_path_index: np.ndarray = _concat_int(
+            [c.path_index for c in chunks]
+        )
+
+        # flat lookup tables for the vectorized epoch advance
+        self.planet_path_starts: np.ndarray = self.path_offsets[
+            self.planet_path]
+        self.planet_path_lengths: np.ndarray = self.path_sizes[
+            self.planet_path]
+        self.galaxy_path_starts: np.ndarray = self.path_offsets[
+            self.galaxy_path]
+        self.galaxy_path_lengths: np.ndarray = self.path_sizes[
+            self.galaxy_path]
+
+        # lazy orbits, grouped into one table per equation
+        self.planet_is_lazy: np.ndarray = np.array(
+            [int(p) in self.path_orbits for p in self.planet_path], dtype=bool
+        )
+        self.galaxy_is_lazy: np.ndarray = np.array(
+            [int(p) in self.path_orbits for p in self.galaxy_path],
+            dtype=bool
+        )
+        self.planet_orbit_tables: List[Tuple[np.ndarray, OrbitTable]] = \
+            _orbit_tables(self.planet_path, self.planet_is_lazy,
+                          self.path_orbits)
+        self.galaxy_orbit_tables: List[Tuple[np.ndarray, OrbitTable]] = \
+            _orbit_tables(self.galaxy_path, self.galaxy_is_lazy,
+                          self.path_orbits)
+
+        # coords stay writable: the nested records' paths are views of it,
+        # in place edits of them land here (refresh picks up the rest)
+        self.system_origins.flags.writeable = False
+
+        for gid, c in enumerate(chunks):
+            self._attach(gid, c)
+
+        self.galaxy_index: Dict[str, int] = {
+            k: i for i, k in enumerate(self.galaxy_keys)
+        }
+        self.system_index: Dict[str, int] = {
+            n: i for i, n in enumerate(self.system_names)
+        }
+        self.planet_index: Dict[str, int] = {
+            n: i for i, n in enumerate(self.planet_names)
+        }
+
+    def _coord_slices(self, gid: int, c: GalaxyColumns) -> Tuple[int, ...]:
+        # start of the galaxy path, of its planets' paths, and their end
+        path_id: int = int(self.galaxy_path[gid])
+        return (
+            int(self.path_offsets[path_id]),
+            int(self.path_offsets[path_id + 1]),
+            int(self.path_offsets[path_id + 1 + c.num_planets])
+        )
+
+    def _attach(self, gid: int, c: GalaxyColumns) -> None:
+        # re-point the per galaxy columns into the shared buffers so the
+        # coordinates are only held once
+        start, mid, stop = self._coord_slices(gid, c)
+        if c.motion_orbit is None:
+            c.motion_path = self.coords[start:mid]
+        c._planet_coords = self.coords[mid:stop]
+        c.planet_paths = [
+            c.planet_motion_path(pid) for pid in range(c.num_planets)
+            if c.planet_orbits[pid] is None
+        ]
+
+        systems: slice = self.galaxy_systems(gid)
+        planets: slice = self.galaxy_planets(gid)
+        c.system_origins = self.system_origins[systems]
+        c.planet_path_index = self.planet_path_index[planets]
+        c.path_index = self.galaxy_path_index[gid:gid + 1]
+
+    def _patch(self, gid: int, c: GalaxyColumns) -> None:
+        # write a galaxy of unchanged layout over its rows
+        old: GalaxyColumns = self._galaxies[gid]
+        systems: slice = self.galaxy_systems(gid)
+        planets: slice = self.galaxy_planets(gid)
+
+        start, mid, _ = self._coord_slices(gid, old)
+        if c.motion_orbit is None:
+            _copy_rows(self.coords[start:mid], c.motion_path)
+        offsets: np.ndarray = mid + old.planet_coord_offsets
+        paths = iter(c.planet_paths)
+        for pid, orbit in enumerate(c.planet_orbits):
+            if orbit is None:
+                _copy_rows(
+                    self.coords[offsets[pid]:offsets[pid + 1]], next(paths)
+                )
+
+        self.system_origins.flags.writeable = True
+        self.system_origins[systems] = c.system_origins
+        self.system_origins.flags.writeable = False
+        self.system_is_centre[systems] = c.system_is_centre
+        self.planet_path_index[planets] = c.planet_path_index
+        self.galaxy_path_index[gid] = c.path_index[0]
+
+        for name in old.system_names:
+            self.system_index.pop(name, None)
+        for name in old.planet_names:
+            self.planet_index.pop(name, None)
+        self.galaxy_names[gid] = c.name
+        self.system_keys[systems] = c.system_keys
+        self.system_names[systems] = c.system_names
+        self.system_star_names[systems] = c.system_star_names
+        self.planet_keys[planets] = c.planet_keys
+        self.planet_names[planets] = c.planet_names
+        self.system_index.update(
+            (name, systems.start + i) for i, name in enumerate(c.system_names)
+        )
+        self.planet_index.update(
+            (name, planets.start + i) for i, name in enumerate(c.planet_names)
+        )
+
+        if c.motion_orbit is not None or \
+                any(o is not None for o in c.planet_orbits):
+            self._patch_orbits(gid, c)
+
+        self._galaxies[gid] = c
+        self._attach(gid, c)
+
+    def _patch_orbits(self, gid: int, c: GalaxyColumns) -> None:
+        path_id: int = int(self.galaxy_path[gid])
+        if c.motion_orbit is not None:
+            self.path_orbits[path_id] = c.motion_orbit
+        for pid, orbit in enumerate(c.planet_orbits):
+            if orbit is not None:
+                self.path_orbits[path_id + 1 + pid] = orbit
+
+        # the tables only hold orbit parameters, regroup them
+        self.planet_orbit_tables = _orbit_tables(
+            self.planet_path, self.planet_is_lazy, self.path_orbits
+        )
+        self.galaxy_orbit_tables = _orbit_tables(
+            self.galaxy_path, self.galaxy_is_lazy, self.path_orbits
+        )
+
+    @property
+    def num_galaxies(self) -> int:
+        return len(self.galaxy_names)
+
+    @property
+    def num_systems(self) -> int:
+        return len(self.system_names)
+
+    @property
+    def num_planets(self) -> int:
+        return len(self.planet_names)
+
+    @property
+    def path_lengths(self) -> np.ndarray:
+        return self.path_sizes
+
+    @property
+    def planet_positions(self) -> np.ndarray:
+        return _positions(
+            self.coords, self.planet_path_starts, self.planet_path_index,
+            self.planet_is_lazy, self.planet_orbit_tables
+        )
+
+    @property
+    def galaxy_positions(self) -> np.ndarray:
+        return _positions(
+            self.coords, self.galaxy_path_starts, self.galaxy_path_index,
+            self.galaxy_is_lazy, self.galaxy_orbit_tables
+        )
+
+    def advance(self, n_epochs: int = 1) -> np.ndarray:
+        """
+        Move every planet and galaxy n_epochs steps along its motion path
+        (in place, one modulo add per table) and return the (N, 2) planet
+        positions.
+        """
+        self.planet_path_index += n_epochs
+        self.planet_path_index %= self.planet_path_lengths
+        self.galaxy_path_index += n_epochs
+        self.galaxy_path_index %= self.galaxy_path_lengths
+
+        return self.planet_positions
+
+    def path(self, path_id: int) -> MOTION_PATH:
+        if path_id in self.path_orbits:
+            return self.path_orbits[path_id]
+
+        return self.coords[
+            self.path_offsets[path_id]:self.path_offsets[path_id + 1]
+        ]
+
+    def galaxy_motion_path(self, galaxy_id: int) -> MOTION_PATH:
+        return self.path(int(self.galaxy_path[galaxy_id]))
+
+    def planet_motion_path(self, planet_id: int) -> MOTION_PATH:
+        return self.path(int(self.planet_path[planet_id]))
+
+    def galaxy_systems(self, galaxy_id: int) -> slice:
+        return slice(
+            int(self.galaxy_system_offsets[galaxy_id]),
+            int(self.galaxy_system_offsets[galaxy_id + 1])
+        )
+
+    def system_planets(self, system_id: int) -> slice:
+        return slice(
+            int(self.system_planet_offsets[system_id]),
+            int(self.system_planet_offsets[system_id + 1])
+        )
+
+    def galaxy_planets(self, galaxy_id: int) -> slice:
+        systems: slice = self.galaxy_systems(galaxy_id)
+        return slice(
+            int(self.system_planet_offsets[systems.start]),
+            int(self.system_planet_offsets[systems.stop])
+        )
+
+    def system_keys_of(self, system_id: int) -> Tuple[str, str]:
+        return (
+            self.galaxy_keys[self.system_galaxy[system_id]],
+            self.system_keys[system_id]
+        )
+
+    def planet_keys_of(self, planet_id: int) -> Tuple[str, str, str]:
+        gkey, skey = self.system_keys_of(self.planet_system[planet_id])
+        return gkey, skey, self.planet_keys[planet_id]
+
+    def nbytes(self, include_tables: bool = True) -> int:
+        arrays: List[np.ndarray] = [self.coords, self.path_offsets]
+        if include_tables:
+            arrays.extend([
+                self.path_sizes,
+                self.galaxy_system_offsets, self.galaxy_path,
+                self.system_galaxy, self.system_origins,
+                self.system_is_centre, self.system_planet_offsets,
+                self.planet_system, self.planet_path, self.planet_path_index,
+                self.galaxy_path_index
+            ])
+        return int(sum(a.nbytes for a in arrays)) + int(sum(
+            o.nbytes for o in self.path_orbits.values()
+        ))
+
+
+def _as_orbit(path: Any) -> Optional[ParametricOrbit]:
+    return path if isinstance(path, ParametricOrbit) else None
+
+
+def _orbit_tables(
+        path_ids: np.ndarray,
+        is_lazy: np.ndarray,
+        path_orbits: Dict[int, ParametricOrbit]
+) -> List[Tuple[np.ndarray, OrbitTable]]:
+    # (row ids in the owning table, OrbitTable of those rows)
+    rows: np.ndarray = np.flatnonzero(is_lazy)
+    if len(rows) == 0:
+        return []
+
+    return [
+        (rows[ids], table)
+        for ids, table in group_orbits(
+            [path_orbits[int(path_ids[r])] for r in rows]
+        )
+    ]
+
+
+def _positions(
+        coords: np.ndarray,
+        starts: np.ndarray,
+        index: np.ndarray,
+        is_lazy: np.ndarray,
+        orbit_tables: List[Tuple[np.ndarray, OrbitTable]]
+) -> np.ndarray:
+    if len(orbit_tables) == 0:
+        return coords[starts + index]
+
+    positions: np.ndarray = np.empty((len(index), 2), dtype=np.float64)
+    eager: np.ndarray = ~is_lazy
+    positions[eager] = coords[starts[eager] + index[eager]]
+    for rows, table in orbit_tables:
+        positions[rows] = table.sample(index[rows])
+
+    return positions
+
+
+def _locate(path: MOTION_PATH, position: R2_POS) -> int:
+    matches: np.ndarray = np.flatnonzero(
+        np.all(np.asarray(path) == np.asarray(position), axis=1)
+    )
+    return int(matches[0]) if len(matches) else 0
+
+
+def _copy_rows(dst: np.ndarray, src: np.ndarray) -> None:
+    # skip paths that already are these rows (views of the buffer)
+    src = np.asarray(src, dtype=np.float64).reshape(-1, 2)
+    if src.__array_interface__['data'][0] != \
+            dst.__array_interface__['data'][0]:
+        dst[...] = src
+
+
+def _offsets(counts: np.ndarray) -> np.ndarray:
+    offsets: np.ndarray = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def _concat_r2(arrays: List[np.ndarray]) -> np.ndarray:
+    if len(arrays) == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    return np.ascontiguousarray(
+        np.concatenate(arrays).reshape(-1, 2), dtype=np.float64
+    )
+
+
+def _concat_int(arrays: List[np.ndarray]) -> np.ndarray:
+    if len(arrays) == 0:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(arrays).astype(np.int64)
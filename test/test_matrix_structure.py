@@ -0,0 +1,45 @@
+import pytest
+
+from space.cosmic_structures.matrix_structure import SystemSectorMatrix
+from space.space_structures.star_types import StarType
+from space.space_structures.stars import Star
+
+
+def test_sparse_matrix_materializes_touched_cells_only():
+    matrix = SystemSectorMatrix((10_000, 10_000))
+    assert matrix.num_sectors == 0
+
+    star = Star("Sparse", StarType.Star)
+    matrix.add_sector_object((9_999, 42), star)
+
+    assert matrix.num_sectors == 1
+    assert matrix.get_object((9_999, 42), star.name) is star
+    assert star.position == (9_999, 42)
+    assert matrix.occupied_positions == [(9_999, 42)]
+
+    # reading an empty cell gives an empty sector, kept for later writes
+    empty = matrix.get_sector((3, 4))
+    assert empty.is_empty and empty.pos == (3, 4)
+    assert matrix.get_sector((3, 4)) is empty
+
+    matrix.remove_sector_object((9_999, 42), star.name)
+    assert matrix.prune() == 2
+    assert matrix.num_sectors == 0
+
+    # failed lookups on untouched cells leave no sector behind
+    for lookup in (matrix.get_object, matrix.remove_sector_object):
+        with pytest.raises(KeyError):
+            lookup((5, 5), "x")
+    with pytest.raises(KeyError):
+        matrix.move_sector_objects((5, 5), (6, 6), ["x"])
+    assert matrix.num_sectors == 0
+
+
+def test_sparse_matrix_bounds():
+    matrix = SystemSectorMatrix((5, 3))
+
+    assert (4, 2) in matrix and (5, 2) not in matrix
+    with pytest.raises(IndexError):
+        matrix.get_sector((-1, 0))
+    with pytest.raises(IndexError):
+        matrix.get_sector((0, 3))
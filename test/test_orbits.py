@@ -0,0 +1,80 @@
+import numpy as np
+
+from space.subuniverse import SubUniverse
+from xmath.orbits import ParametricOrbit, OrbitTable
+from xmath.pcurve import (
+    generate_parametric_values, evaluate_many, compile_equation
+)
+
+
+def test_orbit_matches_sampled_path():
+    args = ("elipse", (0, 100), 1000, 25)
+    params = dict(a=3., b=2., hs=1., vs=-2.)
+
+    sampled = generate_parametric_values(*args, **params)
+    orbit = ParametricOrbit(*args, **params)
+
+    assert len(orbit) == len(sampled)
+    assert orbit.nbytes == 0
+    assert np.array_equal(orbit[999], sampled[999])
+    assert np.allclose(orbit[[0, 5, 998]], sampled[[0, 5, 998]])
+    assert np.allclose(orbit.materialize(), sampled)
+    assert not orbit.is_materialized
+
+    orbit.materialize(cache=True)
+    assert orbit.is_materialized
+    assert np.allclose(np.asarray(orbit), sampled)
+
+
+def test_orbit_table_samples_many_orbits():
+    orbits = [
+        ParametricOrbit("circle", (0, 100), 1000, 1, r=r, hs=r, vs=-r)
+        for r in (0.1, 0.2, 0.3)
+    ]
+    index = np.array([3, 500, 999])
+
+    table = OrbitTable(orbits)
+    assert np.allclose(
+        table.sample(index),
+        [o[i] for o, i in zip(orbits, index)]
+    )
+
+
+def test_lazy_universe_advance():
+    su = SubUniverse(2, 4, 4, 5, 10., 3., 1, lazy_orbits=True)
+    store = su.store
+
+    assert store.coords.shape == (0, 2)
+    assert len(store.path_orbits) == store.num_planets + store.num_galaxies
+
+    start = store.planet_path_index.copy()
+    positions = su.advance(7)
+    for pid, name in enumerate(su.planet_names):
+        orbit = su.planet_paths[name]
+        assert np.allclose(positions[pid], orbit[(start[pid] + 7) % 1000])
+
+
+def test_evaluate_many_matches_per_curve():
+    t_values = np.linspace(0, 100, 50)
+    radii = np.array([1., 2., 3.])
+    table = np.array(
+        [(r, r, -r) for r in radii],
+        dtype=[("r", float), ("hs", float), ("vs", float)]
+    )
+
+    batched = evaluate_many("circle", t_values, table, factor=2.)
+    assert batched.shape == (3, 50, 2)
+    for k, r in enumerate(radii):
+        assert np.allclose(
+            batched[k],
+            generate_parametric_values(
+                "circle", (0, 100), 50, 2., r=r, hs=r, vs=-r
+            )
+        )
+
+    # plain 2D table, columns in compiled order
+    assert compile_equation("circle").columns == ("r", "hs", "vs")
+    assert np.allclose(
+        evaluate_many("circle", t_values, table.view((float, 3)), 2.),
+        batched
+    )
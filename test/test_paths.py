@@ -0,0 +1,48 @@
+import numpy as np
+
+from space.cosmic_structures.functions.calculate import (
+    calculate_int_positions, calculate_planetary_sys_real_pos
+)
+from xmath.paths import RunLengthPath
+from xmath.pcurve import generate_parametric_values
+
+
+def test_run_length_path_indexes_by_time():
+    cells = [(0, 0), (0, 0), (1, 0), (1, 0), (1, 0), (1, 1), (0, 0)]
+    path = RunLengthPath.from_cells(cells)
+
+    assert path.num_runs == 4 and len(path) == 7
+    assert path.dwell.tolist() == [2, 3, 1, 1]
+    assert [path[t] for t in range(7)] == cells
+    assert path[-1] == cells[-1] and path[9] == cells[2]
+    assert np.array_equal(path.at(np.arange(14)), np.array(cells * 2))
+    assert path.time_to_next_cell(2) == 3 and path.time_to_next_cell(4) == 1
+    assert list(path) == cells
+
+
+def test_run_length_int_positions_match_lists():
+    real_positions = calculate_planetary_sys_real_pos(9, True)
+
+    _, lists, shape, origin = calculate_int_positions(real_positions)
+    _, paths, rl_shape, rl_origin = calculate_int_positions(
+        real_positions, grid="none", run_length=True
+    )
+
+    assert (shape, origin) == (rl_shape, rl_origin)
+    for cells, path in zip(lists, paths):
+        assert path.cells.dtype == np.int32
+        assert np.array_equal(path.to_array(), np.array(cells))
+        assert path[500] == cells[500]
+
+
+def test_run_length_path_merges_dense_samples():
+    # ~160 cells around, sampled 5000 times
+    orbit = generate_parametric_values(
+        "circle", (0, 2 * np.pi), 5_000, 25, r=1, hs=0, vs=0
+    )
+    cells = np.round(orbit).astype(np.int32)
+    path = RunLengthPath.from_cells(cells)
+
+    assert path.num_runs < len(cells) // 10
+    assert path.nbytes < cells.nbytes // 5
+    assert np.array_equal(path.to_array(), cells)
@@ -0,0 +1,97 @@
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+from xanimation.aniscene import AnimatedScene  # noqa: E402
+from xanimation.pobject import PhysicalObject  # noqa: E402
+from xanimation.pscene import PhysicalScene  # noqa: E402
+from xmath.gobj import generate_square_points, \
+    generate_spiked_circle_points  # noqa: E402
+
+
+def _scene() -> PhysicalScene:
+    scene = PhysicalScene()
+    scene.add_object(PhysicalObject(
+        generate_square_points(center=(0, 0), side_length=10),
+        velocity=(1, 0), _rotation_speed_deg=20.0, color="cyan"
+    ), main=True)
+    for i in range(10):
+        scene.add_object(PhysicalObject(
+            generate_spiked_circle_points(
+                center=(30 * i, 20), radius=4, num_spikes=5 + i
+            ),
+            velocity=(0, -i), _rotation_speed_deg=5.0 * i, color="red"
+        ))
+    return scene
+
+
+def test_collection_tracks_buffer():
+    animator = AnimatedScene(_scene(), renderer="collection", cull=False)
+    buffer = animator.scene.buffer
+
+    for frame in range(5):
+        artists = animator._update_animation(frame)
+    animator.fig.canvas.draw()
+
+    assert artists == [animator.collection.collection]
+    paths = animator.collection.collection.get_paths()
+    assert len(paths) == len(buffer)
+    for row, path in enumerate(paths):
+        coords = buffer.object_vertices(row)
+        assert np.array_equal(path.vertices[:len(coords)], coords)
+        assert np.array_equal(path.vertices[-1], coords[0])
+
+    facecolors = animator.collection.collection.get_facecolors()
+    assert np.allclose(facecolors[0], buffer.objects[0].patch.get_facecolor())
+
+    # a new object rebuilds the collection on the next frame
+    animator.scene.add_object(PhysicalObject(generate_square_points()))
+    animator._update_animation(5)
+    assert len(animator.collection.collection.get_paths()) == 12
+    plt.close(animator.fig)
+
+
+def test_renderers_agree():
+    collection = AnimatedScene(_scene(), renderer="collection", cull=False)
+    patches = AnimatedScene(_scene(), renderer="patches")
+
+    for frame in range(5):
+        collection._update_animation(frame)
+        patch_artists = patches._update_animation(frame)
+
+    for path, patch in zip(
+            collection.collection.collection.get_paths(), patch_artists
+    ):
+        assert np.allclose(path.vertices, patch.get_xy())
+    assert collection.xlim == patches.xlim
+    plt.close("all")
+
+
+def test_culled_collection_holds_visible_objects():
+    animator = AnimatedScene(_scene(), renderer="collection")
+    buffer = animator.scene.buffer
+
+    for frame in range(8):
+        artists = animator._update_animation(frame)
+        rows = animator.collection.rows
+        bounds = buffer.bounds
+        in_view = np.flatnonzero(
+            (bounds[:, 0] <= animator.xlim[1])
+            & (bounds[:, 2] >= animator.xlim[0])
+            & (bounds[:, 1] <= animator.ylim[1])
+            & (bounds[:, 3] >= animator.ylim[0])
+        )
+        assert np.array_equal(rows, in_view)
+        assert 0 < len(rows) < len(buffer)
+
+        paths = artists[0].get_paths()
+        assert len(paths) == len(rows)
+        for row, path in zip(rows, paths):
+            coords = buffer.object_vertices(row)
+            assert np.array_equal(path.vertices[:len(coords)], coords)
+        assert np.allclose(
+            artists[0].get_facecolors(),
+            [buffer.objects[row].patch.get_facecolor() for row in rows]
+        )
+    plt.close(animator.fig)
@@ -0,0 +1,146 @@
+import numpy as np
+
+from xanimation.pobject import PhysicalObject
+from xanimation.pscene import PhysicalScene
+from xanimation.xauxi import get_all_patches
+from xmath.gobj import generate_square_points, generate_circle_points, \
+    generate_isosceles_triangle_points, generate_spiked_circle_points
+
+
+def _scene(batched: bool) -> PhysicalScene:
+    scene = PhysicalScene(batched=batched)
+
+    ship_coords = generate_isosceles_triangle_points(
+        center=(50, 50), base=8, height=10
+    )
+    guns = [
+        PhysicalObject(
+            generate_square_points(center=ship_coords[i], side_length=3),
+            (0, 0),
+            0.0,
+            attachments=[PhysicalObject(
+                generate_circle_points(center=ship_coords[i], radius=1),
+                (0, 0), 0.0, is_main=False
+            )],
+            is_main=False
+        )
+        for i in range(2)
+    ]
+    ship = PhysicalObject(
+        ship_coords, velocity=(1, -2), _rotation_speed_deg=5.0,
+        attachments=guns
+    )
+    scene.add_object(ship, main=True)
+
+    for i in range(20):
+        scene.add_object(PhysicalObject(
+            generate_spiked_circle_points(
+                center=(40 * i, -10 * i), radius=5 + i, num_spikes=8 + i,
+                spike_height=3
+            ),
+            velocity=(i / 10, 1 - i / 5),
+            _rotation_speed_deg=7.0 * (i % 3),
+            _one_time_remaining_deg=30.0 * (i % 2),
+            _one_time_rotation_speed_deg=-45.0
+        ))
+
+    return scene
+
+
+def _vertices(scene: PhysicalScene):
+    patches = []
+    for obj in scene.objects:
+        stack = [obj]
+        while stack:
+            o = stack.pop(0)
+            patches.append(np.array(o.shape_coords))
+            stack = list(o.attachments or []) + stack
+    return patches
+
+
+def test_batched_scene_matches_objects():
+    batched, objects = _scene(True), _scene(False)
+
+    for step in range(40):
+        for scene in (batched, objects):
+            ship = scene.main_object
+            if step == 15:
+                ship.velocity = [-3, 0.5]
+                ship.one_time_remaining_deg = 90.0
+                ship.one_time_rotation_speed_deg = 60.0
+            elif step == 20:
+                # a gun turning on its own, its tip follows
+                ship.attachments[0].rotation_speed_deg = 30.0
+                ship.attachments[1].velocity = [0, 2]
+            elif step == 30:
+                ship.rotation_speed_deg = -10.0
+
+        patches_b = batched.update(0.1)
+        patches_o = objects.update(0.1)
+        assert len(patches_b) == len(patches_o)
+
+    for coords_b, coords_o in zip(_vertices(batched), _vertices(objects)):
+        assert np.allclose(coords_b, coords_o)
+    for patch_b, patch_o in zip(patches_b, patches_o):
+        assert np.allclose(patch_b.get_xy(), patch_o.get_xy())
+    assert np.allclose(batched.main_center, objects.main_center)
+
+    buffer = batched.buffer
+    for row, coords in enumerate(_vertices(batched)):
+        assert np.array_equal(
+            buffer.bounds[row], [*coords.min(axis=0), *coords.max(axis=0)]
+        )
+
+
+def test_objects_are_handles_into_buffer():
+    scene = _scene(True)
+    buffer = scene.buffer
+    ship = scene.main_object
+
+    assert len(buffer) == 5 + 20
+    assert np.shares_memory(ship.shape_coords, buffer.vertices)
+    assert buffer.parent.tolist()[:5] == [-1, 0, 1, 0, 3]
+    assert buffer.depth.tolist()[:5] == [0, 1, 2, 1, 2]
+    assert get_all_patches(ship) == buffer.patches()[:5]
+
+    ship.velocity = [4, 4]
+    # the setter writes the root row, attachments get it on resolve
+    assert buffer.velocity[1].tolist() == [0, 0]
+    buffer.resolve()
+    assert np.all(buffer.velocity[:5] == 4)
+    assert ship.attachments[1].velocity.tolist() == [4, 4]
+
+    # adding an object rebuilds the buffer with state carried over
+    before = np.array(ship.shape_coords)
+    scene.add_object(PhysicalObject(generate_square_points()))
+    assert scene.buffer is not buffer
+    assert np.array_equal(ship.shape_coords, before)
+    assert scene.main_object.velocity.tolist() == [4, 4]
+
+
+def test_center_is_tracked_not_recomputed(monkeypatch):
+    import xanimation.pobject
+
+    scenes = _scene(True), _scene(False)
+
+    def no_dedup(*args, **kwargs):
+        raise AssertionError("center recomputed from the vertices")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(xanimation.pobject, "unique_coordinates", no_dedup)
+        for _ in range(25):
+            for scene in scenes:
+                scene.update(0.1)
+                scene.main_center
+
+    for scene in scenes:
+        for obj in scene.buffer.objects:
+            coords = np.unique(obj.shape_coords, axis=0)
+            assert np.allclose(obj.center, coords.mean(axis=0))
+
+    # assigning new vertices re-centers from them
+    ship = scenes[0].main_object
+    ship.shape_coords = ship.shape_coords + 10
+    assert np.allclose(
+        ship.center, np.unique(ship.shape_coords, axis=0).mean(axis=0)
+    )
@@ -0,0 +1,80 @@
+import numpy as np
+
+from space.cosmic_structures.functions.calculate import (
+    calculate_int_positions, calculate_planetary_sys_real_pos
+)
+from xmath.pcurve import (
+    rasterize_parametric_values, rasterize_multi_param_values,
+    generate_multi_param_num_grid, offset_int_positions
+)
+
+
+def _reference_grid(values, markers):
+    # the original per point loop
+    int_vals = [(int(round(x, 0)), int(round(y, 0))) for (x, y) in values]
+    min_x = min(v[0] for v in int_vals)
+    min_y = min(v[1] for v in int_vals)
+    int_vals = [(x - min(min_x, 0), y - min(min_y, 0)) for x, y in int_vals]
+    grid = [
+        [0] * (max(v[0] for v in int_vals) + 1)
+        for _ in range(max(v[1] for v in int_vals) + 1)
+    ]
+    for idx, (x, y) in enumerate(int_vals):
+        grid[y][x] = [m2 for (m1, m2) in markers if idx >= m1][-1]
+
+    return grid
+
+
+def test_rasterize_matches_reference():
+    rng = np.random.default_rng(1)
+    values = np.round(rng.normal(size=(3000, 2)) * 15 * 2) / 2
+    markers = [(0, 1), (500, 4), (1200, 300)]
+
+    grid = rasterize_parametric_values(values, markers)
+    assert grid.dtype == np.uint16
+    assert grid.tolist() == _reference_grid(values.tolist(), markers)
+
+
+def test_multi_param_labels_curves_in_order():
+    curves = [
+        np.array([[0., 0.], [1., 0.]]),
+        np.array([[1., 0.], [2., 2.]]),
+        np.array([[-1., 1.]])
+    ]
+
+    grid = rasterize_multi_param_values(curves)
+    assert grid.tolist() == [[0, 1, 2, 0], [3, 0, 0, 0], [0, 0, 0, 2]]
+    assert generate_multi_param_num_grid(curves) == grid.tolist()
+
+    int_vals, shape = offset_int_positions(np.concatenate(curves))
+    assert shape == (4, 3) and int_vals.min() == 0
+
+
+def test_grid_modes_agree():
+    real_positions = calculate_planetary_sys_real_pos(35, True)
+
+    dense, coords, shape, origin = calculate_int_positions(real_positions)
+    dense = np.array(dense)
+
+    for mode in ("array", "sparse", "bitmap", "none"):
+        grid, m_coords, m_shape, m_origin = calculate_int_positions(
+            real_positions, grid=mode
+        )
+        assert (m_coords, m_shape, m_origin) == (coords, shape, origin)
+
+        if mode == "array":
+            assert np.array_equal(grid, dense)
+        elif mode == "sparse":
+            assert np.array_equal(grid.to_dense(), dense)
+            x, y = grid.x[10], grid.y[10]
+            assert grid.get((x, y)) == dense[y, x]
+            assert grid.get((0, 0)) == dense[0, 0]
+        elif mode == "bitmap":
+            assert np.array_equal(grid.to_dense(), dense > 0)
+            assert grid.nbytes == (shape[0] * shape[1] + 7) // 8
+            x, y = grid.occupied()
+            assert (x[0], y[0]) in grid and (-1, 0) not in grid
+            dense_y, dense_x = np.nonzero(dense)
+            assert np.array_equal(x, dense_x) and np.array_equal(y, dense_y)
+        else:
+            assert grid is None
@@ -0,0 +1,108 @@
+from bisect import bisect
+from math import pi
+import numpy as np
+
+from xmath.generate_universe import generate_universe_parametric_values
+from xmath.pcurve import generate_parametric_values
+from xmath.spatial import (
+    select_star_locations, unique_coordinates, PoissonDiscSampler
+)
+from xmath.xrng import RandomStreams
+
+
+def test_star_locations_match_bisect_selection():
+    origin = (3., -2.)
+    coordinates = generate_parametric_values(
+        "log_spiral_elipse", (0, 250), 2_000, .1,
+        hs=origin[0], vs=origin[1], a_C=1, b_C=1, rot=2 * pi / 5, L=.015
+    )
+
+    magnitudes = [
+        ((x - origin[0]) ** 2 + (y - origin[1]) ** 2) ** .5
+        for x, y in coordinates
+    ]
+    even_space = np.linspace(min(magnitudes), max(magnitudes), 20)
+    expected = [coordinates[bisect(magnitudes, x) - 1] for x in even_space]
+
+    assert np.array_equal(
+        select_star_locations(coordinates, origin, 20), expected
+    )
+    assert select_star_locations(coordinates, origin, 0).shape == (0, 2)
+
+
+def test_star_locations_unordered_curve():
+    coordinates = np.array([[3., 0.], [1., 0.], [0., 2.], [0., 0.]])
+    assert np.array_equal(
+        select_star_locations(coordinates, (0, 0), 4),
+        [[0., 0.], [1., 0.], [0., 2.], [3., 0.]]
+    )
+
+
+def test_unique_coordinates():
+    coordinates = np.array([
+        [2., 1.], [0., 0.], [2., 1.], [1., 5.], [0., 0.], [1.004, 5.]
+    ])
+
+    assert np.array_equal(
+        unique_coordinates(coordinates),
+        [[2., 1.], [0., 0.], [1., 5.], [1.004, 5.]]
+    )
+    assert np.array_equal(
+        unique_coordinates(coordinates, keep_order=False),
+        np.unique(coordinates, axis=0)
+    )
+
+    unique, index = unique_coordinates(
+        coordinates, tolerance=.01, return_index=True
+    )
+    assert np.array_equal(unique, [[2., 1.], [0., 0.], [1., 5.]])
+    assert np.array_equal(index, [0, 1, 3])
+
+
+def _min_pairwise_distance(points):
+    points = np.asarray(points, dtype=np.float64)
+    diff = points[:, None, :] - points[None, :, :]
+    dist = np.hypot(diff[..., 0], diff[..., 1])
+    np.fill_diagonal(dist, np.inf)
+    return dist.min()
+
+
+def test_poisson_disc_sampler_separation():
+    placer = PoissonDiscSampler((0, 0), (5, 5), cell_size=2.)
+    rng = RandomStreams(3)
+
+    for _ in range(500):
+        placer.place(2., rng)
+
+    points = placer.as_array()
+    assert len(points) == 500
+    assert _min_pairwise_distance(points) >= 2.
+    # box is filled before growing outwards
+    inside = np.all((points >= 0) & (points <= 5), axis=1)
+    assert 1 < inside.sum() < 500
+
+
+def test_poisson_disc_sampler_variable_distance():
+    placer = PoissonDiscSampler((0, 0), (5, 5), cell_size=10.)
+    rng = RandomStreams(4)
+
+    galaxies = np.array([placer.place(10., rng) for _ in range(30)])
+    black_holes = np.array([placer.place(3., rng) for _ in range(30)])
+
+    assert _min_pairwise_distance(galaxies) >= 10.
+    assert _min_pairwise_distance(np.vstack([galaxies, black_holes])) >= 3.
+
+
+def test_universe_origins_separated():
+    universe = generate_universe_parametric_values(
+        num_galaxies=12, num_systems=2, num_planet_orbits=2,
+        num_black_holes=6, lazy_orbits=True, seed=2
+    )
+    origins = np.array([
+        galaxy["motion_path"].parameter_values[k]
+        for galaxy in universe.values() for k in ("hs", "vs")
+    ]).reshape(-1, 2)
+
+    assert _min_pairwise_distance(origins[:12]) >= 10.
+    assert _min_pairwise_distance(origins) >= 3.
+
@@ -0,0 +1,68 @@
+import pytest
+
+from space.cosmic_structures.matrix_structure import SystemSectorMatrix
+from space.cosmic_structures.system_sector import SystemSector
+from space.space_structures.star_types import StarType
+from space.space_structures.stars import Star
+
+
+def _stars(num: int):
+    return [Star(f"S{idx}", StarType.Star) for idx in range(num)]
+
+
+def test_sector_keeps_insertion_order_and_lookups(capsys):
+    stars = _stars(300)
+    sector = SystemSector((1, 2))
+
+    sector.add_objects(stars)
+    assert capsys.readouterr().out == ""
+    assert list(sector.objects) == stars
+    assert len(sector) == 300 and "S7 Star" in sector
+    assert sector.get_object("S150 Star") is stars[150]
+    assert stars[0].position == (1, 2)
+
+    removed = sector.remove_objects(["S10 Star", "S0 Star"])
+    assert removed == [stars[10], stars[0]]
+    assert sector.object_names == [
+        s.name for s in stars if s not in removed
+    ]
+
+    sector.remove_object("S1 Star")
+    assert "Removing S1 Star" in capsys.readouterr().out
+
+
+def test_sector_objects_assignable_from_list():
+    stars = _stars(3)
+    sector = SystemSector((0, 0), stars)
+    assert list(sector.objects) == stars
+
+    sector.objects = stars[:1]
+    assert sector.object_names == ["S0 Star"] and not sector.is_empty
+
+
+def test_matrix_moves_objects_between_sectors():
+    stars = _stars(5)
+    matrix = SystemSectorMatrix((10, 10))
+    matrix.get_sector((1, 1)).add_objects(stars)
+
+    matrix.move_sector_objects((1, 1), (2, 3), ["S1 Star", "S3 Star"])
+
+    assert matrix.get_sector((1, 1)).object_names == [
+        "S0 Star", "S2 Star", "S4 Star"
+    ]
+    assert list(matrix.get_sector((2, 3)).objects) == [stars[1], stars[3]]
+    assert stars[3].position == (2, 3)
+
+
+def test_failed_move_loses_nothing():
+    stars = _stars(3)
+    matrix = SystemSectorMatrix((10, 10))
+    matrix.add_sector_object((1, 1), stars[0])
+    matrix.add_sector_object((1, 1), stars[1])
+
+    with pytest.raises(KeyError):
+        matrix.move_sector_objects((1, 1), (2, 2), ["S0 Star", "nope"])
+
+    assert matrix.get_sector((1, 1)).object_names == ["S0 Star", "S1 Star"]
+    assert matrix.get_sector((2, 2)).is_empty
+    assert stars[0].position == (1, 1)
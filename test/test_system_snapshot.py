@@ -0,0 +1,106 @@
+import numpy as np
+
+from generic.factions import Faction
+from ship.ship_types.engines import WarpEngine, ImpulseEngine
+from ship.ship_types.missions import Mission
+from ship.ship_types.shields import Shields
+from ship.starship import StarShip
+from space.cosmic_structures.planetary_system import PlanetarySystem
+from space.space_structures.star_types import StarType
+from xmath.xrng import RandomStreams
+
+
+def _system() -> PlanetarySystem:
+    return PlanetarySystem(
+        "Snap-1", "Snap", None, StarType.Star, num_planets=4,
+        rng=RandomStreams(8, "Snap-1")
+    )
+
+
+def test_snapshot_matches_paths():
+    ps = _system()
+    snapshot = ps.snapshot
+
+    assert snapshot is ps.snapshot
+    assert snapshot.names == ps.object_names
+    for name in ps.object_names:
+        path = ps.objects_path[name]
+        index = ps.objects_position_index[name]
+        row = snapshot.ids[name]
+
+        assert ps.object_positions[name] == tuple(path[index])
+        assert tuple(snapshot.next_positions[row]) == tuple(
+            path[(index + 1) % len(path)]
+        )
+        assert np.allclose(
+            ps.object_real_positions[name],
+            ps.objects_real_path[name][index]
+        )
+        assert ps.next_object_vectors[name] == tuple(
+            snapshot.next_positions[row] - snapshot.positions[row]
+        )
+
+
+def test_snapshot_wraps_and_refreshes_on_turn():
+    ps = _system()
+    planet = ps.planet_names[0]
+    path = ps.objects_path[planet]
+
+    ps.objects_position_index[planet] = len(path) - 2
+    ps.refresh()
+    ps.turn_planets()
+    old_snapshot = ps.snapshot
+
+    # next position at the end of the path wraps to the start
+    assert ps.object_positions[planet] == tuple(path[-1])
+    assert ps.next_object_positions[planet] == tuple(path[0])
+
+    ps.turn_planets()
+    assert ps.snapshot is not old_snapshot
+    assert ps.object_positions[planet] == tuple(path[0])
+
+
+def test_occupancy_queries_match_scan():
+    ps = _system()
+
+    def scan(keep):
+        return sorted(
+            name for name, pos in ps.object_positions.items() if keep(pos)
+        )
+
+    for _ in range(3):
+        star_pos = ps.star_position
+        assert ps.get_object_names_from_position(star_pos) == [ps.star.name]
+        assert ps.get_objects_from_position(star_pos) == [ps.star]
+
+        assert sorted(ps.object_names_in_rect((0, 0), (10 ** 4, 500))) == \
+            scan(lambda p: 0 <= p[0] <= 10 ** 4 and 0 <= p[1] <= 500)
+        assert sorted(ps.objects_within(star_pos, 300)) == scan(
+            lambda p: np.hypot(p[0] - star_pos[0], p[1] - star_pos[1]) <= 300
+        )
+        assert ps.object_names_in_rect(star_pos, star_pos) == [ps.star.name]
+        assert ps.object_names_in_rect((5, 5), (4, 4)) == []
+
+        ps.turn_planets()
+
+    assert sum(map(len, ps.occupancy.values())) == len(ps.object_names)
+
+
+def test_rect_queries_find_off_grid_ships():
+    ps = _system()
+    ship = StarShip(
+        "Ship-F", Faction.Federation, "F-1", "Captain", Mission.Scientific,
+        100, Shields.Tachyon, False, [], [],
+        WarpEngine.StandardWarpDrive, ImpulseEngine.FusionDrive
+    )
+    ps.add_ship(ship, (10.5, 10.5))
+
+    # a 2x2 rectangle is walked cell by cell when the system is not sparse
+    assert ps.object_names_in_rect((10, 10), (11, 11)) == [ship.name]
+    assert ps.object_names_within((10, 10), 1.) == [ship.name]
+    assert ps.object_names_in_rect((10.6, 10), (11, 11)) == []
+    assert ps.object_names_in_rect((10.2, 10.2), (10.6, 10.6)) == [ship.name]
+    # filed under its floored cell, other cells keep the cell walk
+    assert ps._cells[(10, 10)] == [(ship.name, (10.5, 10.5))]
+    star_pos = ps.star_position
+    assert ps.object_names_in_rect(star_pos, star_pos) == [ps.star.name]
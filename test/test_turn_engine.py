@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from generic.factions import Faction
+from ship.ship_types.engines import WarpEngine, ImpulseEngine
+from ship.ship_types.missions import Mission
+from ship.ship_types.shields import Shields
+from ship.starship import StarShip
+from space.cosmic_structures.planetary_system import PlanetarySystem
+from space.cosmic_structures.turn_engine import count_planet_moves
+from space.space_structures.star_types import StarType
+from xmath.xrng import RandomStreams
+
+
+def _system(course_vectors) -> PlanetarySystem:
+    ps = PlanetarySystem(
+        "Turn-1", "Turn", None, StarType.RedGiant, num_planets=5,
+        rng=RandomStreams(12, "Turn-1")
+    )
+    for idx, course in enumerate(course_vectors):
+        ship = StarShip(
+            f"Ship-{idx}", Faction.Federation, f"T-{idx}", "Captain",
+            Mission.Scientific, 100, Shields.Tachyon, False, [], [],
+            WarpEngine.StandardWarpDrive, ImpulseEngine.FusionDrive
+        )
+        ship.set_impulse_speed(.2)
+        ship.course_vector = course
+        ps.add_ship(ship, ps.star_position)
+
+    return ps
+
+
+@pytest.mark.parametrize("epoch", [0, 1, 2, 5, 7])
+def test_count_planet_moves_matches_stepping(epoch):
+    for decay in (1, 3, 4):
+        for n_turns in range(12):
+            stepped = sum(
+                1 for e in range(epoch, epoch + n_turns)
+                if e > 0 and e % decay == 0
+            )
+            assert count_planet_moves(epoch, n_turns, decay) == stepped
+
+
+def test_advance_matches_repeated_turns(capsys):
+    stepped = _system([(3, 4), (-1, 0)])
+    jumped = _system([(3, 4), (-1, 0)])
+    capsys.readouterr()
+
+    for _ in range(23):
+        stepped.turn()
+    jumped.advance(23)
+
+    # ships move quietly (no motion_vector prints)
+    assert "Sector Speed" not in capsys.readouterr().out
+
+    assert jumped.epoch == stepped.epoch == 24
+    assert dict(jumped.object_positions) == dict(stepped.object_positions)
+    assert jumped.objects_position_index == stepped.objects_position_index
+    for name in jumped.ship_names:
+        assert jumped.ships[name].position == stepped.ships[name].position
+        assert jumped.get_object_names_from_position(
+            jumped.object_positions[name]
+        ) == stepped.get_object_names_from_position(
+            stepped.object_positions[name]
+        )
+
+
+def test_state_and_positions_at_match_advancing():
+    ps = _system([(3, 4), (0, -2)])
+    ps.advance(5)
+    before = dict(ps.object_positions)
+
+    epochs = [6, 7, 30, 101, 457]
+    ahead = ps.positions_at(epochs)
+    real_ahead = ps.positions_at(epochs, real=True)
+    states = [ps.state_at(e) for e in epochs]
+
+    # nothing moved
+    assert ps.epoch == 6 and dict(ps.object_positions) == before
+    assert ahead.shape == (5, len(ps.object_names), 2)
+    assert np.array_equal(ps.positions_at([6])[0], ps.snapshot.positions)
+
+    for idx, epoch in enumerate(epochs):
+        ps.advance(epoch - ps.epoch)
+        assert np.array_equal(ahead[idx], ps.snapshot.positions)
+        assert np.array_equal(states[idx].positions, ps.snapshot.positions)
+        assert np.array_equal(
+            states[idx].next_positions, ps.snapshot.next_positions
+        )
+        planets = [ps.snapshot.ids[p] for p in ps.planet_names]
+        assert np.allclose(
+            real_ahead[idx, planets], ps.snapshot.real_positions[planets]
+        )
+
+    # and back again
+    assert np.array_equal(
+        ps.positions_at([7])[0], ahead[1]
+    )
@@ -0,0 +1,235 @@
+import numpy as np
+
+from space.subuniverse import SubUniverse
+from space.universe_store import UniverseStore
+from xmath.generate_universe import generate_universe_parametric_values
+
+
+def _small_universe() -> SubUniverse:
+    return SubUniverse(3, 5, 4, 5, 10., 3., 2)
+
+
+def test_store_matches_nested_universe():
+    su = _small_universe()
+    store: UniverseStore = su.store
+
+    assert store.galaxy_keys == list(su.universe_positions.keys())
+
+    for gid, (gkey, galaxy) in enumerate(su.universe_positions.items()):
+        assert np.array_equal(
+            store.galaxy_motion_path(gid), galaxy['motion_path']
+        )
+        systems = store.galaxy_systems(gid)
+        assert store.system_keys[systems] == list(
+            galaxy['star_systems'].keys()
+        )
+
+        for sid in range(systems.start, systems.stop):
+            system = galaxy['star_systems'][store.system_keys[sid]]
+            assert store.system_is_centre[sid] == system['is_centre']
+            assert tuple(store.system_origins[sid]) == tuple(
+                system['origin'][0]
+            )
+
+            planets = store.system_planets(sid)
+            for pid in range(planets.start, planets.stop):
+                planet = system['planets'][store.planet_keys[pid]]
+                assert store.planet_names[pid] == planet['name']
+                assert np.array_equal(
+                    store.planet_motion_path(pid), planet['motion_path']
+                )
+
+    assert store.coords.shape == (store.path_offsets[-1], 2)
+    assert not store.system_origins.flags.writeable
+
+
+def test_nested_paths_share_store_buffer():
+    su = _small_universe()
+
+    def shared():
+        coords = su.store.coords
+        for galaxy in su.universe_positions.values():
+            assert np.shares_memory(galaxy['motion_path'], coords)
+            for system in galaxy['star_systems'].values():
+                for planet, path in zip(
+                        system['planets'].values(),
+                        system['planet_orbit_paths']
+                ):
+                    assert path is planet['motion_path']
+                    assert np.shares_memory(path, coords)
+                    assert np.shares_memory(planet['position'][0], coords)
+                    assert np.array_equal(
+                        planet['position'][0],
+                        path[planet['position_index']]
+                    )
+
+    shared()
+    su.refresh(galaxy="Galaxy 1")
+    shared()
+
+    # the nested paths stay editable in place
+    galaxy = su.universe_positions["Galaxy 1"]
+    system = next(iter(galaxy['star_systems'].values()))
+    planet = next(iter(system['planets'].values()))
+    galaxy['motion_path'][0] += 1.
+    planet['motion_path'][:] *= 2.
+    expected = galaxy['motion_path'][0].copy(), planet['motion_path'].copy()
+    su.refresh(galaxy="Galaxy 1")
+    su.refresh()
+    assert np.array_equal(su.galaxy_paths["Galaxy 1"][0], expected[0])
+    assert np.array_equal(su.planet_paths[planet['name']], expected[1])
+    shared()
+
+
+def test_subuniverse_properties():
+    su = _small_universe()
+
+    assert len(su.planets) == su.store.num_planets
+    assert len(su.star_systems) == su.store.num_systems
+    assert len(su.stars) + len(su.black_holes) == su.store.num_systems
+    assert su.star_names == list(su.stars.keys())
+
+    for name, planet in su.planets.items():
+        assert su.planet_positions[name] == tuple(planet['position'][0])
+        assert np.array_equal(su.planet_paths[name], planet['motion_path'])
+
+
+def test_cached_views_invalidate_per_galaxy():
+    su = _small_universe()
+
+    planets = su.planets
+    assert su.planets is planets
+    assert su.planet_paths is su.planet_paths
+
+    # untouched galaxies keep their per galaxy views
+    galaxy_view = su._galaxy_view("Galaxy 1")
+
+    galaxy = su.universe_positions["Galaxy 0"]
+    system = next(iter(galaxy['star_systems'].values()))
+    planet = next(iter(system['planets'].values()))
+    planet['position_index'] = (planet['position_index'] + 1) % 1000
+    moved = tuple(planet['motion_path'][planet['position_index']])
+
+    # in place changes are picked up through the refresh hook
+    assert su.planet_positions[planet['name']] != moved
+    su.refresh(system=system['name'])
+    assert su.planet_positions[planet['name']] == moved
+    assert su._galaxy_view("Galaxy 1") is galaxy_view
+
+    # top level mutations invalidate automatically
+    del su.universe_positions["Galaxy 0"]
+    assert planet['name'] not in su.planets
+    assert "Galaxy 0" not in su.galaxy_names
+    assert su.store.num_planets == len(su.planets)
+
+    su.universe_positions["Galaxy 0"] = galaxy
+    assert su.planet_positions[planet['name']] == moved
+    assert su._galaxy_view("Galaxy 1") is galaxy_view
+
+
+def test_galaxy_changes_patch_in_place():
+    su = _small_universe()
+    store: UniverseStore = su.store
+    coords = store.coords
+    planets, positions = su.planets, su.planet_positions
+
+    # same layout: rows are overwritten, views are patched not rebuilt
+    galaxy = su.universe_positions["Galaxy 1"]
+    galaxy['motion_path'] = galaxy['motion_path'] + 1.
+    system = next(iter(galaxy['star_systems'].values()))
+    planet = next(iter(system['planets'].values()))
+    planet['position_index'] = (planet['position_index'] + 5) % 1000
+    su.refresh(galaxy="Galaxy 1")
+
+    assert su.store.coords is coords
+    assert su.planets is planets and su.planet_positions is positions
+    assert np.shares_memory(galaxy['motion_path'], coords)
+    assert np.array_equal(
+        su.galaxy_paths["Galaxy 1"], galaxy['motion_path']
+    )
+    assert positions[planet['name']] == tuple(
+        planet['motion_path'][planet['position_index']]
+    )
+
+    # a planet less re-packs the buffer
+    name = planet['name']
+    del system['planets'][next(iter(system['planets']))]
+    del system['planet_orbit_paths'][0]
+    su.refresh(galaxy="Galaxy 1")
+    assert su.store.coords is not coords
+    assert name not in su.planets and name not in su.planet_positions
+    assert su.store.num_planets == len(su.planets)
+
+    # |= goes through the change hook as well
+    galaxy = su.universe_positions.pop("Galaxy 0")
+    assert "Galaxy 0" not in su.galaxies
+    su.universe_positions |= {"Galaxy 0": galaxy}
+    assert su.galaxy_names[-1] == "Galaxy 0"
+    assert su.galaxies["Galaxy 0"] is galaxy
+    assert list(su.planets) == su.store.planet_names
+
+
+def test_advance_steps_along_motion_paths():
+    su = _small_universe()
+    store: UniverseStore = su.store
+    start = store.planet_path_index.copy()
+    galaxy_start = store.galaxy_path_index.copy()
+
+    positions = su.advance(3)
+    assert su.epoch == 4
+    assert positions.shape == (store.num_planets, 2)
+
+    for pid, name in enumerate(su.planet_names):
+        path = su.planet_paths[name]
+        expected = path[(start[pid] + 3) % len(path)]
+        assert np.array_equal(positions[pid], expected)
+        assert su.planet_positions[name] == tuple(expected)
+
+    for gid, gkey in enumerate(su.galaxy_names):
+        path = su.galaxy_paths[gkey]
+        assert su.galaxy_positions[gkey] == tuple(
+            path[(galaxy_start[gid] + 3) % len(path)]
+        )
+
+    # wraps around, and survives re-reading the nested records
+    su.advance(1000)
+    expected = (start + 1003) % store.planet_path_lengths
+    su.refresh("Galaxy 1")
+    assert np.array_equal(store.planet_path_index, expected)
+    su.refresh()
+    assert np.array_equal(su.store.planet_path_index, expected)
+    assert np.array_equal(
+        su.store.galaxy_path_index,
+        (galaxy_start + 1003) % su.store.galaxy_path_lengths
+    )
+
+    for pid, name in enumerate(su.planet_names):
+        planet = su.planets[name]
+        assert planet['position_index'] == expected[pid]
+        assert tuple(planet['position'][0]) == su.planet_positions[name]
+
+    # a record edited after an advance wins over the stepped index
+    su.advance(2)
+    planet = su.planets[su.planet_names[0]]
+    planet['position_index'] = 7
+    su.refresh(galaxy=su.store.galaxy_keys[0])
+    assert su.store.planet_path_index[0] == 7
+    stepped = (expected + 2) % su.store.planet_path_lengths
+    assert np.array_equal(su.store.planet_path_index[1:], stepped[1:])
+
+
+def test_parallel_generation():
+    universe = generate_universe_parametric_values(
+        3, 4, 4, 5, 10., 3., 2, lazy_orbits=True, workers=2
+    )
+
+    assert list(universe.keys()) == [
+        "Galaxy 0", "Galaxy 1", "Galaxy 2",
+        "Black Hole BH0", "Black Hole BH1"
+    ]
+    store = UniverseStore.from_universe(universe)
+    assert store.num_planets == sum(
+        len(system['planets'])
+        for galaxy in universe.values()
+        for system in galaxy['star_systems'].values()
+    )
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from xmath.generate_universe import generate_universe_parametric_values
+from xmath.xrandom import random_int_generator
+from xmath.xrng import RandomStreams
+
+
+def test_streams_reproducible_and_independent():
+    a = RandomStreams(42, "UNIVERSE")
+    b = RandomStreams(42, "UNIVERSE")
+
+    # drawing from another stream first does not shift this one
+    b.integers(0, 100, "OTHER", size=1000)
+    assert np.array_equal(
+        a.integers(0, 100, "Galaxy 3/RND_PLANETS", size=50),
+        b.integers(0, 100, "Galaxy 3/RND_PLANETS", size=50)
+    )
+    assert not np.array_equal(
+        RandomStreams(42).integers(0, 10 ** 9, "A", size=4),
+        RandomStreams(43).integers(0, 10 ** 9, "A", size=4)
+    )
+
+
+def test_child_streams_match_full_path():
+    root = RandomStreams(7)
+    child = root.child("UNIVERSE").child("Galaxy 3")
+
+    assert child.path == "UNIVERSE/Galaxy 3"
+    assert np.array_equal(
+        child.integers(0, 10 ** 6, "RND_PLANETS", size=10),
+        RandomStreams(7).integers(
+            0, 10 ** 6, "UNIVERSE/Galaxy 3/RND_PLANETS", size=10
+        )
+    )
+
+
+def test_integers_inclusive_and_scalar():
+    rng = RandomStreams(1)
+    draws = rng.integers(0, 3, "X", size=2000)
+
+    assert draws.min() == 0 and draws.max() == 3
+    assert isinstance(rng.integers(0, 3, "X"), int)
+
+    ints = rng.int_generator(5, 6, "Y", chunk_size=3)
+    assert {next(ints) for _ in range(100)} == {5, 6}
+
+
+def _universe_arrays(universe):
+    return [
+        (name, np.asarray(planet["motion_path"]), planet["position_index"])
+        for galaxy in universe.values()
+        for system in galaxy["star_systems"].values()
+        for name, planet in system["planets"].items()
+    ]
+
+
+def test_seeded_universe_independent_of_workers():
+    kwargs = dict(num_galaxies=3, num_systems=4, num_planet_orbits=4,
+                  num_black_holes=2, lazy_orbits=True, seed=11)
+
+    sequential = generate_universe_parametric_values(**kwargs)
+    parallel = generate_universe_parametric_values(workers=2, **kwargs)
+
+    assert list(sequential) == list(parallel)
+    for (n1, p1, i1), (n2, p2, i2) in zip(
+            _universe_arrays(sequential), _universe_arrays(parallel)
+    ):
+        assert n1 == n2 and i1 == i2
+        assert np.array_equal(p1, p2)
+
+
+def test_unique_integers_distinct_and_bounded():
+    rng = RandomStreams(5)
+
+    for k in (0, 1, 10, 600, 1001):
+        values = rng.unique_integers(-500, 500, k, "U")
+        assert len(values) == k == len(set(values.tolist()))
+        assert k == 0 or (values.min() >= -500 and values.max() <= 500)
+
+    with pytest.raises(ValueError):
+        rng.unique_integers(0, 9, 11, "U")
+
+
+def test_unique_random_int_generator_stops():
+    assert sorted(random_int_generator(3, 9, unique=True)) == list(range(3, 10))
+
+
+def test_unique_int_generator_is_lazy():
+    rng = RandomStreams(3)
+    values = rng.unique_int_generator(-20, 20, "G", chunk_size=7)
+    assert sorted(values) == list(range(-20, 21))
+
+    # a huge range only costs what is drawn
+    ints = random_int_generator(0, 10 ** 12, unique=True)
+    draws = [next(ints) for _ in range(1000)]
+    assert len(set(draws)) == 1000
+    assert 0 <= min(draws) and max(draws) <= 10 ** 12
+
+    assert list(RandomStreams(9).unique_int_generator(0, 99, "G")) == list(
+        RandomStreams(9).unique_int_generator(0, 99, "G")
+    )
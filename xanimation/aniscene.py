@@ -1,10 +1,11 @@
 import sys
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import threading
 from colorama import Fore, Style
 
+from xanimation.prender import CollectionRenderer
 from xanimation.pscene import PhysicalScene
 from xanimation.xauxi import add_all_patches, calc_next_frame_coords
 
@@ -26,12 +27,28 @@ class AnimatedScene:
             xlim: Tuple[int, int] = (-200, 200),
             ylim: Tuple[int, int] = (-100, 100),
             show_grid: bool = True,
-            center_grid: bool = True
+            center_grid: bool = True,
+            renderer: str = "patches",
+            cull: bool = True
     ) -> None:
+        if renderer not in ("patches", "collection"):
+            raise ValueError(
+                f"renderer must be 'patches' or 'collection', got {renderer}"
+            )
+
         self.scene: PhysicalScene = scene
         self.fig, self.ax = plt.subplots()
 
         self.center_grid: bool = center_grid
+        # patches: one Polygon artist per object, drawn in full each frame
+        # collection: one blitted PolyCollection fed from the scene buffer.
+        # The blit only saves the redraw of the axes, ticks and grid while
+        # the camera is still: with center_grid and a moving main object
+        # every frame is a full canvas draw, as fast as not blitting
+        self.renderer: str = renderer
+        self.collection: Optional[CollectionRenderer] = None
+        # collection only: draw just the objects whose box is in view
+        self.cull: bool = cull
 
         self.ax.set_xlim(*xlim)
         self.ax.set_ylim(*ylim)
@@ -40,8 +57,11 @@ class AnimatedScene:
 
         self.ax.grid(show_grid)
 
-        for obj in self.scene.objects:
-            add_all_patches(obj, self.ax)
+        if renderer == "collection":
+            self.collection = CollectionRenderer(self.scene.buffer, self.ax)
+        else:
+            for obj in self.scene.objects:
+                add_all_patches(obj, self.ax)
 
         self.set_grid_to_center()
 
@@ -122,6 +142,9 @@ class AnimatedScene:
         Called by FuncAnimation each frame. Updates scene objects,
         then re-centers the axis on the main object.
         """
+        if self.renderer == "collection":
+            return self._update_collection()
+
         # Update positions
         patches = self.scene.update(dt=0.1)
 
@@ -134,6 +157,33 @@ class AnimatedScene:
 
         return patches
 
+    def _update_collection(self):
+        self.scene.step(dt=0.1)
+        if self.collection.buffer is not self.scene.buffer:
+            # objects were added, the scene rebuilt its buffer
+            self.collection.remove()
+            self.collection = CollectionRenderer(self.scene.buffer, self.ax)
+
+        view = (tuple(self.xlim), tuple(self.ylim))
+        if self.center_grid:
+            self.set_grid_to_center()
+
+        else:
+            self.set_grid_next_frame()
+
+        rows = None
+        if self.cull:
+            rows = self.scene.buffer.visible_rows(self.xlim, self.ylim)
+        artists = self.collection.update(rows)
+
+        # the blitted background (axes, ticks, grid) is only valid for one
+        # view, redraw it without the animated collection when it moves -
+        # a full canvas draw, so a moving camera gets nothing from the blit
+        if view != (tuple(self.xlim), tuple(self.ylim)):
+            self.fig.canvas.draw()
+
+        return artists
+
     def set_grid_next_frame(self):
         xlim, ylim = list(self.xlim), list(self.ylim)
         x_vals = self.scene.main_object.shape_coords[:, 0]
@@ -158,7 +208,7 @@ class AnimatedScene:
             self._update_animation,
             frames=None,  # None => infinite loop
             interval=15,  # ms between updates
-            blit=False
+            blit=self.renderer == "collection"
         )
 
         plt.gca().set_aspect('equal')
@@ -0,0 +1,242 @@
+from typing import List, Any, Optional, Tuple, Dict
+import numpy as np
+
+from xanimation.xauxi import flatten_tree
+
+# per-object fields a bound PhysicalObject reads and writes through
+SCALAR_FIELDS = (
+    "rotation_speed_deg",
+    "one_time_remaining_deg",
+    "one_time_rotation_speed_deg"
+)
+# fields the update_all_* setters give a whole attachment tree
+MOTION_FIELDS = ("velocity",) + SCALAR_FIELDS
+
+
+class PhysicsBuffer(object):
+    """
+    Struct-of-arrays state of a PhysicalScene: every vertex of every
+    object (attachments included, flattened in pre-order) in one (V, 2)
+    buffer, sliced per object by offsets, next to (K, ...) velocity,
+    rotation and pivot arrays. step() advances all of them at once.
+
+    Bound PhysicalObject's become handles: their shape_coords is a view
+    of their slice of vertices and their setters write into the arrays.
+
+    The attachment trees are flattened to a parent index array. Setting a
+    motion field on a tree (set_tree) writes its root row only, stamped
+    with a clock; resolve() hands the newest stamped values down, one
+    depth level at a time, before they are next read or stepped.
+
+    bounds holds every object's (x_min, y_min, x_max, y_max) box as of the
+    last step, visible_rows() checks them against a viewport in one
+    vectorized O(K) pass (the boxes move every step, so a spatial index of
+    them would be rebuilt every frame for nothing).
+    """
+
+    def __init__(self, objects: List[Any]):
+        flat, parent = flatten_tree(objects)
+        self.objects: List[Any] = flat
+        self.parent: np.ndarray = np.array(parent, dtype=np.int64)
+        self.depth: np.ndarray = np.zeros(len(self.objects), dtype=np.int64)
+        for row, parent_row in enumerate(parent):
+            if parent_row >= 0:
+                self.depth[row] = self.depth[parent_row] + 1
+        # rows of every depth below the roots, parents come a level earlier
+        self.levels: List[np.ndarray] = [
+            np.flatnonzero(self.depth == d)
+            for d in range(1, int(self.depth.max(initial=0)) + 1)
+        ]
+        coords: List[np.ndarray] = [
+            np.asarray(obj.shape_coords, dtype=np.float64).reshape(-1, 2)
+            for obj in self.objects
+        ]
+        self.counts: np.ndarray = np.array(
+            [len(c) for c in coords], dtype=np.int64
+        )
+        self.offsets: np.ndarray = np.concatenate(
+            [[0], np.cumsum(self.counts)]
+        )
+        self.vertices: np.ndarray = np.concatenate(coords) if coords else \
+            np.zeros((0, 2))
+        # owning object of every vertex
+        self.vertex_rows: np.ndarray = np.repeat(
+            np.arange(len(self.objects)), self.counts
+        )
+
+        self.velocity: np.ndarray = np.array(
+            [obj._velocity for obj in self.objects], dtype=np.float64
+        ).reshape(-1, 2)
+        for field in SCALAR_FIELDS:
+            setattr(self, field, np.array(
+                [getattr(obj, "_" + field) for obj in self.objects],
+                dtype=np.float64
+            ))
+        self.is_main: np.ndarray = np.array(
+            [obj.is_main for obj in self.objects], dtype=bool
+        )
+        # None (no pivot yet) is stored as nan
+        self.main_center: np.ndarray = np.array([
+            (np.nan, np.nan) if obj.main_center is None else obj.main_center
+            for obj in self.objects
+        ], dtype=np.float64).reshape(-1, 2)
+
+        # object whose center every object rotates about: itself when
+        # main, else its nearest main ancestor (-1: keep its main_center)
+        self.pivot_owner: np.ndarray = np.full(len(self.objects), -1)
+        for row in range(len(self.objects)):
+            if self.is_main[row]:
+                self.pivot_owner[row] = row
+            elif self.parent[row] >= 0:
+                self.pivot_owner[row] = self.pivot_owner[self.parent[row]]
+
+        # tracked centers (means of the distinct vertices)
+        self.center: np.ndarray = np.array(
+            [obj.center for obj in self.objects], dtype=np.float64
+        ).reshape(-1, 2)
+
+        self._clock: int = 0
+        self._stamps: Dict[str, np.ndarray] = {
+            field: np.zeros(len(self.objects), dtype=np.int64)
+            for field in MOTION_FIELDS
+        }
+        self._unresolved: bool = False
+
+        self.bounds: np.ndarray = np.zeros((len(self.objects), 4))
+        self.update_bounds()
+
+        for row, obj in enumerate(self.objects):
+            obj._bind(self, row)
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    def object_vertices(self, row: int) -> np.ndarray:
+        return self.vertices[self.offsets[row]:self.offsets[row + 1]]
+
+    def get(self, field: str, row: int) -> Any:
+        if field in MOTION_FIELDS:
+            self.resolve()
+        if field == "velocity":
+            return self.velocity[row]
+        if field == "main_center":
+            center: np.ndarray = self.main_center[row]
+            return None if np.isnan(center[0]) else center.copy()
+        if field == "center":
+            return self.center[row].copy()
+
+        return float(getattr(self, field)[row])
+
+    def set(self, field: str, row: int, value: Any) -> None:
+        # this row only, attachments keep their values
+        if field in MOTION_FIELDS:
+            self.resolve()
+        if field == "main_center" and value is None:
+            value = (np.nan, np.nan)
+
+        getattr(self, field)[row] = value
+
+    def set_tree(self, field: str, row: int, value: Any) -> None:
+        # this row and, once resolved, every attachment under it
+        getattr(self, field)[row] = value
+        self._clock += 1
+        self._stamps[field][row] = self._clock
+        self._unresolved = True
+
+    def resolve(self) -> None:
+        if not self._unresolved:
+            return
+
+        for rows in self.levels:
+            parents: np.ndarray = self.parent[rows]
+            for field in MOTION_FIELDS:
+                stamps: np.ndarray = self._stamps[field]
+                newer: np.ndarray = stamps[parents] > stamps[rows]
+                if newer.any():
+                    values: np.ndarray = getattr(self, field)
+                    values[rows[newer]] = values[parents[newer]]
+                    stamps[rows[newer]] = stamps[parents[newer]]
+
+        self._unresolved = False
+
+    def step(self, dt: float = 0.1) -> None:
+        self.resolve()
+        shift: np.ndarray = self.velocity * dt
+
+        # one time rotations, clamped to what is left of them
+        remaining: np.ndarray = self.one_time_remaining_deg
+        one_time: np.ndarray = self.one_time_rotation_speed_deg * dt
+        one_time = np.where(
+            np.abs(one_time) > np.abs(remaining), np.abs(remaining), one_time
+        ) * np.sign(remaining)
+        one_time = np.where(np.abs(remaining) > 1e-8, one_time, 0.)
+        self.one_time_remaining_deg = remaining - one_time
+        rotation: np.ndarray = self.rotation_speed_deg * dt + one_time
+
+        # rotating about a center leaves it in place, so the pivots are
+        # the centers after translation
+        self.center += shift
+        owned: np.ndarray = self.pivot_owner >= 0
+        self.main_center[owned] = self.center[self.pivot_owner[owned]]
+
+        # every object's step as one transform x -> R x + b: translate by
+        # shift, then rotate about the pivot p, b = R (shift - p) + p
+        rotating: np.ndarray = np.abs(rotation) > 1e-8
+        theta: np.ndarray = np.radians(np.where(rotating, rotation, 0.))
+        cos, sin = np.cos(theta), np.sin(theta)
+        rel: np.ndarray = shift - self.main_center
+        b: np.ndarray = np.where(rotating[:, None], np.column_stack(
+            (cos * rel[:, 0] - sin * rel[:, 1],
+             sin * rel[:, 0] + cos * rel[:, 1])
+        ) + self.main_center, shift)
+
+        moving: np.ndarray = rotating | np.any(shift != 0, axis=1)
+        if moving.all():
+            idx = slice(None)
+            rows: np.ndarray = self.vertex_rows
+        else:
+            idx = np.flatnonzero(moving[self.vertex_rows])
+            rows = self.vertex_rows[idx]
+        x, y = self.vertices[idx].T
+        c, s = cos[rows], sin[rows]
+        self.vertices[idx] = np.column_stack(
+            (c * x - s * y + b[rows, 0], s * x + c * y + b[rows, 1])
+        )
+
+        # attachments' centers swing about their pivots too
+        swing: np.ndarray = np.flatnonzero(rotating & ~self.is_main)
+        pivot: np.ndarray = self.main_center[swing]
+        x, y = (self.center[swing] - pivot).T
+        c, s = cos[swing], sin[swing]
+        self.center[swing] = np.column_stack(
+            (c * x - s * y, s * x + c * y)
+        ) + pivot
+
+        self.update_bounds()
+
+    def update_bounds(self) -> None:
+        if len(self.objects):
+            starts: np.ndarray = self.offsets[:-1]
+            for col, reduce in enumerate((np.minimum, np.maximum)):
+                self.bounds[:, 2 * col:2 * col + 2] = reduce.reduceat(
+                    self.vertices, starts, axis=0
+                )
+
+    def visible_rows(
+            self,
+            xlim: Tuple[float, float],
+            ylim: Tuple[float, float]
+    ) -> np.ndarray:
+        # sorted rows of the objects whose box overlaps the view
+        bounds: np.ndarray = self.bounds
+        return np.flatnonzero(
+            (bounds[:, 0] <= xlim[1]) & (bounds[:, 2] >= xlim[0])
+            & (bounds[:, 1] <= ylim[1]) & (bounds[:, 3] >= ylim[0])
+        )
+
+    def patches(self) -> List[Any]:
+        return [obj.patch for obj in self.objects]
+
+    def sync_patches(self, rows: Optional[np.ndarray] = None) -> None:
+        for row in (range(len(self.objects)) if rows is None else rows):
+            self.objects[row].patch.set_xy(self.object_vertices(row))
@@ -1,9 +1,18 @@
-from typing import Tuple, List, Optional
+from typing import Tuple, List, Optional, Dict, Any
 import numpy as np
 from matplotlib.patches import Polygon
 
+from xmath.spatial import unique_coordinates
+
 
 class PhysicalObject:
+    """
+    Polygon moved by a velocity and rotated about its center (or, for
+    attachments, the center of the main object). Added to a PhysicalScene
+    its state moves into the scene's PhysicsBuffer and the object becomes
+    a handle to its row there.
+    """
+
     def __init__(
             self,
             shape_coords: np.array,
@@ -17,18 +26,23 @@ class PhysicalObject:
             edge_color: str = "black",
             plot_symbol: str = "r-"
     ) -> None:
+        # set once a PhysicsBuffer holds this object's state
+        self._buffer = None
+        self._row: int = -1
+        self._state: Dict[str, Any] = {}
+
         self.attachments: Optional[List[PhysicalObject]] = attachments
         self.is_main: bool = is_main
 
-        self.shape_coords: np.array = shape_coords
-        self.main_center: Optional[Tuple[float, float]] = None
+        self.shape_coords = shape_coords
+        self.main_center = None
 
         self.update_all_main_centers()
 
-        self._velocity: List[float] = list(velocity)
-        self._rotation_speed_deg: float = _rotation_speed_deg
-        self._one_time_remaining_deg: float = _one_time_remaining_deg
-        self._one_time_rotation_speed_deg: float = _one_time_rotation_speed_deg
+        self._velocity = list(velocity)
+        self._rotation_speed_deg = _rotation_speed_deg
+        self._one_time_remaining_deg = _one_time_remaining_deg
+        self._one_time_rotation_speed_deg = _one_time_rotation_speed_deg
 
         self.patch: Polygon = Polygon(
             self.shape_coords,
@@ -38,6 +52,82 @@ class PhysicalObject:
             alpha=0.6
         )
 
+    def _bind(self, buffer: Any, row: int) -> None:
+        self._buffer = buffer
+        self._row = row
+        self._state.clear()
+
+    def _get_state(self, field: str) -> Any:
+        if self._buffer is None:
+            return self._state[field]
+        return self._buffer.get(field, self._row)
+
+    def _set_state(self, field: str, value: Any) -> None:
+        if self._buffer is None:
+            self._state[field] = value
+        else:
+            self._buffer.set(field, self._row, value)
+
+    @property
+    def shape_coords(self) -> np.array:
+        # a view of the scene's vertex buffer once bound
+        if self._buffer is None:
+            return self._state["shape_coords"]
+        return self._buffer.object_vertices(self._row)
+
+    @shape_coords.setter
+    def shape_coords(self, coords: np.array) -> None:
+        if self._buffer is None:
+            self._state["shape_coords"] = coords
+        else:
+            self._buffer.object_vertices(self._row)[:] = coords
+
+        # new vertices, the one place the center is computed from them
+        self._set_state("center", np.mean(
+            unique_coordinates(self.shape_coords, keep_order=False),
+            axis=0
+        ))
+
+    @property
+    def main_center(self) -> Optional[Tuple[float, float]]:
+        return self._get_state("main_center")
+
+    @main_center.setter
+    def main_center(self, ncenter: Optional[Tuple[float, float]]) -> None:
+        self._set_state("main_center", ncenter)
+
+    @property
+    def _velocity(self) -> List[float]:
+        return self._get_state("velocity")
+
+    @_velocity.setter
+    def _velocity(self, nvelocity: List[float]) -> None:
+        self._set_state("velocity", nvelocity)
+
+    @property
+    def _rotation_speed_deg(self) -> float:
+        return self._get_state("rotation_speed_deg")
+
+    @_rotation_speed_deg.setter
+    def _rotation_speed_deg(self, in_rot: float) -> None:
+        self._set_state("rotation_speed_deg", in_rot)
+
+    @property
+    def _one_time_remaining_deg(self) -> float:
+        return self._get_state("one_time_remaining_deg")
+
+    @_one_time_remaining_deg.setter
+    def _one_time_remaining_deg(self, in_rot: float) -> None:
+        self._set_state("one_time_remaining_deg", in_rot)
+
+    @property
+    def _one_time_rotation_speed_deg(self) -> float:
+        return self._get_state("one_time_rotation_speed_deg")
+
+    @_one_time_rotation_speed_deg.setter
+    def _one_time_rotation_speed_deg(self, in_rot: float) -> None:
+        self._set_state("one_time_rotation_speed_deg", in_rot)
+
     def update_all_main_centers(
             self,
             ncenter: Optional[Tuple[float, float]] = None
@@ -91,6 +181,13 @@ class PhysicalObject:
             self,
             nvelocity: List[float]
     ) -> None:
+        if self._buffer is not None:
+            # one row, the buffer hands it down to the attachments
+            self._buffer.set_tree(
+                "velocity", self._row, nvelocity
+            )
+            return
+
         self._velocity = nvelocity
 
         if self.attachments is not None:
@@ -101,6 +198,12 @@ class PhysicalObject:
             self,
             nrotation_speed_deg: float
     ) -> None:
+        if self._buffer is not None:
+            self._buffer.set_tree(
+                "rotation_speed_deg", self._row, nrotation_speed_deg
+            )
+            return
+
         self._rotation_speed_deg = nrotation_speed_deg
 
         if self.attachments is not None:
@@ -113,6 +216,12 @@ class PhysicalObject:
             self,
             n_one_time_remaining_deg: float
     ) -> None:
+        if self._buffer is not None:
+            self._buffer.set_tree(
+                "one_time_remaining_deg", self._row, n_one_time_remaining_deg
+            )
+            return
+
         self._one_time_remaining_deg = n_one_time_remaining_deg
 
         if self.attachments is not None:
@@ -125,6 +234,14 @@ class PhysicalObject:
             self,
             n_one_time_rot_spd_deg: float
     ) -> None:
+        if self._buffer is not None:
+            self._buffer.set_tree(
+                "one_time_rotation_speed_deg",
+                self._row,
+                n_one_time_rot_spd_deg
+            )
+            return
+
         self._one_time_rotation_speed_deg = n_one_time_rot_spd_deg
 
         if self.attachments is not None:
@@ -182,17 +299,21 @@ class PhysicalObject:
             rotated = (R @ shifted.T).T
 
             # Shift back
-            self.shape_coords = rotated + center
+            self.shape_coords[:] = rotated + center
+
+            # the own center is a fixed point, attachments swing about the
+            # main center
+            if not self.is_main:
+                self._set_state("center", R @ (self.center - center) + center)
 
     def update_velocity(self, dt):
         dx = self._velocity[0] * dt
         dy = self._velocity[1] * dt
         self.shape_coords[:, 0] += dx
         self.shape_coords[:, 1] += dy
+        self._set_state("center", self.center + (dx, dy))
 
     @property
     def center(self) -> Tuple[float, float]:
-        return np.mean(
-            np.unique(self.shape_coords, axis=0),
-            axis=0
-        )
+        # mean of the distinct vertices, tracked through the motion
+        return np.array(self._get_state("center"))
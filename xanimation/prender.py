@@ -0,0 +1,95 @@
+from typing import List, Any, Optional
+import numpy as np
+from matplotlib.collections import PolyCollection
+
+from xanimation.pbuffer import PhysicsBuffer
+
+
+class CollectionRenderer(object):
+    """
+    Draws every object of a PhysicsBuffer through one PolyCollection.
+
+    The polygons (closed like Polygon does, by repeating the first vertex
+    where the last one differs) are views into one padded vertex array,
+    so a frame is a single np.take from the buffer's vertices into it,
+    with no per-object set_xy. update() can be limited to some rows (the
+    visible objects), the others are left out of the collection.
+    """
+
+    def __init__(self, buffer: PhysicsBuffer, ax: Any):
+        self.buffer: PhysicsBuffer = buffer
+        self.ax: Any = ax
+
+        first: np.ndarray = buffer.vertices[buffer.offsets[:-1]]
+        last: np.ndarray = buffer.vertices[buffer.offsets[1:] - 1]
+        open_: np.ndarray = np.any(first != last, axis=1)
+
+        self._counts: np.ndarray = buffer.counts + open_
+        self._offsets: np.ndarray = np.concatenate(
+            [[0], np.cumsum(self._counts)]
+        )
+        local: np.ndarray = np.arange(self._offsets[-1]) - np.repeat(
+            self._offsets[:-1], self._counts
+        )
+        local[self._offsets[1:][open_] - 1] = 0
+        # buffer vertex behind every padded vertex
+        self._gather: np.ndarray = np.repeat(
+            buffer.offsets[:-1], self._counts
+        ) + local
+
+        patches = buffer.patches()
+        self._facecolors: np.ndarray = np.array(
+            [patch.get_facecolor() for patch in patches]
+        ).reshape(-1, 4)
+        self._edgecolors: np.ndarray = np.array(
+            [patch.get_edgecolor() for patch in patches]
+        ).reshape(-1, 4)
+        self._linewidths: np.ndarray = np.array(
+            [patch.get_linewidth() for patch in patches]
+        )
+
+        self.collection: PolyCollection = PolyCollection([], closed=False)
+        ax.add_collection(self.collection, autolim=False)
+        # rows (objects) currently in the collection
+        self.rows: Optional[np.ndarray] = None
+        self._show(np.arange(len(buffer)))
+
+    def _show(self, rows: np.ndarray) -> None:
+        # rebuild the collection's polygons for these rows
+        counts: np.ndarray = self._counts[rows]
+        offsets: np.ndarray = np.concatenate([[0], np.cumsum(counts)])
+        self._rows_gather: np.ndarray = self._gather[
+            np.arange(offsets[-1])
+            + np.repeat(self._offsets[rows] - offsets[:-1], counts)
+        ]
+        self._vertices: np.ndarray = self.buffer.vertices[self._rows_gather]
+
+        self.collection.set_verts(
+            [self._vertices[offsets[i]:offsets[i + 1]]
+             for i in range(len(rows))],
+            closed=False
+        )
+        self.collection.set_facecolor(self._facecolors[rows])
+        self.collection.set_edgecolor(self._edgecolors[rows])
+        self.collection.set_linewidth(self._linewidths[rows])
+        self.rows = rows
+
+    def update(self, rows: Optional[np.ndarray] = None) -> List[Any]:
+        # push the vertices of rows (all objects by default) to the
+        # collection, the polygons are only rebuilt when the rows change
+        if rows is None:
+            rows = np.arange(len(self.buffer))
+
+        if np.array_equal(rows, self.rows):
+            np.take(
+                self.buffer.vertices, self._rows_gather, axis=0,
+                out=self._vertices
+            )
+        else:
+            self._show(rows)
+
+        self.collection.stale = True
+        return [self.collection]
+
+    def remove(self) -> None:
+        self.collection.remove()
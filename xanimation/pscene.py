@@ -1,24 +1,52 @@
 from typing import List, Tuple, Optional
 
+from xanimation.pbuffer import PhysicsBuffer
 from xanimation.pobject import PhysicalObject
 from xanimation.xauxi import get_all_patches, \
     update_all_positions
 
 
 class PhysicalScene:
-    def __init__(self):
+    def __init__(self, batched: bool = True):
         self.objects: List[PhysicalObject] = []
         self.main_object: Optional[PhysicalObject] = None
+        # batched: advance every object at once through a PhysicsBuffer,
+        # else object by object
+        self.batched: bool = batched
+        self._buffer: Optional[PhysicsBuffer] = None
 
     def add_object(self, moving_obj: PhysicalObject, main: bool = False):
         self.objects.append(moving_obj)
         if main:
             self.main_object = moving_obj
 
-    def update(self, dt: float = 0.1):
+        # rebuilt on the next update
+        self._buffer = None
+
+    @property
+    def buffer(self) -> PhysicsBuffer:
+        if self._buffer is None:
+            self._buffer = PhysicsBuffer(self.objects)
+
+        return self._buffer
+
+    def step(self, dt: float = 0.1) -> None:
+        # advance the objects, batched scenes leave their patches as is
+        if self.batched:
+            self.buffer.step(dt)
+            return
+
         for obj in self.objects:
             update_all_positions(obj, dt)
 
+    def update(self, dt: float = 0.1):
+        if self.batched:
+            self.buffer.step(dt)
+            self.buffer.sync_patches()
+            return tuple(self.buffer.patches())
+
+        self.step(dt)
+
         patches = []
         for obj in self.objects:
             patches.extend(get_all_patches(obj))
@@ -1,14 +1,17 @@
-import random
+from typing import Optional
+
 from xanimation.aniscene import AnimatedScene
 from xanimation.pobject import PhysicalObject
 from xanimation.pscene import PhysicalScene
 from xmath.gobj import generate_square_points, generate_circle_points, \
     generate_isosceles_triangle_points, \
     generate_spiked_circle_points, generate_trapezium_points
-from xmath.xrandom import random_int_generator
+from xmath.xrng import RandomStreams
+
 
+def build_sector_scene(seed: Optional[int] = None) -> PhysicalScene:
+    rng = RandomStreams(seed, "SECTOR 01")
 
-def create_sector():
     # 1) Create our Scene
     scene = PhysicalScene()
 
@@ -106,53 +109,63 @@ def create_sector():
     )
     scene.add_object(ship_obj, main=True)
 
-    # other random ships
-    rnd_x = random_int_generator(-50, 50, "RX")
-    rnd_y = random_int_generator(-50, 50, "RY")
-    rnd_xp = random_int_generator(-1000, 1000, "RXp")
-    rnd_yp = random_int_generator(-1000, 1000, "RYp")
-    for _ in range(1000):
+    # other random ships (all draws up front, one call per stream)
+    num_ships = 1000
+    rnd_x = rng.integers(-50, 50, "SHIPS/RX", num_ships).tolist()
+    rnd_y = rng.integers(-50, 50, "SHIPS/RY", num_ships).tolist()
+    rnd_xp = rng.integers(-1000, 1000, "SHIPS/RXp", num_ships).tolist()
+    rnd_yp = rng.integers(-1000, 1000, "SHIPS/RYp", num_ships).tolist()
+    rnd_c = rng.choice([
+        "blue", "purple", "white", "yellow", "red", "orange"
+    ], "SHIPS/COLOR", num_ships)
+    for _i in range(num_ships):
         ship_coords = generate_trapezium_points(
-            (next(rnd_xp), next(rnd_yp)),
+            (rnd_xp[_i], rnd_yp[_i]),
             8,
             10,
             14
         )
         ship_obj = PhysicalObject(
             ship_coords,
-            velocity=(next(rnd_x) / 10, next(rnd_y) / 10),
+            velocity=(rnd_x[_i] / 10, rnd_y[_i] / 10),
             _rotation_speed_deg=15.0,
-            color=random.choice([
-                "blue", "purple", "white", "yellow", "red", "orange"
-            ])
+            color=rnd_c[_i]
         )
         scene.add_object(ship_obj, main=False)
 
     # stars
-    rnd_x = random_int_generator(-3000, 3000, "RX")
-    rnd_y = random_int_generator(-3000, 3000, "RY")
-    rnd_r = random_int_generator(5, 35, "RR")
-    rnd_s = random_int_generator(30, 50, "RS")
-    rnd_d = random_int_generator(0, 35, "RD")
-    for _ in range(100):
+    num_stars = 100
+    rnd_x = rng.integers(-3000, 3000, "STARS/RX", num_stars).tolist()
+    rnd_y = rng.integers(-3000, 3000, "STARS/RY", num_stars).tolist()
+    rnd_r = rng.integers(5, 35, "STARS/RR", num_stars).tolist()
+    rnd_s = rng.integers(30, 50, "STARS/RS", num_stars).tolist()
+    rnd_d = rng.integers(0, 35, "STARS/RD", num_stars).tolist()
+    rnd_c = rng.choice([
+        "yellow", "red", "orange"
+    ], "STARS/COLOR", num_stars)
+    for _i in range(num_stars):
         star_coords = generate_spiked_circle_points(
-            center=(next(rnd_x), next(rnd_y)),
-            radius=next(rnd_r),
-            num_spikes=next(rnd_s),
+            center=(rnd_x[_i], rnd_y[_i]),
+            radius=rnd_r[_i],
+            num_spikes=rnd_s[_i],
             spike_height=10
         )
         star_obj = PhysicalObject(
             star_coords,
             velocity=(0, 0),
-            _rotation_speed_deg=next(rnd_d),
-            color=random.choice([
-                "yellow", "red", "orange"
-            ])
+            _rotation_speed_deg=rnd_d[_i],
+            color=rnd_c[_i]
         )
         scene.add_object(star_obj, main=False)
 
+    return scene
+
+
+def create_sector(seed: Optional[int] = None):
+    scene = build_sector_scene(seed)
+
     # 3) Create the animator, start the input thread, and run
-    animator = AnimatedScene(scene, center_grid=True)
+    animator = AnimatedScene(scene, center_grid=True, renderer="collection")
     animator.start_input_thread()
     animator.run()
 
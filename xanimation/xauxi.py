@@ -29,38 +29,47 @@ def angle_between_vectors(
         return angle
 
 
+def flatten_tree(
+        pobjs: List[PhysicalObject]
+) -> Tuple[List[PhysicalObject], List[int]]:
+    # objects and their attachments in pre-order (parents before children)
+    # with the index of every one's parent, -1 for the given roots
+    flat: List[PhysicalObject] = []
+    parents: List[int] = []
+    stack: List[Tuple[PhysicalObject, int]] = [
+        (pobj, -1) for pobj in reversed(pobjs)
+    ]
+    while stack:
+        pobj, parent = stack.pop()
+        row: int = len(flat)
+        flat.append(pobj)
+        parents.append(parent)
+        for attachment in reversed(pobj.attachments or []):
+            stack.append((attachment, row))
+
+    return flat, parents
+
+
 def update_all_positions(
         pobj: PhysicalObject,
         dt: float = 0.1
 ) -> None:
-    pobj.update_position(dt=dt)
-
-    if pobj.attachments is not None:
-        for attachment in pobj.attachments:
-            update_all_positions(attachment, dt)
+    for obj in flatten_tree([pobj])[0]:
+        obj.update_position(dt=dt)
 
 
 def get_all_patches(
         pobj: PhysicalObject
 ) -> List[Polygon]:
-    patches: List[Polygon] = [pobj.patch]
-
-    if pobj.attachments is not None:
-        for attachment in pobj.attachments:
-            patches.extend(get_all_patches(attachment))
-
-    return patches
+    return [obj.patch for obj in flatten_tree([pobj])[0]]
 
 
 def add_all_patches(
         pobj: PhysicalObject,
         ax: Any
 ) -> None:
-    ax.add_patch(pobj.patch)
-
-    if pobj.attachments is not None:
-        for attachment in pobj.attachments:
-            add_all_patches(attachment, ax)
+    for obj in flatten_tree([pobj])[0]:
+        ax.add_patch(obj.patch)
 
 
 def calc_next_frame_coords(x_vals, xlim, y_vals, ylim):
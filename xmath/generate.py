@@ -1,10 +1,8 @@
-from bisect import bisect
 import numpy as np
 from typing import Tuple
 
-from space.cosmic_structures.functions.calculate import calculate_magnitude, \
-    get_vector_between_positions
 from xmath.pcurve import generate_parametric_values
+from xmath.spatial import select_star_locations, unique_coordinates
 from xmath.xrandom import random_int_generator
 
 
@@ -40,28 +38,9 @@ def generate_galaxy_parametric_values(
     coordinates = np.concatenate(coordinates)
 
     # unique values
-    vv = []
-    new_cc = []
-    for cc in coordinates:
-        if cc not in vv:
-            new_cc.append(cc)
+    coordinates = unique_coordinates(coordinates)
 
-    coordinates = np.array(new_cc)
-
-    magnitudes = np.array([
-        calculate_magnitude(
-            get_vector_between_positions(origin, x),
-            roundit=False
-        )
-        for x in coordinates
-    ])
-    min_mag, max_mag = min(magnitudes), max(magnitudes)
-    print(f"min={min_mag}, max={max_mag}")
-    even_space = np.linspace(min_mag, max_mag, num_systems)
-    locations = [
-        coordinates[bisect(list(magnitudes), x) - 1]
-        for x in even_space
-    ]
+    locations = select_star_locations(coordinates, origin, num_systems)
 
     # rnd_int3 = random_int_generator(0, len(c3) - 1, True)
     # rnd_int4 = random_int_generator(0, len(c4) - 1, True)
@@ -1,17 +1,18 @@
-import datetime
-import time
-from bisect import bisect
-from typing import Tuple, List
-import random
-import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple, List, Optional
 from math import pi
 
-from space.cosmic_structures.functions.calculate import \
-    get_distance_between_positions, calculate_magnitude, \
-    get_vector_between_positions
+from xmath.orbits import ParametricOrbit
 from xmath.pcurve import generate_parametric_values
+from xmath.spatial import select_star_locations, PoissonDiscSampler
 from xmath.structures import UNIVERSE_STRUCT, R2, Z2, Z2_POS
-from xmath.xrandom import random_int_generator
+from xmath.xrng import RandomStreams
+
+
+# (name, origin, size, num systems, num planet orbits, lazy orbits, streams)
+GALAXY_TASK = Tuple[
+    str, Tuple[float, float], float, int, int, bool, RandomStreams
+]
 
 
 def generate_universe_parametric_values(
@@ -21,79 +22,118 @@ def generate_universe_parametric_values(
         rand_size_range_limit: int = 5,
         galaxy_distance: float = 10.,
         black_hole_distance: float = 3.,
-        num_black_holes: int = 10
+        num_black_holes: int = 10,
+        lazy_orbits: bool = False,
+        workers: Optional[int] = None,
+        seed: Optional[int] = None
 ) -> UNIVERSE_STRUCT:
+    # every galaxy draws from its own named stream ("UNIVERSE/Galaxy 3/...")
+    # so a seed gives the same universe for any number of workers
+    streams: RandomStreams = RandomStreams(seed, "UNIVERSE")
     rand_size_range: Tuple[int, int] = (
         0, rand_size_range_limit
     )
-    universe = {}
+
+    # 1) place all galaxy / black hole origins (cheap, sequential)
+    tasks: List[GALAXY_TASK] = []
 
     visited = []
+    placer = PoissonDiscSampler(
+        (rand_size_range[0], rand_size_range[0]),
+        (rand_size_range[1], rand_size_range[1]),
+        max(galaxy_distance, black_hole_distance, 1.)
+    )
     for galaxy in range(num_galaxies):
-
-        rnd_systems = random_int_generator(
-            num_systems - int(.25 * num_systems),
-            num_systems + int(.25 * num_systems),
-            "SYSTEMS-X1"
-        )
+        galaxy_streams: RandomStreams = streams.child(f"Galaxy {galaxy}")
 
         galaxy_size, origin = calc_range_and_origin(
             rand_size_range,
             visited,
-            galaxy_distance
+            galaxy_distance,
+            galaxy_streams,
+            placer
         )
 
         visited.append(origin)
-        universe[f"Galaxy {galaxy}"] = generate_galaxy_parametric_values(
+        tasks.append((
             f"Galaxy {galaxy}",
             (float(origin[0]), float(origin[1])),
             galaxy_size,
-            next(rnd_systems),
-            num_planet_orbits
-        )
+            galaxy_streams.integers(
+                num_systems - int(.25 * num_systems),
+                num_systems + int(.25 * num_systems),
+                "SYSTEMS"
+            ),
+            num_planet_orbits,
+            lazy_orbits,
+            galaxy_streams
+        ))
 
     # Add other universe stellar objects
-    rnd_stellar = random_int_generator(0, 10, "STELLAR")
     for _ibx in range(num_black_holes):
+        stellar_streams: RandomStreams = streams.child(f"Black Hole BH{_ibx}")
         _, origin = calc_range_and_origin(
             rand_size_range,
             visited,
-            black_hole_distance
+            black_hole_distance,
+            stellar_streams,
+            placer
         )
-        universe[f"Black Hole BH{_ibx}"] = generate_galaxy_parametric_values(
+        visited.append(origin)
+        tasks.append((
             f"Black Hole BH{_ibx}",
             (float(origin[0]), float(origin[1])),
-            next(rnd_stellar) / 10,
+            stellar_streams.integers(0, 10, "STELLAR") / 10,
+            0,
             0,
-            0
+            lazy_orbits,
+            stellar_streams
+        ))
+
+    # 2) galaxies (star systems + planet orbits) are independent of each
+    # other once placed, so they can be fanned out over processes
+    if workers is None or workers <= 1 or len(tasks) <= 1:
+        galaxies = map(generate_galaxy_task, tasks)
+        return {task[0]: galaxy for task, galaxy in zip(tasks, galaxies)}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        galaxies = executor.map(
+            generate_galaxy_task,
+            tasks,
+            chunksize=max(1, len(tasks) // (4 * workers))
         )
+        # map keeps task order, so the result does not depend on workers
+        return {task[0]: galaxy for task, galaxy in zip(tasks, galaxies)}
+
 
-    return universe
+def generate_galaxy_task(task: GALAXY_TASK):
+    # module level so it can be pickled to worker processes
+    return generate_galaxy_parametric_values(*task)
 
 
 def calc_range_and_origin(
         rand_size_range: Z2_POS,
         visited: List[Z2_POS],
-        distance: float = 10.
+        distance: float = 10.,
+        rng: Optional[RandomStreams] = None,
+        placer: Optional[PoissonDiscSampler] = None
 ):
-    i_rand = random_int_generator(*rand_size_range, seed="I_RAND")
-    j_rand = random_int_generator(*rand_size_range, seed="J_RAND")
-    rnd_factor = random_int_generator(5, 20, seed="FACTOR")
-
-    origin = None
-    prange = next(rnd_factor) / 10
-    for _ in range(rand_size_range[1] ** 2):
-        origin = (next(i_rand), next(j_rand))
-
-        too_close = [
-            get_distance_between_positions(origin, _x)
-            for _x in visited
-        ]
-
-        too_close = [_x for _x in too_close if _x < distance]
+    # origin at least distance away from every visited origin, inside
+    # the rand_size_range box while there is room, outside it once full.
+    # Pass the same placer for every origin (it already holds them all),
+    # otherwise one is built from visited.
+    rng = RandomStreams() if rng is None else rng
+    if placer is None:
+        placer = PoissonDiscSampler(
+            (rand_size_range[0], rand_size_range[0]),
+            (rand_size_range[1], rand_size_range[1]),
+            max(distance, 1.)
+        )
+        for _x in visited:
+            placer.add(_x)
 
-        if len(too_close) == 0:
-            break
+    prange = rng.integers(5, 20, "FACTOR") / 10
+    origin = placer.place(distance, rng, "ORIGIN")
 
     return prange, origin
 
@@ -104,57 +144,58 @@ def generate_galaxy_parametric_values(
         galaxy_size: int = 1,
         num_systems: int = 20,
         num_planet_orbits: int = 16,
+        lazy_orbits: bool = False,
+        rng: Optional[RandomStreams] = None
 ):
-    # galaxy parametric parameters
-    elip_rnd_a = random_int_generator(10, 15, "AELIP_LOG_A")
-    elip_rnd_b = random_int_generator(10, 15, "BELIP_LOG_B")
+    rng = RandomStreams(path=galaxy_name) if rng is None else rng
 
-    _a_C = next(elip_rnd_a) / 10.
-    _b_C = next(elip_rnd_b) / 10.
+    # galaxy parametric parameters
+    _a_C = rng.integers(10, 15, "AELIP_LOG_A") / 10.
+    _b_C = rng.integers(10, 15, "BELIP_LOG_B") / 10.
     _a_C = _b_C = 1  # TEMPORARY # TODO
     _L = 0.015
     _t_range = (0, 250)
     _num_points = 2_000
     _factor = .1 * galaxy_size
-
-    coordinates = generate_parametric_values(
-        "log_spiral_elipse",
-        _t_range,
-        _num_points,
-        _factor,
+    _params = dict(
         hs=origin[0], vs=origin[1],
 
         # log spiral params
         a_C=_a_C, b_C=_b_C,
-        rot=random.choice([2 * pi * x / 20. for x in range(0, 20)]),
+        rot=rng.choice([2 * pi * x / 20. for x in range(0, 20)], "ROT"),
         L=_L
     )
 
-    magnitudes = np.array([
-        calculate_magnitude(
-            get_vector_between_positions(origin, x),
-            roundit=False
-        )
-        for x in coordinates
-    ])
-
-    min_mag, max_mag = min(magnitudes), max(magnitudes)
-    print(f"min={min_mag}, max={max_mag}")
-    even_space = np.linspace(min_mag, max_mag, num_systems)
+    coordinates = generate_parametric_values(
+        "log_spiral_elipse",
+        _t_range,
+        _num_points,
+        _factor,
+        **_params
+    )
 
-    star_locs = [
-        coordinates[bisect(list(magnitudes), x) - 1]
-        for x in even_space
-    ]
-    star_locs.insert(0,
-                     (float(origin[0]), float(origin[1])))
+    star_locs = [(float(origin[0]), float(origin[1]))]
+    star_locs.extend(
+        select_star_locations(coordinates, origin, num_systems)
+    )
 
     star_systems = generate_star_systems_parametric_values(
-        galaxy_name, num_planet_orbits, origin, star_locs
+        galaxy_name, num_planet_orbits, origin, star_locs, lazy_orbits, rng
     )
 
+    if lazy_orbits:
+        # the sampled spiral was only needed to place the stars
+        coordinates = ParametricOrbit(
+            "log_spiral_elipse",
+            _t_range,
+            _num_points,
+            _factor,
+            **_params
+        )
+
     galaxy = {
         "name": galaxy_name,
+        "position_index": 0,
         "motion_path": coordinates,
         "star_systems": star_systems
     }
@@ -163,15 +204,19 @@ def generate_galaxy_parametric_values(
 
 
 def generate_star_systems_parametric_values(galaxy_name, num_planet_orbits,
-                                            origin, star_locs):
+                                            origin, star_locs,
+                                            lazy_orbits=False, rng=None):
+    rng = RandomStreams(path=galaxy_name) if rng is None else rng
+    # same call signature, evaluated now or on demand
+    _orbit = ParametricOrbit if lazy_orbits else generate_parametric_values
     _R = 0.01
     _t_range = (0, 100)
     _num_points = 1000
     _factor = 1
-    rnd_planets = random_int_generator(
+    rnd_planets = rng.int_generator(
         num_planet_orbits - int(.75 * num_planet_orbits),
         num_planet_orbits + int(.5 * num_planet_orbits),
-        "RND_PLANETS-Y2"
+        "RND_PLANETS"
     )
     evenly_spaced_orbit = lambda _radius, _r_factor, _rrrn: _radius - (
             _radius * (_r_factor / (_rrrn + 1))
@@ -186,7 +231,7 @@ def generate_star_systems_parametric_values(galaxy_name, num_planet_orbits,
                     if is_centre else f"Star: {sys_name}",
                 "num_planets": (_rn := next(rnd_planets)),
                 "planet_orbit_paths": (planet_orbit_paths := [
-                    generate_parametric_values(
+                    _orbit(
                         "circle",
                         _t_range,
                         _num_points,
@@ -198,7 +243,8 @@ def generate_star_systems_parametric_values(galaxy_name, num_planet_orbits,
                     for x in range(1, _rn + 1)
                 ]),
                 "planets": generate_planets_parametric_values(
-                    planet_orbit_paths, sys_name
+                    planet_orbit_paths, sys_name,
+                    rng.child(f"System {system_no}")
                 )
             }
         for system_no, (o1, o2) in enumerate(star_locs)
@@ -206,11 +252,18 @@ def generate_star_systems_parametric_values(galaxy_name, num_planet_orbits,
     return star_systems
 
 
-def generate_planets_parametric_values(planet_orbit_paths, sys_name):
+def generate_planets_parametric_values(planet_orbit_paths, sys_name,
+                                       rng=None):
+    rng = RandomStreams(path=sys_name) if rng is None else rng
     return {
         f"Planet {_idxp}": {
             "name": f"{sys_name}: Planet {_idxp}",
-            "position": [random.choice(planet_coords)],
+            "position_index": (
+                _pidx := rng.integers(
+                    0, len(planet_coords) - 1, "POSITION_INDEX"
+                )
+            ),
+            "position": [planet_coords[_pidx]],
             "motion_path": planet_coords
         }
         for _idxp, planet_coords in enumerate(planet_orbit_paths)
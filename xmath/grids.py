@@ -0,0 +1,103 @@
+from typing import Tuple
+import numpy as np
+
+from xmath.structures import Z2_POS
+
+
+class SparseGrid(object):
+    """
+    Coordinate (COO) form of a rasterized grid: the x, y and marker of
+    every occupied cell of a (width, height) grid, sorted by (y, x).
+    """
+
+    def __init__(
+            self,
+            x: np.ndarray,
+            y: np.ndarray,
+            labels: np.ndarray,
+            shape: Z2_POS
+    ):
+        self.x: np.ndarray = x
+        self.y: np.ndarray = y
+        self.labels: np.ndarray = labels
+        self.shape: Z2_POS = shape
+        self._cells: np.ndarray = y * shape[0] + x
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            a.nbytes for a in (self.x, self.y, self.labels, self._cells)
+        )
+
+    def get(self, position: Z2_POS) -> int:
+        # marker at (x, y), 0 for empty space
+        cell: int = position[1] * self.shape[0] + position[0]
+        idx: int = int(np.searchsorted(self._cells, cell))
+        if idx < len(self._cells) and self._cells[idx] == cell:
+            return int(self.labels[idx])
+
+        return 0
+
+    def to_dense(self) -> np.ndarray:
+        max_label: int = int(self.labels.max(initial=0))
+        grid: np.ndarray = np.zeros(
+            (self.shape[1], self.shape[0]),
+            dtype=np.min_scalar_type(max(max_label, 1))
+        )
+        grid[self.y, self.x] = self.labels
+        return grid
+
+
+class BitmapGrid(object):
+    """
+    Occupancy of a (width, height) grid packed 8 cells per byte, in
+    np.packbits order of the row-major (height, width) grid.
+    """
+
+    def __init__(self, bits: np.ndarray, shape: Z2_POS):
+        self.bits: np.ndarray = bits
+        self.shape: Z2_POS = shape
+
+    @classmethod
+    def from_cells(cls, cells: np.ndarray, shape: Z2_POS) -> "BitmapGrid":
+        # cells: flat y * width + x indices of the occupied cells
+        bits: np.ndarray = np.zeros(
+            (shape[0] * shape[1] + 7) // 8, dtype=np.uint8
+        )
+        np.bitwise_or.at(
+            bits,
+            cells >> 3,
+            (np.uint8(128) >> (cells & 7).astype(np.uint8))
+        )
+        return cls(bits, shape)
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes
+
+    def __contains__(self, position: Z2_POS) -> bool:
+        x, y = position
+        if not (0 <= x < self.shape[0] and 0 <= y < self.shape[1]):
+            return False
+
+        cell: int = y * self.shape[0] + x
+        return bool(self.bits[cell >> 3] & (128 >> (cell & 7)))
+
+    def to_dense(self) -> np.ndarray:
+        width, height = self.shape
+        return np.unpackbits(
+            self.bits, count=width * height
+        ).reshape(height, width).astype(bool)
+
+    def occupied(self) -> Tuple[np.ndarray, np.ndarray]:
+        # x, y arrays of the set cells, unpacking only the non zero bytes
+        nonzero: np.ndarray = np.flatnonzero(self.bits)
+        set_bits: np.ndarray = np.unpackbits(
+            self.bits[nonzero][:, None], axis=1
+        ).astype(bool)
+        byte, bit = np.nonzero(set_bits)
+        cells: np.ndarray = nonzero[byte].astype(np.int64) * 8 + bit
+        return cells % self.shape[0], cells // self.shape[0]
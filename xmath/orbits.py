@@ -0,0 +1,179 @@
+from typing import Dict, Any, List, Optional, Union, Tuple
+import numpy as np
+
+from xmath.pcurve import evaluate_parametric_values
+from xmath.structures import R2, Z2_POS
+
+
+class ParametricOrbit(object):
+    """
+    Lazy motion path: stores only the PARAMETRIC_EQNS equation name and
+    its parameters, and evaluates positions for any t (or sample index)
+    on demand. Behaves like the (num_points, 2) array
+    generate_parametric_values would have produced for the same arguments.
+    """
+
+    def __init__(
+            self,
+            equation_type: str,
+            t_range: Z2_POS,
+            num_points: int,
+            factor: float,
+            cache: bool = False,
+            **parameter_values
+    ):
+        self.equation_type: str = equation_type
+        self.t_range: Tuple[float, float] = (
+            float(t_range[0]), float(t_range[1])
+        )
+        self.num_points: int = num_points
+        self.factor: float = factor
+        self.parameter_values: Dict[str, Any] = parameter_values
+        self.cache: bool = cache
+        self._values: Optional[np.ndarray] = None
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._values is not None
+
+    @property
+    def t_step(self) -> float:
+        if self.num_points < 2:
+            return 0.
+        return (self.t_range[1] - self.t_range[0]) / (self.num_points - 1)
+
+    @property
+    def nbytes(self) -> int:
+        return 0 if self._values is None else self._values.nbytes
+
+    def t_values(
+            self,
+            index: Union[int, np.ndarray, slice, None] = None
+    ) -> np.ndarray:
+        # same values as np.linspace(*t_range, num_points)[index]
+        idx: np.ndarray = np.arange(self.num_points)
+        if index is not None:
+            idx = idx[index] if isinstance(index, slice) else \
+                np.asarray(index) % max(self.num_points, 1)
+
+        t: np.ndarray = idx * self.t_step + self.t_range[0]
+        return np.where(idx == self.num_points - 1, self.t_range[1], t)
+
+    def at(self, t: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Position(s) at arbitrary parameter value(s) t: (2,) for a scalar,
+        (..., 2) for an array.
+        """
+        return evaluate_parametric_values(
+            self.equation_type,
+            np.asarray(t, dtype=np.float64),
+            self.factor,
+            **self.parameter_values
+        )
+
+    def sample(
+            self,
+            index: Union[int, np.ndarray, slice]
+    ) -> np.ndarray:
+        if self._values is not None:
+            return self._values[index]
+        return self.at(self.t_values(index))
+
+    def materialize(self, cache: Optional[bool] = None) -> R2:
+        if self._values is not None:
+            return self._values
+
+        values: np.ndarray = self.at(self.t_values())
+        if self.cache if cache is None else cache:
+            self._values = values
+
+        return values
+
+    def release(self) -> None:
+        self._values = None
+
+    def __len__(self) -> int:
+        return self.num_points
+
+    def __getitem__(self, index: Union[int, np.ndarray, slice]):
+        return self.sample(index)
+
+    def __iter__(self):
+        return iter(self.materialize())
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        values: np.ndarray = self.materialize()
+        return values if dtype is None else values.astype(dtype)
+
+    def __repr__(self) -> str:
+        return (
+            f"ParametricOrbit({self.equation_type!r}, {self.t_range}, "
+            f"{self.num_points}, {self.factor}, {self.parameter_values})"
+        )
+
+
+class OrbitTable(object):
+    """
+    Column stack of many ParametricOrbit's sharing an equation and
+    parameter names, so positions of all of them at per-orbit sample
+    indices are one broadcast evaluation.
+    """
+
+    def __init__(self, orbits: List[ParametricOrbit]):
+        self.equation_type: str = orbits[0].equation_type
+        self.parameter_names: List[str] = sorted(orbits[0].parameter_values)
+
+        self.t_start: np.ndarray = np.array([o.t_range[0] for o in orbits])
+        self.t_stop: np.ndarray = np.array([o.t_range[1] for o in orbits])
+        self.t_step: np.ndarray = np.array([o.t_step for o in orbits])
+        self.num_points: np.ndarray = np.array(
+            [o.num_points for o in orbits], dtype=np.int64
+        )
+        self.factor: np.ndarray = np.array([o.factor for o in orbits])
+        self.parameters: Dict[str, np.ndarray] = {
+            k: np.array([o.parameter_values[k] for o in orbits])
+            for k in self.parameter_names
+        }
+
+    def __len__(self) -> int:
+        return len(self.num_points)
+
+    def sample(
+            self,
+            index: np.ndarray,
+            rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        (len(index), 2) positions, orbit ``rows[i]`` (default: all rows in
+        order) at sample ``index[i]``.
+        """
+        rows = slice(None) if rows is None else rows
+        index = np.asarray(index)
+        t: np.ndarray = index * self.t_step[rows] + self.t_start[rows]
+        t = np.where(index == self.num_points[rows] - 1, self.t_stop[rows], t)
+
+        return evaluate_parametric_values(
+            self.equation_type,
+            t,
+            self.factor[rows],
+            **{k: v[rows] for k, v in self.parameters.items()}
+        )
+
+
+def orbit_table_key(orbit: ParametricOrbit) -> Tuple[str, Tuple[str, ...]]:
+    return orbit.equation_type, tuple(sorted(orbit.parameter_values))
+
+
+def group_orbits(
+        orbits: List[ParametricOrbit]
+) -> List[Tuple[np.ndarray, OrbitTable]]:
+    # (positions of the orbits in the given list, table of those orbits)
+    groups: Dict[Tuple[str, Tuple[str, ...]], List[int]] = {}
+    for idx, orbit in enumerate(orbits):
+        groups.setdefault(orbit_table_key(orbit), []).append(idx)
+
+    return [
+        (np.array(ids, dtype=np.int64), OrbitTable([orbits[i] for i in ids]))
+        for ids in groups.values()
+    ]
+
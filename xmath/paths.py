@@ -0,0 +1,83 @@
+from typing import Union
+import numpy as np
+
+from xmath.structures import Z2, Z2_POS
+
+
+class RunLengthPath(object):
+    """
+    Integer motion path stored as runs: the distinct consecutive cells
+    (int32) and how many samples (time steps) the path dwells in each.
+
+    Indexing is by time, like the sample index of the full path: path[t]
+    is the cell occupied at step t (mod the path duration), len(path) is
+    the duration, so it can stand in for the list of cells it compresses.
+    """
+
+    def __init__(self, cells: np.ndarray, dwell: np.ndarray):
+        self.cells: np.ndarray = np.asarray(cells, dtype=np.int32)
+        self.dwell: np.ndarray = np.asarray(dwell, dtype=np.int32)
+        # first time step of every run
+        self.starts: np.ndarray = np.concatenate(
+            [[0], np.cumsum(self.dwell[:-1])]
+        ).astype(np.int32)
+        self.duration: int = int(self.dwell.sum())
+
+    @classmethod
+    def from_cells(cls, cells: Union[Z2, np.ndarray]) -> "RunLengthPath":
+        cells = np.asarray(cells, dtype=np.int32).reshape(-1, 2)
+        changes: np.ndarray = np.flatnonzero(
+            np.any(cells[1:] != cells[:-1], axis=1)
+        ) + 1
+        starts: np.ndarray = np.concatenate([[0], changes])
+
+        return cls(
+            cells[starts],
+            np.diff(np.concatenate([starts, [len(cells)]]))
+        )
+
+    @property
+    def num_runs(self) -> int:
+        return len(self.dwell)
+
+    @property
+    def nbytes(self) -> int:
+        return self.cells.nbytes + self.dwell.nbytes + self.starts.nbytes
+
+    def run_at(self, t: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+        t = np.mod(t, self.duration)
+        # no repeated cells: every run is one step long
+        runs = t if self.num_runs == self.duration else np.searchsorted(
+            self.starts, t, side="right"
+        ) - 1
+        return int(runs) if np.ndim(runs) == 0 else runs
+
+    def at(self, t: Union[int, np.ndarray]) -> np.ndarray:
+        # cell(s) at time step(s) t: (2,) or (..., 2)
+        return self.cells[self.run_at(t)]
+
+    def time_to_next_cell(self, t: int) -> int:
+        # steps from t until the path moves to its next run
+        t = t % self.duration
+        run: int = self.run_at(t)
+        return int(self.starts[run] + self.dwell[run] - t)
+
+    def to_array(self) -> np.ndarray:
+        # the full (duration, 2) path
+        return np.repeat(self.cells, self.dwell, axis=0)
+
+    def __len__(self) -> int:
+        return self.duration
+
+    def __getitem__(self, t: int) -> Z2_POS:
+        x, y = self.cells[self.run_at(t)].tolist()
+        return x, y
+
+    def __iter__(self):
+        return iter(map(tuple, self.to_array().tolist()))
+
+    def __repr__(self) -> str:
+        return (
+            f"RunLengthPath({self.num_runs} runs over "
+            f"{self.duration} steps)"
+        )
@@ -1,4 +1,4 @@
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Dict, Any, Union
 from inspect import signature
 import numpy as np
 
@@ -9,6 +9,7 @@ from xmath.structures import (
     Z2_MATRIX
 )
 from xmath.equations import PARAMETRIC_EQNS
+from xmath.grids import SparseGrid, BitmapGrid
 
 
 # TODO: Refactor to OPTIMIZE:
@@ -25,91 +26,285 @@ def generate_parametric_values(
 ) -> R2:
     t_values = np.linspace(t_range[0], t_range[1], num_points)
 
-    equation: List[Lambda] = PARAMETRIC_EQNS[equation_type]
-    eqn_x: Lambda = equation[0]
-    eqn_y: Lambda = equation[1]
-    sig_x: List[str] = list(signature(eqn_x).parameters.keys())
-    sig_y: List[str] = list(signature(eqn_y).parameters.keys())
+    return evaluate_parametric_values(
+        equation_type, t_values, factor, **parameter_values
+    )
 
-    x_vals = eqn_x(
-        t_values,
-        **{k: v for k, v in parameter_values.items() if k in sig_x}
-    ) * factor
 
-    y_vals = eqn_y(
-        t_values,
-        **{k: v for k, v in parameter_values.items() if k in sig_y}
-    ) * factor
+def evaluate_parametric_values(
+        equation_type: str,
+        t_values: np.ndarray,
+        factor: float,
+        **parameter_values
+) -> R2:
+    # t_values and parameter values broadcast element wise, so a single
+    # call can evaluate many t's and/or many curves of the same equation
+    return compile_equation(equation_type).evaluate(
+        t_values, factor, parameter_values
+    )
 
-    h_shift = parameter_values.get("hs")
-    v_shift = parameter_values.get("vs")
 
-    h_shift = 0 if h_shift is None else h_shift
-    v_shift = 0 if v_shift is None else v_shift
+def evaluate_many(
+        equation_type: str,
+        t_values: np.ndarray,
+        param_table: Union[np.ndarray, Dict[str, Any]],
+        factor: Union[float, np.ndarray] = 1.
+) -> np.ndarray:
+    """
+    Evaluate K curves of one equation over the same N t_values in one
+    broadcast call, returns a (K, N, 2) array.
 
-    results: R2 = np.c_[x_vals + h_shift, y_vals + v_shift]
+    param_table is either a structured array / dict of (K,) columns keyed
+    by parameter name (optionally with a 'factor' column), or a (K, P)
+    array whose columns follow ``compile_equation(...).columns``.
+    """
+    return compile_equation(equation_type).evaluate_many(
+        t_values, param_table, factor
+    )
 
-    # TODO:   generate  numpy array of tuples[int, int]'s
 
-    return results
+class CompiledEquation(object):
+    """
+    PARAMETRIC_EQNS entry with its lambda signatures resolved once.
+    """
 
+    def __init__(self, equation_type: str, equation: List[Lambda]):
+        self.equation_type: str = equation_type
+        self.eqn_x: Lambda = equation[0]
+        self.eqn_y: Lambda = equation[1]
 
-def generate_multi_param_num_grid(mvalues: List[R2]) -> Z2_MATRIX:
-    cvalues: R2 = []
+        # first lambda argument is t
+        self.params_x: Tuple[str, ...] = tuple(
+            signature(self.eqn_x).parameters.keys()
+        )[1:]
+        self.params_y: Tuple[str, ...] = tuple(
+            signature(self.eqn_y).parameters.keys()
+        )[1:]
+        self.parameters: Tuple[str, ...] = tuple(
+            dict.fromkeys(self.params_x + self.params_y)
+        )
+        # column order of a plain 2D parameter table
+        self.columns: Tuple[str, ...] = self.parameters + tuple(
+            x for x in ("hs", "vs") if x not in self.parameters
+        )
 
-    markers: List[Tuple[int, int]] = [(0, 1)]
+    def evaluate(
+            self,
+            t_values: np.ndarray,
+            factor: Union[float, np.ndarray],
+            parameter_values: Dict[str, Any]
+    ) -> np.ndarray:
+        x_vals = self.eqn_x(
+            t_values,
+            **{k: parameter_values[k] for k in self.params_x
+               if k in parameter_values}
+        ) * factor
 
-    for idx, values in enumerate(mvalues):
-        cvalues.extend(values)
-        markers.append((len(cvalues), idx + 2))
+        y_vals = self.eqn_y(
+            t_values,
+            **{k: parameter_values[k] for k in self.params_y
+               if k in parameter_values}
+        ) * factor
 
-    bool_grid: Z2_MATRIX = generate_parametric_num_grid(cvalues, markers)
+        h_shift = parameter_values.get("hs")
+        v_shift = parameter_values.get("vs")
+
+        if h_shift is not None:
+            x_vals = x_vals + h_shift
+        if v_shift is not None:
+            y_vals = y_vals + v_shift
+
+        shape: Tuple[int, ...] = np.broadcast_shapes(
+            np.shape(x_vals), np.shape(y_vals)
+        )
+        results: np.ndarray = np.empty(shape + (2,), dtype=np.float64)
+        results[..., 0] = x_vals
+        results[..., 1] = y_vals
+
+        return results
+
+    def evaluate_many(
+            self,
+            t_values: np.ndarray,
+            param_table: Union[np.ndarray, Dict[str, Any]],
+            factor: Union[float, np.ndarray] = 1.
+    ) -> np.ndarray:
+        columns: Dict[str, np.ndarray] = self._table_columns(param_table)
+        factor = columns.pop("factor", factor)
+
+        # parameters as (K, 1) against t as (1, N)
+        as_column = lambda _v: np.asarray(_v, dtype=np.float64).reshape(-1, 1)
+        return self.evaluate(
+            np.asarray(t_values, dtype=np.float64).reshape(1, -1),
+            as_column(factor) if np.ndim(factor) else factor,
+            {k: as_column(v) for k, v in columns.items()}
+        )
 
-    return bool_grid
+    def _table_columns(
+            self,
+            param_table: Union[np.ndarray, Dict[str, Any]]
+    ) -> Dict[str, np.ndarray]:
+        if isinstance(param_table, dict):
+            return dict(param_table)
+
+        param_table = np.asarray(param_table)
+        if param_table.dtype.names is not None:
+            return {k: param_table[k] for k in param_table.dtype.names}
+
+        param_table = param_table.reshape(len(param_table), -1)
+        num_columns: int = param_table.shape[1]
+        if num_columns not in (len(self.parameters), len(self.columns)):
+            raise ValueError(
+                f"{self.equation_type} parameter table needs columns "
+                f"{self.parameters} or {self.columns}, got {num_columns}"
+            )
+
+        return {
+            k: param_table[:, i]
+            for i, k in enumerate(self.columns[:num_columns])
+        }
+
+
+COMPILED_EQNS: Dict[str, CompiledEquation] = {}
+
+
+def compile_equation(equation_type: str) -> CompiledEquation:
+    compiled: Optional[CompiledEquation] = COMPILED_EQNS.get(equation_type)
+    if compiled is None:
+        compiled = CompiledEquation(
+            equation_type, PARAMETRIC_EQNS[equation_type]
+        )
+        COMPILED_EQNS[equation_type] = compiled
+
+    return compiled
+
+
+def generate_multi_param_num_grid(mvalues: List[R2]) -> Z2_MATRIX:
+    # list of lists wrapper, see rasterize_multi_param_values
+    return rasterize_multi_param_values(mvalues).tolist()
 
 
 def generate_parametric_num_grid(
         values: R2,
         markers: Optional[List[Tuple[int, int]]] = None
 ) -> Z2_MATRIX:
-    if markers is None:
-        markers: List[Tuple[int, int]] = [(0, 1)]
+    # list of lists wrapper, see rasterize_parametric_values
+    return rasterize_parametric_values(values, markers).tolist()
 
-    # int_vals ints from floats
-    new_vals, range_x, range_y = calculate_offset_positions(values)
 
-    grid: Z2_MATRIX = [[0 for _ in range_x] for _ in range_y]
-    for idx, new_val in enumerate(new_vals):
-        x_index: int = new_val[0]
-        y_index: int = new_val[1]
+def calculate_offset_positions(values: R2) -> Tuple[Z2, range, range]:
+    new_vals, (size_x, size_y) = offset_int_positions(values)
+    return list(map(tuple, new_vals.tolist())), range(size_x), range(size_y)
 
-        marker = [m2 for (m1, m2) in markers if idx >= m1][-1]
 
-        grid[y_index][x_index] = marker
+def rasterize_multi_param_values(
+        mvalues: List[R2],
+        dtype: Optional[np.dtype] = None,
+        grid: str = "array"
+) -> Union[np.ndarray, SparseGrid, BitmapGrid]:
+    """
+    Rasterize several curves into one grid, points of curve i are marked
+    i + 1 (0 is empty space). grid picks the representation: "array"
+    (dense ndarray), "sparse" (SparseGrid of the occupied cells) or
+    "bitmap" (BitmapGrid, occupancy only, 1 bit per cell).
+    """
+    lengths: List[int] = [len(values) for values in mvalues]
+    boundaries: np.ndarray = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    markers: List[Tuple[int, int]] = [
+        (int(b), idx + 1) for idx, b in enumerate(boundaries)
+    ]
+    values: np.ndarray = np.concatenate(
+        [np.reshape(v, (-1, 2)) for v in mvalues]
+    )
+
+    if grid == "array":
+        return rasterize_parametric_values(values, markers, dtype)
+    if grid == "sparse":
+        return rasterize_sparse_values(values, markers)
+    if grid == "bitmap":
+        return rasterize_bitmap_values(values)
+
+    raise ValueError(f"unknown grid type {grid!r}")
+
+
+def rasterize_parametric_values(
+        values: R2,
+        markers: Optional[List[Tuple[int, int]]] = None,
+        dtype: Optional[np.dtype] = None
+) -> np.ndarray:
+    """
+    (height, width) grid of the rounded (offset to be >= 0) points, each
+    cell holding the marker of the last point that landed on it: point i
+    gets m2 of the last (m1, m2) in markers with m1 <= i (markers sorted
+    by m1, default [(0, 1)]). dtype defaults to the smallest unsigned
+    integer type holding every marker.
+    """
+    cells, labels, (size_x, size_y) = rasterize_cells(values, markers)
+
+    if dtype is None:
+        dtype = np.min_scalar_type(max(int(labels.max(initial=0)), 1))
+    grid: np.ndarray = np.zeros((size_y, size_x), dtype=dtype)
+    grid.ravel()[cells] = labels
 
     return grid
 
 
-def calculate_offset_positions(values: R2) -> Tuple[Z2, range, range]:
-    int_vals: Z2 = [
-        (
-            int(round(x, 0)), int(round(y, 0))
-        )
-        for (x, y) in values
-    ]
+def rasterize_sparse_values(
+        values: R2,
+        markers: Optional[List[Tuple[int, int]]] = None
+) -> SparseGrid:
+    # rasterize_parametric_values as (x, y, marker) of the occupied cells
+    cells, labels, shape = rasterize_cells(values, markers)
+    return SparseGrid(cells % shape[0], cells // shape[0], labels, shape)
+
+
+def rasterize_bitmap_values(values: R2) -> BitmapGrid:
+    # occupied / empty cells of rasterize_parametric_values, 1 bit each
+    cells, _, shape = rasterize_cells(values)
+    return BitmapGrid.from_cells(cells, shape)
+
+
+def rasterize_cells(
+        values: R2,
+        markers: Optional[List[Tuple[int, int]]] = None
+) -> Tuple[np.ndarray, np.ndarray, Z2_POS]:
+    """
+    Occupied cells (flat y * width + x, ascending) of the rounded, offset
+    points with the marker of the last point on each, and the (width,
+    height) of the grid, without allocating the grid.
+    """
+    if markers is None:
+        markers = [(0, 1)]
+
+    int_vals, (size_x, size_y) = offset_int_positions(values)
+
+    starts: np.ndarray = np.array([m1 for m1, _ in markers])
+    labels: np.ndarray = np.array([m2 for _, m2 in markers])
+    point_labels: np.ndarray = labels[np.maximum(
+        np.searchsorted(starts, np.arange(len(int_vals)), side="right") - 1,
+        0
+    )]
+
+    # later points win where several land on the same cell
+    cells: np.ndarray = int_vals[:, 1] * size_x + int_vals[:, 0]
+    unique_cells, last = np.unique(cells[::-1], return_index=True)
+    last = len(cells) - 1 - last
+
+    return unique_cells, point_labels[last], (size_x, size_y)
+
+
+def offset_int_positions(values: R2) -> Tuple[np.ndarray, Z2_POS]:
+    """
+    Round an (N, 2) array of points to ints and shift them into the +ve
+    quadrant (only axes with negative values move), returns the (N, 2)
+    int64 array and the (width, height) of the grid they span.
+    """
+    int_vals: np.ndarray = np.round(
+        np.asarray(values, dtype=np.float64).reshape(-1, 2)
+    ).astype(np.int64)
+
     # calc. offset (grid has to be in +ve region)
-    max_x: int = max([x[0] for x in int_vals])
-    max_y: int = max([y[1] for y in int_vals])
-    min_x: int = min([x[0] for x in int_vals])
-    min_y: int = min([y[1] for y in int_vals])
-    offset_x: int = -1 * min_x if min_x < 0 else 0
-    offset_y: int = -1 * min_y if min_y < 0 else 0
-    # adjust for offset
-    new_vals: Z2 = [
-        (x + offset_x, y + offset_y)
-        for (x, y) in int_vals
-    ]
-    # populate grid: True where there is a value, ow: False
-    range_x: range = range(max_x + offset_x + 1)
-    range_y: range = range(max_y + offset_y + 1)
-    return new_vals, range_x, range_y
+    int_vals -= np.minimum(int_vals.min(axis=0), 0)
+    size_x, size_y = (int_vals.max(axis=0) + 1).tolist()
+
+    return int_vals, (size_x, size_y)
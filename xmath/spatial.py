@@ -0,0 +1,197 @@
+from math import ceil, floor, hypot, inf, pi
+from typing import Tuple, Union, Optional, List, Dict
+import numpy as np
+
+from xmath.structures import R2, R2_POS
+from xmath.xrng import RandomStreams
+
+
+def distances_from(coordinates: R2, origin: R2_POS) -> np.ndarray:
+    coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+    return np.hypot(
+        coordinates[:, 0] - origin[0],
+        coordinates[:, 1] - origin[1]
+    )
+
+
+def select_star_locations(
+        coordinates: R2,
+        origin: Union[R2_POS, Tuple[int, int]],
+        num_systems: int
+) -> np.ndarray:
+    """
+    Pick num_systems points of a (galaxy) curve whose distances from
+    origin are evenly spaced between the nearest and furthest point.
+
+    For each target distance the last point at or below it is taken (as
+    bisect on the distance array would), all targets are resolved with a
+    single searchsorted so this is linear in the number of points.
+    """
+    coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+    magnitudes: np.ndarray = distances_from(coordinates, origin)
+
+    even_space: np.ndarray = np.linspace(
+        magnitudes.min(), magnitudes.max(), num_systems
+    )
+
+    # spirals are normally already ordered outwards, only sort otherwise
+    order: np.ndarray = np.arange(len(magnitudes))
+    if np.any(np.diff(magnitudes) < 0):
+        order = np.argsort(magnitudes, kind="stable")
+        magnitudes = magnitudes[order]
+
+    indices: np.ndarray = np.searchsorted(
+        magnitudes, even_space, side="right"
+    ) - 1
+
+    return coordinates[order[np.maximum(indices, 0)]]
+
+
+def unique_coordinates(
+        coordinates: R2,
+        tolerance: Optional[float] = None,
+        keep_order: bool = True,
+        return_index: bool = False
+) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Drop duplicate (x, y) rows of an (N, 2) array.
+
+    Rows are packed into one complex128 key each so the dedup is a single
+    1D sort instead of np.unique(axis=0)'s row-wise one. With a tolerance
+    the coordinates are first rounded to a grid of that size, so points in
+    the same tolerance cell collapse onto the first one seen (two close
+    points either side of a cell boundary are both kept). keep_order keeps
+    the first occurrences in their original order (np.unique sorts them).
+    """
+    coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+
+    if tolerance is None:
+        keys: np.ndarray = np.ascontiguousarray(coordinates).view(
+            np.complex128
+        ).ravel()
+    else:
+        if tolerance <= 0:
+            raise ValueError(f"tolerance must be > 0, got {tolerance}")
+        quantized: np.ndarray = np.floor(coordinates / tolerance + .5)
+        keys = quantized[:, 0] + 1j * quantized[:, 1]
+
+    _, index = np.unique(keys, return_index=True)
+    if keep_order:
+        index.sort()
+
+    unique: np.ndarray = coordinates[index]
+    return (unique, index) if return_index else unique
+
+
+class PoissonDiscSampler(object):
+    """
+    Places points with a guaranteed minimum separation (Poisson-disc /
+    Bridson style) using a grid hash of cell_size, so each check only
+    looks at the few neighbouring cells instead of every placed point.
+
+    Each point may ask for its own distance: it is kept at least that far
+    from every point placed before it. Candidates are first thrown
+    uniformly into the [low, high] box, once that is full they are taken
+    just outside distance of active (not yet surrounded) points, at evenly
+    spaced angles from a random offset, so the placed region grows
+    outwards instead of giving up.
+    """
+
+    def __init__(
+            self,
+            low: R2_POS = (0., 0.),
+            high: R2_POS = (0., 0.),
+            cell_size: float = 1.,
+            num_tries: int = 30,
+            num_ring: int = 12
+    ):
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be > 0, got {cell_size}")
+
+        self.low: Tuple[float, float] = (float(low[0]), float(low[1]))
+        self.high: Tuple[float, float] = (float(high[0]), float(high[1]))
+        self.cell_size: float = float(cell_size)
+        self.num_tries: int = num_tries
+        self.num_ring: int = num_ring
+        # smallest distance the box was found full at (no more darts)
+        self._box_full: float = inf
+
+        self.points: List[Tuple[float, float]] = []
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        self._active: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def as_array(self) -> np.ndarray:
+        return np.array(self.points, dtype=np.float64).reshape(-1, 2)
+
+    def add(self, point: R2_POS) -> Tuple[float, float]:
+        # register a point as is (no separation check)
+        point = (float(point[0]), float(point[1]))
+        self._cells.setdefault(self._cell(point), []).append(len(self.points))
+        self._active.append(len(self.points))
+        self.points.append(point)
+
+        return point
+
+    def is_clear(self, point: R2_POS, distance: float) -> bool:
+        ci, cj = self._cell(point)
+        rings: int = int(ceil(distance / self.cell_size))
+        x, y = point
+        for i in range(ci - rings, ci + rings + 1):
+            for j in range(cj - rings, cj + rings + 1):
+                for idx in self._cells.get((i, j), ()):
+                    px, py = self.points[idx]
+                    if hypot(px - x, py - y) < distance:
+                        return False
+
+        return True
+
+    def place(
+            self,
+            distance: float,
+            rng: Optional[RandomStreams] = None,
+            name: str = "ORIGIN"
+    ) -> Tuple[float, float]:
+        rng = RandomStreams() if rng is None else rng
+        generator: np.random.Generator = rng.generator(name)
+
+        # 1) dart throwing inside the box
+        if distance < self._box_full:
+            candidates: np.ndarray = generator.uniform(
+                self.low, self.high, size=(self.num_tries, 2)
+            )
+            for candidate in candidates.tolist():
+                if self.is_clear(candidate, distance):
+                    return self.add(candidate)
+
+            self._box_full = distance
+
+        # 2) grow outwards from the active points
+        radius: float = distance * (1 + 1e-9)
+        ring: np.ndarray = 2 * pi * np.arange(self.num_ring) / self.num_ring
+        while self._active:
+            slot: int = int(generator.integers(len(self._active)))
+            ax, ay = self.points[self._active[slot]]
+
+            angles: np.ndarray = ring + generator.uniform(0., 2 * pi)
+            for x, y in zip(
+                    (ax + radius * np.cos(angles)).tolist(),
+                    (ay + radius * np.sin(angles)).tolist()
+            ):
+                if self.is_clear((x, y), distance):
+                    return self.add((x, y))
+
+            # surrounded: swap-pop out of the active list
+            self._active[slot] = self._active[-1]
+            self._active.pop()
+
+        raise RuntimeError(f"no room left to place a point {distance} apart")
+
+    def _cell(self, point: R2_POS) -> Tuple[int, int]:
+        return (
+            int(floor(point[0] / self.cell_size)),
+            int(floor(point[1] / self.cell_size))
+        )
+
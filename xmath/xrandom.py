@@ -1,39 +1,20 @@
-import hashlib
-import random
-from typing import Optional, List
-from datetime import datetime
-from time import time
+from xmath.xrng import RandomStreams
 
 
 def random_int_generator(
         a: int,
         b: int,
-        seed: str,
+        seed: str = "",
         unique: bool = False
 ):
-    idx = 0
-
-    visited = []
-
-    while True:
-        # seed code (unique on each yield iteration)
-
-        seed_str = seed + (
-                str(datetime.now())
-                + str(time())
-                + (str(idx + 1) * (idx + 1))
-        )
-
-        random.seed(seed_str)
-
-        rnd_int = random.randint(a, b)
-
-        if (not unique) or (rnd_int not in visited):
-            yield rnd_int
-
-        visited.append(rnd_int)
-
-        idx += 1
+    # seed only names the stream, draws come from fresh OS entropy - use
+    # xmath.xrng.RandomStreams with a seed for reproducible values
+    if unique:
+        # every value of [a, b] once, in random order, then stops
+        yield from RandomStreams().unique_int_generator(a, b, seed)
+        return
+
+    yield from RandomStreams().int_generator(a, b, seed)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,176 @@
+import hashlib
+from typing import (
+    Optional, Dict, Iterator, Tuple, Union, Sequence, Any, List, Set
+)
+import numpy as np
+
+STREAM_SEP = "/"
+
+
+class RandomStreams(object):
+    """
+    Named, hierarchical random number streams on numpy's PCG64.
+
+    Every stream path (e.g. "UNIVERSE/Galaxy 3/RND_PLANETS") maps to its
+    own Generator seeded from the root seed and the path only, so draws
+    are reproducible for a given seed and do not depend on the order in
+    which other streams are used (or on which process uses them).
+    ``child(name)`` returns the same streams rooted one level down.
+    Without a seed fresh OS entropy is used.
+    """
+
+    def __init__(self, seed: Optional[int] = None, path: str = ""):
+        self.seed: int = int(np.random.SeedSequence().entropy) \
+            if seed is None else int(seed)
+        self.path: str = path.strip(STREAM_SEP)
+        self._generators: Dict[str, np.random.Generator] = {}
+
+    def __repr__(self) -> str:
+        return f"RandomStreams(seed={self.seed}, path={self.path!r})"
+
+    def child(self, name: str) -> "RandomStreams":
+        return RandomStreams(self.seed, self._join(name))
+
+    def generator(self, name: Optional[str] = None) -> np.random.Generator:
+        path: str = self._join(name)
+        if path not in self._generators:
+            self._generators[path] = np.random.Generator(np.random.PCG64(
+                np.random.SeedSequence(self.seed, spawn_key=_path_key(path))
+            ))
+
+        return self._generators[path]
+
+    def integers(
+            self,
+            a: int,
+            b: int,
+            name: Optional[str] = None,
+            size: Union[int, Tuple[int, ...], None] = None
+    ) -> Union[int, np.ndarray]:
+        # inclusive of b, like random.randint
+        values = self.generator(name).integers(a, b, size=size, endpoint=True)
+        return int(values) if size is None else values
+
+    def uniform(
+            self,
+            low: float = 0.,
+            high: float = 1.,
+            name: Optional[str] = None,
+            size: Union[int, Tuple[int, ...], None] = None
+    ) -> Union[float, np.ndarray]:
+        values = self.generator(name).uniform(low, high, size=size)
+        return float(values) if size is None else values
+
+    def choice(
+            self,
+            options: Sequence[Any],
+            name: Optional[str] = None,
+            size: Optional[int] = None
+    ) -> Any:
+        indices = self.integers(0, len(options) - 1, name, size)
+        if size is None:
+            return options[indices]
+        return [options[i] for i in indices]
+
+    def unique_integers(
+            self,
+            a: int,
+            b: int,
+            k: int,
+            name: Optional[str] = None
+    ) -> np.ndarray:
+        # k distinct ints from [a, b], in random order
+        return sample_unique(self.generator(name), a, b, k)
+
+    def int_generator(
+            self,
+            a: int,
+            b: int,
+            name: Optional[str] = None,
+            chunk_size: int = 256
+    ) -> Iterator[int]:
+        """
+        Endless scalar draws from [a, b] (drop in for the old
+        random_int_generator), generated chunk_size at a time.
+        """
+        generator: np.random.Generator = self.generator(name)
+        while True:
+            yield from generator.integers(
+                a, b, size=chunk_size, endpoint=True
+            ).tolist()
+
+    def unique_int_generator(
+            self,
+            a: int,
+            b: int,
+            name: Optional[str] = None,
+            chunk_size: int = 256
+    ) -> Iterator[int]:
+        """
+        Every value of [a, b] once, in random order, then stops. A lazy
+        Fisher-Yates shuffle: only the swapped slots are kept (in a dict),
+        so k draws cost O(k) whatever the size of the range.
+        """
+        generator: np.random.Generator = self.generator(name)
+        n: int = b - a + 1
+        swapped: Dict[int, int] = {}
+        i: int = 0
+        while i < n:
+            # slot j ~ U[i, n - 1] of every draw of the chunk
+            js: List[int] = generator.integers(
+                np.arange(i, min(i + chunk_size, n)), n, endpoint=False
+            ).tolist()
+            for j in js:
+                value: int = swapped.pop(j, j)
+                if j != i:
+                    swapped[j] = swapped.pop(i, i)
+                i += 1
+                yield value + a
+
+    def _join(self, name: Optional[str]) -> str:
+        if not name:
+            return self.path
+        name = name.strip(STREAM_SEP)
+        return name if not self.path else self.path + STREAM_SEP + name
+
+
+def sample_unique(
+        generator: np.random.Generator,
+        a: int,
+        b: int,
+        k: int
+) -> np.ndarray:
+    """
+    k distinct ints drawn uniformly from [a, b] in O(k): Floyd's algorithm
+    for small k, a partial permutation once k is a large part of the range.
+    """
+    n: int = b - a + 1
+    if k < 0 or k > max(n, 0):
+        raise ValueError(
+            f"cannot draw {k} unique values from [{a}, {b}] ({max(n, 0)})"
+        )
+
+    if 2 * k > n:
+        return generator.permutation(n)[:k] + a
+
+    # Floyd: for j in n-k..n-1 take t ~ U[0, j], or j itself if t is taken
+    js: np.ndarray = np.arange(n - k, n, dtype=np.int64)
+    ts: List[int] = generator.integers(0, js, endpoint=True).tolist()
+    chosen: Set[int] = set()
+    for j, t in zip(js.tolist(), ts):
+        chosen.add(j if t in chosen else t)
+
+    values: np.ndarray = np.fromiter(chosen, dtype=np.int64, count=k)
+    generator.shuffle(values)
+
+    return values + a
+
+
+def _path_key(path: str) -> Tuple[int, ...]:
+    # stable across processes and interpreter runs (unlike hash())
+    return tuple(
+        int.from_bytes(
+            hashlib.blake2b(part.encode(), digest_size=8).digest(), "little"
+        )
+        for part in path.split(STREAM_SEP) if part
+    )